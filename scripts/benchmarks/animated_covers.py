@@ -0,0 +1,155 @@
+# animated_covers.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Animated covers: a timeout and a new texture per frame against frames decoded once.
+
+Plays generated GIF covers on the main loop for a few seconds, and measures
+the CPU time used per second of animation. Each run is its own process.
+* timeouts: a `GLib.timeout_add` chain per cover, building a texture from the
+`GdkPixbuf` animation on every frame, as before the animation clock
+* clock: the frames are decoded once into memory textures, like
+`GameCover.decode_thread_func`, then a single 16 ms timer (standing in for the
+window's tick callback) picks the frame due for each cover
+Run from the repository root: `python -m scripts.benchmarks.animated_covers`
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import monotonic, perf_counter, process_time
+
+import gi
+
+gi.require_version("Gdk", "4.0")
+gi.require_version("GdkPixbuf", "2.0")
+
+# pylint: disable=wrong-import-position
+from gi.repository import Gdk, GdkPixbuf, GLib
+from PIL import Image, ImageSequence
+
+N_COVERS = (1, 10, 40)
+N_FRAMES = 30
+FRAME_DURATION = 40
+DURATION = 3
+
+
+def create_gif(path: Path) -> None:
+    frames = [
+        Image.effect_noise((400, 600), 16 + index).convert("P")
+        for index in range(N_FRAMES)
+    ]
+    frames[0].save(
+        path, save_all=True, append_images=frames[1:], duration=FRAME_DURATION, loop=0
+    )
+
+
+def decode_frames(path: Path) -> list[tuple[Gdk.Texture, int]]:
+    frames = []
+    with Image.open(path) as image:
+        for frame in ImageSequence.Iterator(image):
+            rgba = frame.convert("RGBA")
+            texture = Gdk.MemoryTexture.new(
+                rgba.width,
+                rgba.height,
+                Gdk.MemoryFormat.R8G8B8A8,
+                GLib.Bytes.new(rgba.tobytes()),
+                rgba.width * 4,
+            )
+            frames.append((texture, max(frame.info.get("duration", 100), 20)))
+    return frames
+
+
+def play_timeouts(path: Path, n_covers: int) -> None:
+    def update(animation_iter: GdkPixbuf.PixbufAnimationIter) -> bool:
+        animation_iter.advance()
+        Gdk.Texture.new_for_pixbuf(animation_iter.get_pixbuf())
+        GLib.timeout_add(
+            max(animation_iter.get_delay_time(), 20), update, animation_iter
+        )
+        return GLib.SOURCE_REMOVE
+
+    for _ in range(n_covers):
+        animation = GdkPixbuf.PixbufAnimation.new_from_file(str(path))
+        update(animation.get_iter())
+
+
+def play_clock(path: Path, n_covers: int) -> None:
+    # Covers of the same file still decode their own frames
+    covers = [[decode_frames(path), 0, 0.0] for _ in range(n_covers)]
+
+    def tick() -> bool:
+        now = monotonic()
+        for cover in covers:
+            frames, index, next_time = cover
+            if now < next_time:
+                continue
+            index = (index + 1) % len(frames)
+            cover[1], cover[2] = index, now + frames[index][1] / 1000
+        return GLib.SOURCE_CONTINUE
+
+    GLib.timeout_add(16, tick)
+
+
+def run(mode: str, n_covers: int) -> None:
+    with TemporaryDirectory() as directory:
+        path = Path(directory) / "cover.gif"
+        create_gif(path)
+
+        cpu_start, start = process_time(), perf_counter()
+        if mode == "timeouts":
+            play_timeouts(path, n_covers)
+        else:
+            play_clock(path, n_covers)
+        setup = perf_counter() - start
+
+        done = False
+
+        def stop() -> bool:
+            nonlocal done
+            done = True
+            return GLib.SOURCE_REMOVE
+
+        GLib.timeout_add_seconds(DURATION, stop)
+        context = GLib.MainContext.default()
+        while not done:
+            context.iteration(True)
+        cpu = process_time() - cpu_start
+
+    print(
+        f"{mode:8} {n_covers:3} covers: setup {setup * 1000:5.0f} ms, "
+        f"CPU {cpu / DURATION * 100:5.1f} % of a core"
+    )
+
+
+def main() -> None:
+    for n_covers in N_COVERS:
+        for mode in ("timeouts", "clock"):
+            # The timeouts of a run would keep going in the next ones
+            subprocess.run(
+                (sys.executable, "-m", __spec__.name, mode, str(n_covers)), check=True
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        run(sys.argv[1], int(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,101 @@
+# covers.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Cover conversions on the main loop against a bounded worker pool.
+
+Converts generated covers with `convert_cover` and measures the total time
+and the longest main loop stall, seen by a 10 ms timer.
+Run from the repository root: `python -m scripts.benchmarks.covers`
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from gi.repository import GLib
+from PIL import Image
+
+from sofl import shared
+from sofl.utils.save_cover import convert_cover
+
+N_COVERS = 64
+
+
+def create_sources(directory: Path) -> list[Path]:
+    paths = []
+    for index in range(N_COVERS):
+        path = directory / f"source_{index}.jpg"
+        Image.effect_noise((600, 900), 32 + index).convert("RGB").save(path)
+        paths.append(path)
+    return paths
+
+
+def run(label: str, sources: list[Path], workers: int) -> None:
+    context = GLib.MainContext.default()
+    last_tick = perf_counter()
+    max_stall = 0.0
+
+    def on_tick() -> bool:
+        nonlocal last_tick, max_stall
+        now = perf_counter()
+        max_stall = max(max_stall, now - last_tick)
+        last_tick = now
+        return GLib.SOURCE_CONTINUE
+
+    tick_id = GLib.timeout_add(10, on_tick)
+    start = perf_counter()
+    if workers:
+        with ThreadPoolExecutor(workers) as pool:
+            futures = [pool.submit(convert_cover, source) for source in sources]
+            while not all(future.done() for future in futures):
+                context.iteration(True)
+    else:
+        remaining = list(sources)
+
+        def convert_next() -> bool:
+            convert_cover(remaining.pop())
+            return bool(remaining)
+
+        GLib.idle_add(convert_next)
+        while remaining:
+            context.iteration(True)
+    elapsed = perf_counter() - start
+    GLib.source_remove(tick_id)
+
+    print(
+        f"{label:10}: {elapsed * 1000:5.0f} ms, "
+        f"longest main loop stall {max_stall * 1000:4.0f} ms"
+    )
+
+
+def main() -> None:
+    shared.image_size = (400, 600)
+    with TemporaryDirectory() as directory:
+        sources = create_sources(Path(directory))
+        for label, workers in (("main loop", 0), ("pool", os.cpu_count() or 1)):
+            # Start each run with an empty conversion cache
+            shared.cover_cache_dir = Path(directory) / label / "cache"
+            run(label, sources, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# games_sort.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Sorting the library: a comparison callback against the cached sort keys.
+
+Sorts generated games by last played with the comparison function the custom
+sorter used, then with a `SortedListStore`, and moves a launched game.
+Run from the repository root: `python -m scripts.benchmarks.games_sort`
+"""
+
+import random
+from functools import cmp_to_key
+from time import perf_counter, time
+from typing import Any
+
+from sofl.game_data import GameData
+from sofl.utils.sorted_list_store import SortedListStore
+
+N_GAMES = 10_000
+
+
+def compare(game1: GameData, game2: GameData) -> int:
+    """The comparison function of the former custom sorter, by last played"""
+    var, order = "last_played", True
+
+    def get_value(index: int) -> str:
+        return str(getattr((game1, game2)[index], var)).lower().removeprefix("the ")
+
+    if get_value(0) == get_value(1):
+        var, order = "name", False
+
+    return ((get_value(0) > get_value(1)) ^ order) * 2 - 1
+
+
+def by_last_played(game: GameData) -> Any:
+    return (-game.last_played, game.get_sort_name())
+
+
+def main() -> None:
+    rng = random.Random(0)
+    games = [
+        GameData(
+            {
+                "game_id": f"game_{index}",
+                "name": f"The Game {rng.randint(0, 3000)}",
+                "last_played": rng.choice((0, rng.randint(10**9, 2 * 10**9))),
+            }
+        )
+        for index in range(N_GAMES)
+    ]
+
+    n_calls = 0
+
+    def counted_compare(game1: GameData, game2: GameData) -> int:
+        nonlocal n_calls
+        n_calls += 1
+        return compare(game1, game2)
+
+    start = perf_counter()
+    sorted(games, key=cmp_to_key(counted_compare))
+    print(
+        f"callback     : {(perf_counter() - start) * 1000:5.0f} ms, "
+        f"{n_calls} comparisons"
+    )
+
+    start = perf_counter()
+    model = SortedListStore(GameData, by_last_played)
+    model.add_many(games)
+    print(f"keys, new    : {(perf_counter() - start) * 1000:5.0f} ms")
+
+    # Sort names are cached on the games now
+    start = perf_counter()
+    model.set_key_func(by_last_played, False)
+    print(f"keys, cached : {(perf_counter() - start) * 1000:5.0f} ms")
+
+    # A launch bumps last played, the game moves to the front
+    game = games[N_GAMES // 2]
+    game.last_played = int(time())
+    start = perf_counter()
+    model.add(game)
+    print(f"move a game  : {(perf_counter() - start) * 1000:5.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# json_stream.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Reading a big Heroic library: `json.load` against `iter_json_array`.
+
+Generates a library file and measures the time to the first entry, the total
+time and the peak memory allocated while going through the entries.
+Run from the repository root: `python -m scripts.benchmarks.json_stream`
+"""
+
+import json
+import random
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Iterator, TextIO
+
+from sofl.utils.json_stream import iter_json_array
+
+N_ENTRIES = 50_000
+
+
+def create_library(path: Path) -> None:
+    rng = random.Random(1)
+    library = [
+        {
+            "app_name": f"app{index}",
+            "title": f'Game ✓ {index} "Deluxe"',
+            "runner": "legendary",
+            "is_installed": index % 3 == 0,
+            "developer": "Developer",
+            "art_square": "https://example.com/" + "a" * rng.randint(10, 200),
+            "extra": {"values": [1.5, None, True, index]},
+        }
+        for index in range(N_ENTRIES)
+    ]
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"library": library}, file)
+
+
+def load_whole(file: TextIO) -> Iterator[Any]:
+    return iter(json.load(file)["library"])
+
+
+def load_stream(file: TextIO) -> Iterator[Any]:
+    return iter_json_array(file, "library")
+
+
+def run(label: str, path: Path, load: Any) -> None:
+    start = perf_counter()
+    first = None
+    n_entries = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for _entry in load(file):
+            if first is None:
+                first = perf_counter() - start
+            n_entries += 1
+    elapsed = perf_counter() - start
+
+    # Tracing slows the decoding down, measure the memory in another pass
+    tracemalloc.start()
+    with open(path, "r", encoding="utf-8") as file:
+        for _entry in load(file):
+            pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(
+        f"{label:9}: {n_entries} entries, first after {first * 1000:6.1f} ms, "
+        f"total {elapsed * 1000:5.0f} ms, peak {peak / 1e6:5.1f} MB"
+    )
+
+
+def main() -> None:
+    with TemporaryDirectory() as directory:
+        path = Path(directory) / "library.json"
+        create_library(path)
+        print(f"{path.stat().st_size / 1e6:.1f} MB library")
+        run("json.load", path, load_whole)
+        run("stream", path, load_stream)
+
+
+if __name__ == "__main__":
+    main()
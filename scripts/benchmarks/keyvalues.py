@@ -0,0 +1,116 @@
+# keyvalues.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Reading Steam app manifests: a regex search per key against the KeyValues tokenizer.
+
+Generates app manifests with a few installed depots, then reads their name,
+appid and StateFlags. Files are read once first, so the times are warm cache.
+Run from the repository root: `python -m scripts.benchmarks.keyvalues`
+"""
+
+import re
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable
+
+from sofl.utils.steam import SteamFileHelper, SteamManifestData
+
+N_MANIFESTS = 3000
+N_DEPOTS = 20
+N_RUNS = 3
+
+DEPOT = """\t\t"{depot}"
+\t\t{{
+\t\t\t"manifest"\t\t"5036510926112592341"
+\t\t\t"size"\t\t"456789"
+\t\t}}
+"""
+
+MANIFEST = """"AppState"
+{{
+\t"appid"\t\t"{appid}"
+\t"Universe"\t\t"1"
+\t"LauncherPath"\t\t"/home/user/.local/share/Steam/ubuntu12_32/steam"
+\t"name"\t\t"Game {appid} Deluxe Edition"
+\t"StateFlags"\t\t"4"
+\t"installdir"\t\t"Game {appid}"
+\t"LastUpdated"\t\t"1690000000"
+\t"SizeOnDisk"\t\t"123456789"
+\t"InstalledDepots"
+\t{{
+{depots}\t}}
+\t"UserConfig"
+\t{{
+\t\t"language"\t\t"english"
+\t}}
+}}
+"""
+
+
+def create_manifests(directory: Path) -> list[Path]:
+    depots = "".join(DEPOT.format(depot=depot) for depot in range(N_DEPOTS))
+    paths = []
+    for appid in range(N_MANIFESTS):
+        path = directory / f"appmanifest_{appid}.acf"
+        path.write_text(MANIFEST.format(appid=appid, depots=depots), "utf-8")
+        paths.append(path)
+    return paths
+
+
+def read_only(path: Path) -> None:
+    with open(path, "r", encoding="utf-8") as file:
+        file.read()
+
+
+def regex_search(path: Path) -> dict[str, str]:
+    """The manifest reading before the tokenizer"""
+    with open(path, "r", encoding="utf-8") as file:
+        contents = file.read()
+    data = {}
+    for key in SteamManifestData.__required_keys__:  # pylint: disable=no-member
+        if match := re.search(f'"{key}"\\s+"(.*)"\n', contents, re.IGNORECASE):
+            data[key] = match.group(1)
+    return data
+
+
+def run(label: str, read: Callable[[Path], object], paths: list[Path]) -> None:
+    best = float("inf")
+    for _ in range(N_RUNS):
+        start = perf_counter()
+        for path in paths:
+            read(path)
+        best = min(best, perf_counter() - start)
+    print(f"{label:10}: {best * 1000:5.0f} ms for {len(paths)} manifests")
+
+
+def main() -> None:
+    with TemporaryDirectory() as directory:
+        paths = create_manifests(Path(directory))
+        helper = SteamFileHelper()
+        assert regex_search(paths[0]) == helper.get_manifest_data(paths[0])
+
+        run("read only", read_only, paths)
+        run("regex", regex_search, paths)
+        run("tokenizer", helper.get_manifest_data, paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# library_widgets.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Library startup: a widget per game in a FlowBox against a GridView over the games.
+
+Each mode runs in its own process, so that the peak memory use is its own.
+Needs a display. Run from the repository root:
+`python -m scripts.benchmarks.library_widgets`
+"""
+
+import resource
+import subprocess
+import sys
+from time import perf_counter
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+
+# pylint: disable=wrong-import-position
+from gi.repository import GLib, Gtk
+
+from sofl.game_data import GameData
+from sofl.utils.sorted_list_store import SortedListStore
+
+N_GAMES = (1000, 5000)
+
+
+def create_card(name: str) -> Gtk.Box:
+    """Stand-in for the game card, a cover and a title"""
+    card = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+    card.append(picture := Gtk.Picture(width_request=200, height_request=300))
+    card.append(label := Gtk.Label(label=name))
+    card.picture, card.label = picture, label  # type: ignore
+    return card
+
+
+def run(mode: str, n_games: int) -> None:
+    Gtk.init()
+    window = Gtk.Window(default_width=1280, default_height=800)
+    games = [
+        GameData({"game_id": f"game_{index}", "name": f"Game {index}"})
+        for index in range(n_games)
+    ]
+    n_widgets = 0
+
+    start = perf_counter()
+    if mode == "flowbox":
+        library = Gtk.FlowBox(max_children_per_line=10)
+        for game in sorted(games, key=GameData.get_sort_name):
+            library.append(create_card(game.name))
+            n_widgets += 1
+    else:
+        model = SortedListStore(GameData, GameData.get_sort_name)
+        model.add_many(games)
+        items = Gtk.FilterListModel.new(
+            model.store, Gtk.CustomFilter.new(lambda game, *_: not game.hidden)
+        )
+
+        def setup(_factory, list_item) -> None:
+            nonlocal n_widgets
+            n_widgets += 1
+            list_item.set_child(create_card(""))
+
+        def bind(_factory, list_item) -> None:
+            list_item.get_child().label.set_label(list_item.get_item().name)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", setup)
+        factory.connect("bind", bind)
+        library = Gtk.GridView(
+            model=Gtk.NoSelection.new(Gtk.SortListModel.new(items, None)),
+            factory=factory,
+            max_columns=10,
+        )
+
+    window.set_child(Gtk.ScrolledWindow(child=library))
+    window.present()
+
+    # Wait for the first frame
+    drawn = []
+
+    def on_tick(*_args) -> bool:
+        drawn.append(True)
+        return GLib.SOURCE_REMOVE
+
+    window.add_tick_callback(on_tick)
+    context = GLib.MainContext.default()
+    while not drawn:
+        context.iteration(True)
+    elapsed = perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{mode:8} {n_games:5} games: first frame {elapsed * 1000:6.0f} ms, "
+        f"{n_widgets:5} cards, peak RSS {peak_rss:4.0f} MB"
+    )
+
+
+def main() -> None:
+    for n_games in N_GAMES:
+        for mode in ("flowbox", "gridview"):
+            subprocess.run(
+                (sys.executable, "-m", __spec__.name, mode, str(n_games)), check=True
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        run(sys.argv[1], int(sys.argv[2]))
+    else:
+        main()
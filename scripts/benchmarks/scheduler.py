@@ -0,0 +1,135 @@
+# scheduler.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Synthetic import through the scheduler, with and without the concurrency limits.
+
+The managers sleep like network requests (SteamGridDB, Steam API) or burn CPU
+like cover conversions. Unbounded runs start a task per game and manager
+as soon as it is ready, as before the scheduler.
+Run from the repository root: `python -m scripts.benchmarks.scheduler`
+"""
+
+from pathlib import Path
+from time import perf_counter, sleep
+from typing import Optional
+
+from gi.repository import GLib
+
+from sofl.game_data import GameData
+from sofl.store.managers.async_manager import AsyncManager
+from sofl.store.managers.manager import Manager
+from sofl.store.pipeline import Pipeline
+from sofl.store.scheduler import Scheduler
+
+N_GAMES = 500
+
+
+class FakeSteamAPIManager(AsyncManager):
+    max_concurrent = 1
+
+    def main(self, game: GameData, additional_data: dict) -> None:
+        sleep(0.002)
+
+
+class FakeSgdbManager(AsyncManager):
+    run_after = (FakeSteamAPIManager,)
+    max_concurrent = 4
+
+    def main(self, game: GameData, additional_data: dict) -> None:
+        sleep(0.02)
+
+
+class FakeCoverManager(AsyncManager):
+    run_after = (FakeSgdbManager,)
+
+    def main(self, game: GameData, additional_data: dict) -> None:
+        end = perf_counter() + 0.005
+        while perf_counter() < end:
+            pass
+
+
+class FakeDisplayManager(Manager):
+    run_after = (FakeCoverManager,)
+
+    def main(self, game: GameData, additional_data: dict) -> None:
+        pass
+
+
+def count_threads() -> int:
+    for line in Path("/proc/self/status").read_text("utf-8").splitlines():
+        if line.startswith("Threads:"):
+            return int(line.split()[1])
+    return 0
+
+
+def run(max_concurrent: Optional[int]) -> None:
+    managers = (
+        FakeSteamAPIManager(),
+        FakeSgdbManager(),
+        FakeCoverManager(),
+        FakeDisplayManager(),
+    )
+    if max_concurrent is not None:
+        for manager in managers:
+            manager.max_concurrent = max_concurrent
+    scheduler = Scheduler()
+    scheduler.set_managers(managers)
+
+    n_done = 0
+    peak_threads = count_threads()
+
+    def on_advanced(pipeline: Pipeline) -> None:
+        nonlocal n_done
+        n_done += pipeline.is_done
+
+    def sample_threads() -> bool:
+        nonlocal peak_threads
+        peak_threads = max(peak_threads, count_threads())
+        return GLib.SOURCE_CONTINUE
+
+    sample_id = GLib.timeout_add(5, sample_threads)
+    start = perf_counter()
+    for index in range(N_GAMES):
+        pipeline = Pipeline(
+            GameData({"game_id": f"game_{index}"}), {}, managers, scheduler
+        )
+        pipeline.connect("advanced", on_advanced)
+        pipeline.advance()
+
+    context = GLib.MainContext.default()
+    while n_done < N_GAMES:
+        context.iteration(True)
+    elapsed = perf_counter() - start
+    GLib.source_remove(sample_id)
+
+    label = "limits" if max_concurrent is None else "unbounded"
+    print(
+        f"{label:9}: {elapsed:5.2f} s, {N_GAMES / elapsed:6.1f} games/s, "
+        f"peak {scheduler.peak_total_running:4} tasks, {peak_threads:3} threads"
+    )
+
+
+def main() -> None:
+    run(N_GAMES)
+    run(None)
+
+
+if __name__ == "__main__":
+    main()
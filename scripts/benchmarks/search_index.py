@@ -0,0 +1,104 @@
+# search_index.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Library search: a lowercase scan of every game against the search index.
+
+Generates a library of made up names and developers, then types a few queries
+one character at a time, refining the previous matches like the window does.
+Run from the repository root: `python -m scripts.benchmarks.search_index`
+"""
+
+import random
+from time import perf_counter
+from typing import Optional
+
+from sofl.utils.search_index import SearchIndex, is_refinement, normalize
+
+N_GAMES = 10_000
+QUERIES = ("witcher", "wticher", "karomi", "the wi")
+SYLLABLES = "ka ro mi te su na lo vi de ra po qu an el or is un ex th er wi tc he"
+
+Library = dict[str, tuple[str, Optional[str]]]
+
+
+def create_library() -> Library:
+    rng = random.Random(1)
+    syllables = SYLLABLES.split()
+
+    def word() -> str:
+        return "".join(rng.sample(syllables, rng.randint(1, 4))).capitalize()
+
+    library: Library = {
+        f"game_{index}": (
+            " ".join(word() for _ in range(rng.randint(1, 4))),
+            rng.choice((None, f"{word()} Studios", "Valvé")),
+        )
+        for index in range(N_GAMES)
+    }
+    library["witcher"] = ("The Witcher 3: Wild Hunt", "CD Projekt Réd")
+    return library
+
+
+def scan(library: Library, text: str) -> list[str]:
+    """The filtering before the index"""
+    text = text.lower()
+    return [
+        game_id
+        for game_id, (name, developer) in library.items()
+        if text in name.lower() or (developer and text in developer.lower())
+    ]
+
+
+def main() -> None:
+    library = create_library()
+
+    start = perf_counter()
+    index = SearchIndex()
+    for game_id, (name, developer) in library.items():
+        index.add(game_id, name, developer)
+    print(
+        f"index built in {(perf_counter() - start) * 1000:.0f} ms, "
+        f"{len(index.trigrams)} trigrams"
+    )
+
+    for text in QUERIES:
+        scan_times, index_times = [], []
+        previous, matches = "", None
+        for length in range(1, len(text) + 1):
+            start = perf_counter()
+            scan(library, text[:length])
+            scan_times.append(perf_counter() - start)
+
+            start = perf_counter()
+            query = normalize(text[:length])
+            if matches is not None and is_refinement(previous, query):
+                matches = index.search(query, matches)
+            else:
+                matches = index.search(query)
+            index_times.append(perf_counter() - start)
+            previous = query
+
+        print(f"{text!r}: {len(matches)} matches, ms per keystroke")
+        for label, times in (("scan", scan_times), ("index", index_times)):
+            print(f"  {label:5}:", " ".join(f"{time * 1000:5.2f}" for time in times))
+
+
+if __name__ == "__main__":
+    main()
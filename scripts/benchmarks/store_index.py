@@ -0,0 +1,84 @@
+# store_index.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Store lookups by game_id: the game_id index against a scan of every source.
+
+Simulates an import, looking up every new game before adding it.
+Run from the repository root: `python -m scripts.benchmarks.store_index`
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any
+
+from sofl import shared
+from sofl.game_data import GameData
+from sofl.store.store import Store
+
+SOURCES = ("steam", "heroic", "lutris", "bottles", "itch")
+
+
+def scan_get(store: Store, game_id: str) -> Any:
+    """Lookup as done before the index, through every source mapping"""
+    for source_mapping in store.source_games.values():
+        for game in source_mapping.values():
+            if game.game_id == game_id:
+                return game
+    return None
+
+
+def simulate_import(n_games: int, use_index: bool) -> float:
+    store = Store()
+    games = [
+        GameData(
+            {
+                "game_id": f"{SOURCES[index % len(SOURCES)]}_{index}",
+                "source": SOURCES[index % len(SOURCES)],
+                "name": f"Game {index}",
+            }
+        )
+        for index in range(n_games)
+    ]
+    start = perf_counter()
+    for game in games:
+        if store.get(game.game_id) if use_index else scan_get(store, game.game_id):
+            continue
+        store.move_game(game, game.base_source)
+    elapsed = perf_counter() - start
+    store.storage.close()
+    return elapsed
+
+
+def main() -> None:
+    with TemporaryDirectory() as directory:
+        shared.games_db = Path(directory) / "games.db"
+        shared.games_dir = Path(directory) / "games"
+        for n_games in (1000, 5000, 10000):
+            indexed = simulate_import(n_games, True)
+            scanned = simulate_import(n_games, False)
+            print(
+                f"{n_games} games: index {indexed * 1000:.1f} ms, "
+                f"scan {scanned * 1000:.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,7 @@ from PIL import Image, UnidentifiedImageError
 
 from sofl import shared
 from sofl.errors.friendly_error import FriendlyError
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_cover import GameCover
 from sofl.store.managers.cover_manager import CoverManager
 from sofl.store.managers.sgdb_manager import SgdbManager
@@ -72,14 +72,14 @@ class DetailsDialog(Adw.Dialog):
     # Logger setup
     logger = logging.getLogger(__name__)
 
-    def __init__(self, game: Optional[Game] = None, **kwargs: Any):
+    def __init__(self, game: Optional[GameData] = None, **kwargs: Any):
         super().__init__(**kwargs)
 
         # Make it so only one dialog can be open at a time
         self.__class__.is_open = True
         self.connect("closed", lambda *_: self.set_is_open(False))
 
-        self.game: Optional[Game] = game
+        self.game: Optional[GameData] = game
         self.game_cover: GameCover = GameCover({self.cover})
 
         if self.game:
@@ -291,27 +291,15 @@ class DetailsDialog(Adw.Dialog):
                     old_base_source = self.game.base_source
 
                     # Update game properties
-                    if want_online_fix:
-                        self.game.source = "online-fix"
-                    else:
-                        self.game.source = "imported"
+                    self.game.update_values(
+                        {"source": "online-fix" if want_online_fix else "imported"}
+                    )
 
                     # Update game position in store source_games
-                    if old_base_source in shared.store.source_games:
-                        # Remove from old source group
-                        if self.game.game_id in shared.store.source_games[old_base_source]:
-                            del shared.store.source_games[old_base_source][self.game.game_id]
-                            # Remove empty source group
-                            if not shared.store.source_games[old_base_source]:
-                                del shared.store.source_games[old_base_source]
-
-                    # Add to new source group
-                    if self.game.base_source not in shared.store.source_games:
-                        shared.store.source_games[self.game.base_source] = {}
-                    shared.store.source_games[self.game.base_source][self.game.game_id] = self.game
+                    shared.store.move_game(self.game, old_base_source)
 
                     # Update game data for type change
-                    self.game.data.update_values({
+                    self.game.update_values({
                         "name": final_name,
                         "developer": final_developer,
                         "executable": final_executable,
@@ -324,7 +312,7 @@ class DetailsDialog(Adw.Dialog):
         self.game.executable = final_executable
 
         if self.game.game_id in shared.win.game_covers.keys():
-            shared.win.game_covers[self.game.game_id].animation = None
+            shared.win.game_covers[self.game.game_id].stop()
 
         shared.win.game_covers[self.game.game_id] = self.game_cover
 
@@ -347,9 +335,12 @@ class DetailsDialog(Adw.Dialog):
             self.game.set_loading(1)
             sgdb_manager = shared.store.managers[SgdbManager]
             sgdb_manager.reset_cancellable()
-            sgdb_manager.process_game(self.game, {}, self.update_cover_callback)
+            # Look the game up again, the cache may only remember a failure
+            sgdb_manager.process_game(
+                self.game, {"refresh": True}, self.update_cover_callback
+            )
 
-        self.game_cover.pictures.remove(self.cover)
+        self.game_cover.remove_picture(self.cover)
 
         # In install mode don't show details page
         if not self.install_mode:
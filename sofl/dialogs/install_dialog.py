@@ -31,7 +31,7 @@ from time import time
 from gi.repository import Adw, Gtk, GLib, Gio
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.installer.online_fix_installer import OnlineFixInstaller
 from sofl.details_dialog import DetailsDialog
@@ -66,7 +66,7 @@ class InstallDialog(Adw.Dialog):
     _last_toast_message: Optional[str] = None
     _current_task: Optional[threading.Thread] = None
 
-    def __init__(self, game: Optional[Game] = None, **kwargs: Any):
+    def __init__(self, game: Optional[GameData] = None, **kwargs: Any):
         super().__init__(**kwargs)
 
         # Create file dialog
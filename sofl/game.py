@@ -17,27 +17,25 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import shlex
-from pathlib import Path
-from time import time
 from typing import Any, Optional
-import shutil
-import os
-import logging
 
-from gi.repository import Adw, GObject, Gtk
+from gi.repository import Gio, Gtk
 
 from sofl import shared
 from sofl.game_cover import GameCover
 from sofl.game_data import GameData
-from sofl.utils.run_executable import run_executable
-from sofl.utils.create_dialog import create_dialog
 
-from gettext import gettext as _
 
 # pylint: disable=too-many-instance-attributes
 @Gtk.Template(resource_path=shared.PREFIX + "/gtk/game.ui")
 class Game(Gtk.Box):
+    """
+    Library grid item displaying a game.
+
+    Widgets are recycled by the library view:
+    they are bound to a GameData while it is visible, then unbound.
+    """
+
     __gtype_name__ = "Game"
 
     title = Gtk.Template.Child()
@@ -52,25 +50,14 @@ class Game(Gtk.Box):
     hidden_game_options = Gtk.Template.Child()
     online_fix_options = Gtk.Template.Child()
 
-    loading: int = 0
-    filtered: bool = False
-    game_cover: GameCover = None
-    
-    # This is a widget that uses game data from data
-    data: GameData = None
+    game_cover: Optional[GameCover] = None
 
-    def __init__(self, data: GameData, **kwargs: Any) -> None:
-        super().__init__(**kwargs)
-
-        self.app = shared.win.get_application()
-        self.data = data
-        
-        # Connect signals from data
-        self.data.connect("update-ready", self.on_update_ready)
-        self.data.connect("save-ready", self.on_save_ready)
-        self.data.connect("toast", self.on_toast)
+    # The game data currently displayed by the widget
+    data: Optional[GameData] = None
+    data_handler_ids: tuple[int, ...] = ()
 
-        self.set_play_icon()
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
 
         self.event_contoller_motion = Gtk.EventControllerMotion.new()
         self.add_controller(self.event_contoller_motion)
@@ -80,35 +67,69 @@ class Game(Gtk.Box):
         self.play_button.connect("clicked", self.main_button_clicked, True)
 
         shared.schema.connect("changed", self.schema_changed)
-        
-        # Initialize UI based on data
-        self.title.set_label(self.data.name)
 
-    def on_update_ready(self, data: GameData, _args: Any) -> None:
-        """Handles signal for update need"""
-        # Update UI based on data
+    def bind(self, data: GameData) -> None:
+        """Display a game in the widget"""
+        self.data = data
+        self.data_handler_ids = (
+            data.connect("update-ready", self.on_update_ready),
+            data.connect("loading-changed", self.on_loading_changed),
+        )
+        self.on_update_ready()
+        self.on_loading_changed()
+
+    def unbind(self) -> None:
+        """Release the displayed game so that the widget can be reused"""
+        if self.data:
+            for handler_id in self.data_handler_ids:
+                self.data.disconnect(handler_id)
+        self.data_handler_ids = ()
+        if self.game_cover:
+            self.game_cover.remove_picture(self.cover)
+            self.game_cover = None
+        self.data = None
+
+    def on_update_ready(self, *_args: Any) -> None:
+        """Update the widget from the game data"""
+        if not self.data:
+            return
+
         self.title.set_label(self.data.name)
-        self.set_play_icon()  # Update play button icon and tooltip when game type changes
-        self.emit("update-ready", {})
-        
-    def on_save_ready(self, data: GameData, _args: Any) -> None:
-        """Handles signal for save need"""
-        self.emit("save-ready", {})
-        
-    def on_toast(self, data: GameData, message: str) -> None:
-        """Handles signal for notification need"""
-        toast = Adw.Toast.new(message)
-        toast.set_priority(Adw.ToastPriority.HIGH)
-        toast.set_use_markup(False)
-        shared.win.toast_overlay.add_toast(toast)
-
-    def set_loading(self, state: int) -> None:
-        self.loading += state
-        loading = self.loading > 0
+        self.set_play_icon()
+
+        if self.data.hidden:
+            self.set_menu_model(self.hidden_game_options)
+        elif self.data.source == "online-fix":
+            self.set_menu_model(self.online_fix_options)
+        else:
+            self.set_menu_model(self.game_options)
+
+        # The cover may have been replaced, e.g. from the details dialog
+        game_cover = shared.win.get_game_cover(self.data, self.cover)
+        if self.game_cover and self.game_cover is not game_cover:
+            self.game_cover.remove_picture(self.cover)
+        self.game_cover = game_cover
+
+    def on_loading_changed(self, *_args: Any) -> None:
+        loading = bool(self.data) and self.data.loading > 0
 
         self.cover.set_opacity(int(not loading))
         self.spinner.set_visible(loading)
 
+    def set_menu_model(self, menu_model: Gio.MenuModel) -> None:
+        if self.menu_button.get_menu_model() == menu_model:
+            return
+
+        # Setting a menu model creates a new popover
+        self.menu_button.set_menu_model(menu_model)
+        popover = self.menu_button.get_popover()
+        popover.connect("notify::visible", self.toggle_play, None)
+        popover.connect("notify::visible", self.set_active_game)
+
+    def set_active_game(self, *_args: Any) -> None:
+        if self.data:
+            shared.win.set_active_game(None, None, self.data)
+
     def toggle_play(
         self, _widget: Any, _prop1: Any, _prop2: Any, state: bool = True
     ) -> None:
@@ -117,12 +138,16 @@ class Game(Gtk.Box):
             self.menu_revealer.set_reveal_child(not state)
 
     def main_button_clicked(self, _widget: Any, button: bool) -> None:
+        if not self.data:
+            return
         if shared.schema.get_boolean("cover-launches-game") ^ button:
             self.data.launch()
         else:
-            shared.win.show_details_page(self)
+            shared.win.show_details_page(self.data)
 
     def set_play_icon(self) -> None:
+        if not self.data:
+            return
         self.play_button.set_icon_name(self.data.get_play_button_icon())
         # Set button tooltip
         self.play_button.set_tooltip_text(self.data.get_play_button_label())
@@ -130,116 +155,3 @@ class Game(Gtk.Box):
     def schema_changed(self, _settings: Any, key: str) -> None:
         if key == "cover-launches-game":
             self.set_play_icon()
-
-    @GObject.Signal(name="update-ready", arg_types=[object])
-    def update_ready(self, _additional_data):  # type: ignore
-        """Signal emitted when the game needs updating"""
-
-    @GObject.Signal(name="save-ready", arg_types=[object])
-    def save_ready(self, _additional_data):  # type: ignore
-        """Signal emitted when the game needs saving"""
-        
-    # Delegation methods to data
-    @property
-    def game_id(self) -> str:
-        return self.data.game_id
-        
-    @property
-    def name(self) -> str:
-        return self.data.name
-    
-    @name.setter
-    def name(self, value: str) -> None:
-        self.data.name = value
-    
-    @property
-    def source(self) -> str:
-        return self.data.source
-
-    @source.setter
-    def source(self, value: str) -> None:
-        self.data.source = value
-        self.data.base_source = value.split("_")[0]
-
-    @property
-    def base_source(self) -> str:
-        return self.data.base_source
-    
-    @property
-    def executable(self) -> str:
-        return self.data.executable
-    
-    @executable.setter
-    def executable(self, value: str) -> None:
-        self.data.executable = value
-    
-    @property
-    def hidden(self) -> bool:
-        return self.data.hidden
-    
-    @property
-    def removed(self) -> bool:
-        return self.data.removed
-
-    @removed.setter
-    def removed(self, value: bool) -> None:
-        self.data.removed = value
-    
-    @property
-    def developer(self) -> Optional[str]:
-        return self.data.developer
-    
-    @developer.setter
-    def developer(self, value: Optional[str]) -> None:
-        self.data.developer = value
-    
-    @property
-    def last_played(self) -> int:
-        return self.data.last_played
-    
-    @property
-    def added(self) -> int:
-        return self.data.added
-    
-    @property
-    def version(self) -> int:
-        return self.data.version
-    
-    @property
-    def blacklisted(self) -> bool:
-        return self.data.blacklisted
-    
-    # Delegate methods to data
-    def launch(self) -> None:
-        # Update game data (last played time, etc.) without launching process
-        self.data.last_played = int(time())
-        self.data.save()
-        self.data.update()
-        # Process launching is handled by window.launch_game_with_tracking()
-    
-    def toggle_hidden(self, toast: bool = True) -> None:
-        self.data.toggle_hidden(toast)
-    
-    def remove_game(self) -> None:
-        self.data.remove_game()
-    
-    def uninstall_game(self) -> None:
-        self.data.uninstall_game()
-    
-    def get_play_button_label(self) -> str:
-        return self.data.get_play_button_label()
-    
-    def get_play_button_icon(self) -> str:
-        return self.data.get_play_button_icon()
-    
-    def get_cover_path(self) -> Optional[Path]:
-        return self.data.get_cover_path()
-    
-    def create_toast(self, message: str) -> None:
-        self.data.create_toast(message)
-    
-    def update(self) -> None:
-        self.data.update()
-    
-    def save(self) -> None:
-        self.data.save()
\ No newline at end of file
@@ -17,14 +17,81 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from io import BytesIO
+import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from threading import Thread
+from typing import Callable, Optional
 
-from gi.repository import Gdk, GdkPixbuf, Gio, GLib, Gtk
-from PIL import Image, ImageFilter, ImageStat
+from gi.repository import Gdk, GLib, Gtk
+from PIL import Image, ImageSequence, UnidentifiedImageError
 
 from sofl import shared
+from sofl.utils.cover_backdrop import get_backdrop
+
+
+class AnimationClock:
+    """
+    Single clock driving the animated covers, on the window's frame clock.
+
+    * Ticks only while a cover is playing, and pauses with the window unfocused
+    * Covers play while one of their pictures is mapped
+    * Paused covers keep their decoded frames within a memory budget,
+    the least recently played ones are dropped first
+    """
+
+    frames_budget: int = 256 * 1024 * 1024
+
+    covers: set["GameCover"]
+    paused: OrderedDict["GameCover", None]
+    frames_size: int = 0
+    tick_id: Optional[int] = None
+    window: Optional[Gtk.Window] = None
+
+    def __init__(self) -> None:
+        self.covers = set()
+        self.paused = OrderedDict()
+
+    def add(self, cover: "GameCover") -> None:
+        self.covers.add(cover)
+        self.wake()
+
+    def remove(self, cover: "GameCover") -> None:
+        self.covers.discard(cover)
+
+    def wake(self, *_args) -> None:
+        """Start ticking if a cover may play"""
+        if self.window is None:
+            self.window = shared.win
+            self.window.connect("notify::is-active", self.wake)
+        if self.tick_id is None and self.covers and self.window.is_active():
+            self.tick_id = self.window.add_tick_callback(self.on_tick)
+
+    def on_tick(self, window: Gtk.Window, frame_clock: Gdk.FrameClock) -> bool:
+        playing = False
+        if window.is_active():
+            now = frame_clock.get_frame_time()
+            for cover in tuple(self.covers):
+                playing |= cover.play(now)
+        if playing:
+            return GLib.SOURCE_CONTINUE
+        # Pictures getting mapped, decoded frames or the window focus wake it up
+        self.tick_id = None
+        return GLib.SOURCE_REMOVE
+
+    def pause(self, cover: "GameCover") -> None:
+        self.paused[cover] = None
+        self.paused.move_to_end(cover)
+        self.trim()
+
+    def resume(self, cover: "GameCover") -> None:
+        self.paused.pop(cover, None)
+
+    def trim(self) -> None:
+        """Drop the frames of the least recently played covers to fit the budget"""
+        while self.frames_size > self.frames_budget and self.paused:
+            cover, _value = self.paused.popitem(last=False)
+            cover.drop_frames()
 
 
 class GameCover:
@@ -32,8 +99,21 @@ class GameCover:
     blurred: Optional[Gdk.Texture]
     luminance: Optional[tuple[float, float]]
     path: Optional[Path]
-    animation: Optional[GdkPixbuf.PixbufAnimation]
-    anim_iter: Optional[GdkPixbuf.PixbufAnimationIter]
+
+    # Decoded frames of an animated cover, with their duration in ms
+    frames: Optional[list[tuple[Gdk.Texture, int]]] = None
+    frames_size: int = 0
+    frame_index: int = 0
+    # Frame clock time of the next frame, 0 when paused
+    next_frame_time: int = 0
+    decoding: bool = False
+    generation: int = 0
+    # Called once the backdrop loaded in the background is ready
+    blurred_callback: Optional[Callable[["GameCover"], None]] = None
+    loading_blurred: bool = False
+    map_handler_ids: dict[Gtk.Picture, int]
+
+    clock = AnimationClock()
 
     placeholder = Gdk.Texture.new_from_resource(
         shared.PREFIX + "/library_placeholder.svg"
@@ -43,93 +123,221 @@ class GameCover:
     )
 
     def __init__(self, pictures: set[Gtk.Picture], path: Optional[Path] = None) -> None:
-        self.pictures = pictures
+        self.pictures = set()
+        self.map_handler_ids = {}
+        for picture in pictures:
+            self.watch_picture(picture)
         self.new_cover(path)
 
-    def new_cover(self, path: Optional[Path] = None) -> None:
-        self.animation = None
+    @property
+    def animated(self) -> bool:
+        return bool(self.path and self.path.suffix == ".gif")
+
+    def new_cover(
+        self, path: Optional[Path] = None, texture: Optional[Gdk.Texture] = None
+    ) -> None:
+        """Display a new cover, `texture` may be passed if already decoded"""
+        self.stop()
         self.texture = None
         self.blurred = None
         self.luminance = None
+        self.blurred_callback = None
+        self.loading_blurred = False
         self.path = path
 
-        if path:
-            if path.suffix == ".gif":
-                self.animation = GdkPixbuf.PixbufAnimation.new_from_file(str(path))
-                self.anim_iter = self.animation.get_iter()
-                self.task = Gio.Task.new()
-                self.task.run_in_thread(
-                    lambda *_: self.update_animation((self.task, self.animation))
-                )
-            else:
-                self.texture = Gdk.Texture.new_from_filename(str(path))
-
-        if not self.animation:
-            self.set_texture(self.texture)
+        if self.animated:
+            # Frames are decoded once a picture is mapped
+            self.clock.add(self)
+        elif path:
+            self.texture = texture or Gdk.Texture.new_from_filename(str(path))
+
+        self.set_texture(self.texture)
+
+    def stop(self) -> None:
+        """Stop the animation and forget its frames"""
+        self.clock.remove(self)
+        self.drop_frames()
+        self.generation += 1
+        self.decoding = False
 
     def get_texture(self) -> Gdk.Texture:
-        return (
-            Gdk.Texture.new_for_pixbuf(self.animation.get_static_image())
-            if self.animation
-            else self.texture
-        )
+        if self.frames:
+            return self.frames[self.frame_index][0]
+        if self.animated:
+            return Gdk.Texture.new_from_filename(str(self.path))
+        return self.texture
 
-    def get_blurred(self) -> Gdk.Texture:
-        if not self.blurred:
-            if self.path:
-                with Image.open(self.path) as image:
-                    image = (
-                        image.convert("RGB")
-                        .resize((100, 150))
-                        .filter(ImageFilter.GaussianBlur(20))
-                    )
+    def get_blurred(
+        self, callback: Optional[Callable[["GameCover"], None]] = None
+    ) -> Gdk.Texture:
+        """
+        Get the blurred cover, its luminance is set along with it.
+        The backdrop is loaded in the background, until then the placeholder
+        is returned and `callback` is called once it is ready.
+        """
+        if self.blurred:
+            return self.blurred
 
-                    buffer = BytesIO()
-                    image.save(buffer, "tiff", compression=None)
-                    gbytes = GLib.Bytes.new(buffer.getvalue())
+        self.luminance = (0.3, 0.5)
+        if not self.path:
+            self.blurred = self.placeholder_small
+            return self.blurred
 
-                    self.blurred = Gdk.Texture.new_from_bytes(gbytes)
+        if callback is not None:
+            self.blurred_callback = callback
+        if not self.loading_blurred:
+            self.loading_blurred = True
+            Thread(
+                target=self.load_blurred_thread_func,
+                args=(self.path, self.generation),
+                daemon=True,
+            ).start()
+        return self.placeholder_small
 
-                    stat = ImageStat.Stat(image.convert("L"))
+    def load_blurred_thread_func(self, path: Path, generation: int) -> None:
+        try:
+            # Usually created when the cover was saved, only loaded here
+            backdrop_path, luminance = get_backdrop(path)
+            texture = Gdk.Texture.new_from_filename(str(backdrop_path))
+        except (OSError, UnidentifiedImageError, GLib.Error) as error:
+            logging.error("Couldn't load the backdrop of %s", path, exc_info=error)
+            texture, luminance = self.placeholder_small, (0.3, 0.5)
+        GLib.idle_add(self.on_blurred_loaded, texture, luminance, generation)
 
-                    # Luminance values for light and dark mode
-                    self.luminance = (
-                        min((stat.mean[0] + stat.extrema[0][0]) / 510, 0.7),
-                        max((stat.mean[0] + stat.extrema[0][1]) / 510, 0.3),
-                    )
-            else:
-                self.blurred = self.placeholder_small
-                self.luminance = (0.3, 0.5)
+    def on_blurred_loaded(
+        self, texture: Gdk.Texture, luminance: tuple[float, float], generation: int
+    ) -> bool:
+        if generation != self.generation:
+            return GLib.SOURCE_REMOVE
+        self.loading_blurred = False
+        self.blurred, self.luminance = texture, luminance
+        if callback := self.blurred_callback:
+            self.blurred_callback = None
+            callback(self)
+        return GLib.SOURCE_REMOVE
 
-        return self.blurred
+    def watch_picture(self, picture: Gtk.Picture) -> None:
+        self.pictures.add(picture)
+        if picture not in self.map_handler_ids:
+            self.map_handler_ids[picture] = picture.connect("map", self.clock.wake)
 
     def add_picture(self, picture: Gtk.Picture) -> None:
-        self.pictures.add(picture)
-        if not self.animation:
-            self.set_texture(self.texture)
+        self.watch_picture(picture)
+        if self.animated:
+            self.clock.add(self)
+            picture.set_paintable(
+                self.frames[self.frame_index][0] if self.frames else self.placeholder
+            )
         else:
-            self.update_animation((self.task, self.animation))
+            picture.set_paintable(self.texture or self.placeholder)
 
-    def set_texture(self, texture: Gdk.Texture) -> None:
-        self.pictures.discard(
-            picture for picture in self.pictures if not picture.is_visible()
-        )
+    def remove_picture(self, picture: Gtk.Picture) -> None:
+        self.pictures.discard(picture)
+        if (handler_id := self.map_handler_ids.pop(picture, None)) is not None:
+            picture.disconnect(handler_id)
         if not self.pictures:
-            self.animation = None
-        else:
-            for picture in self.pictures:
-                picture.set_paintable(texture or self.placeholder)
-                picture.queue_draw()
+            self.clock.remove(self)
+            self.pause()
 
-    def update_animation(self, data: GdkPixbuf.PixbufAnimation) -> None:
-        if self.animation == data[1]:
-            self.anim_iter.advance()  # type: ignore
+    def pause(self) -> None:
+        self.next_frame_time = 0
+        if self.frames is not None and self not in self.clock.paused:
+            self.clock.pause(self)
 
-            self.set_texture(Gdk.Texture.new_for_pixbuf(self.anim_iter.get_pixbuf()))  # type: ignore
+    def set_texture(self, texture: Optional[Gdk.Texture]) -> None:
+        for picture in self.pictures:
+            picture.set_paintable(texture or self.placeholder)
 
-            delay_time = self.anim_iter.get_delay_time()  # type: ignore
-            GLib.timeout_add(
-                20 if delay_time < 20 else delay_time,
-                self.update_animation,
-                data,
-            )
+    def play(self, now: int) -> bool:
+        """Show the frame due at a frame clock time, returns False if paused"""
+        if not any(picture.get_mapped() for picture in self.pictures):
+            self.pause()
+            return False
+
+        if self.frames is None:
+            self.decode_frames()
+            return False
+
+        self.clock.resume(self)
+        if not self.next_frame_time:
+            # Resume on the frame shown when paused
+            self.next_frame_time = now + self.frames[self.frame_index][1] * 1000
+            self.set_texture(self.frames[self.frame_index][0])
+            return True
+        if now < self.next_frame_time:
+            return True
+
+        # Don't catch up on the frames missed while the window was unfocused
+        if now - self.next_frame_time > 1_000_000:
+            self.next_frame_time = now
+        while now >= self.next_frame_time:
+            self.frame_index = (self.frame_index + 1) % len(self.frames)
+            self.next_frame_time += self.frames[self.frame_index][1] * 1000
+        self.set_texture(self.frames[self.frame_index][0])
+        return True
+
+    def decode_frames(self) -> None:
+        if self.decoding:
+            return
+        self.decoding = True
+        Thread(
+            target=self.decode_thread_func,
+            args=(self.path, self.generation),
+            daemon=True,
+        ).start()
+
+    def decode_thread_func(self, path: Path, generation: int) -> None:
+        frames = []
+        try:
+            with Image.open(path) as image:
+                for frame in ImageSequence.Iterator(image):
+                    rgba = frame.convert("RGBA")
+                    texture = Gdk.MemoryTexture.new(
+                        rgba.width,
+                        rgba.height,
+                        Gdk.MemoryFormat.R8G8B8A8,
+                        GLib.Bytes.new(rgba.tobytes()),
+                        rgba.width * 4,
+                    )
+                    # Some GIFs have no or tiny delays
+                    frames.append((texture, max(frame.info.get("duration", 100), 20)))
+        except OSError as error:
+            logging.error("Couldn't decode animated cover %s", path, exc_info=error)
+            frames = []
+        GLib.idle_add(self.on_frames_decoded, frames, generation)
+
+    def on_frames_decoded(
+        self, frames: list[tuple[Gdk.Texture, int]], generation: int
+    ) -> bool:
+        if generation != self.generation:
+            return GLib.SOURCE_REMOVE
+        self.decoding = False
+        if not frames:
+            # Show the cover as a still image
+            self.clock.remove(self)
+            try:
+                self.texture = self.get_texture()
+            except GLib.Error:
+                self.texture = None
+            self.set_texture(self.texture)
+            return GLib.SOURCE_REMOVE
+
+        self.frames = frames
+        self.frame_index = 0
+        self.next_frame_time = 0
+        self.frames_size = sum(
+            texture.get_width() * texture.get_height() * 4 for texture, _delay in frames
+        )
+        self.clock.frames_size += self.frames_size
+        self.set_texture(frames[0][0])
+        self.clock.trim()
+        self.clock.wake()
+        return GLib.SOURCE_REMOVE
+
+    def drop_frames(self) -> None:
+        self.clock.frames_size -= self.frames_size
+        self.clock.paused.pop(self, None)
+        self.frames = None
+        self.frames_size = 0
+        self.frame_index = 0
+        self.next_frame_time = 0
@@ -18,6 +18,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import shlex
+from locale import strxfrm
 from pathlib import Path
 from time import time
 from typing import Any, Optional, Callable
@@ -50,12 +51,18 @@ class GameData(GObject.Object):
     removed: bool = False
     blacklisted: bool = False
     version: int = 0
+    loading: int = 0
+
+    # Collation key of the name, and the name it was computed for
+    sort_name: str = ""
+    sort_name_source: Optional[str] = None
 
     # Signals for communication with widget
     __gsignals__ = {
         "update-ready": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
         "save-ready": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
         "toast": (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+        "loading-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
 
     def __init__(self, data: dict[str, Any]):
@@ -83,6 +90,15 @@ class GameData(GObject.Object):
             if key == "executable" and isinstance(value, list):
                 value = shlex.join(value)
             setattr(self, key, value)
+        if "source" in data:
+            self.base_source = self.source.split("_")[0]
+
+    def get_sort_name(self) -> str:
+        """Get the locale-aware sort key of the name, computed again when it changes"""
+        if self.sort_name_source != self.name:
+            self.sort_name = strxfrm(self.name.casefold().removeprefix("the "))
+            self.sort_name_source = self.name
+        return self.sort_name
 
     def update(self) -> None:
         """Signals the need for interface update"""
@@ -92,6 +108,11 @@ class GameData(GObject.Object):
         """Signals the need for data saving"""
         self.emit("save-ready", {})
 
+    def set_loading(self, state: int) -> None:
+        """Add to the loading counter, the game is loading while it is positive"""
+        self.loading += state
+        self.emit("loading-changed")
+
     def create_toast(self, message: str) -> None:
         """Signals the need to show notification"""
         self.emit("toast", message)
@@ -19,7 +19,6 @@
 
 from typing import Any
 
-from sofl.game import Game
 from sofl.game_data import GameData
 from sofl.onlinefix_game import OnlineFixGameData
 
@@ -27,24 +26,22 @@ class GameFactory:
     """Factory for creating the appropriate game type based on source"""
     
     @staticmethod
-    def create_game(data: dict[str, Any], **kwargs: Any) -> Game:
+    def create_game(data: dict[str, Any]) -> GameData:
         """
         Create a game instance of the appropriate type.
+
+        Widgets are not created here, the library view creates them
+        only for the games it displays.
         
         Args:
             data: Dictionary with game data
-            kwargs: Additional keyword arguments
             
         Returns:
-            An instance of Game with appropriate GameData
+            An instance of the appropriate GameData class
         """
         source = data.get("source", "")
         
         # Create the appropriate GameData instance based on source
         if source == "online-fix" or source.startswith("online-fix_"):
-            game_data = OnlineFixGameData(data)
-        else:
-            game_data = GameData(data)
-        
-        # Create Game instance with appropriate GameData
-        return Game(game_data, **kwargs) 
\ No newline at end of file
+            return OnlineFixGameData(data)
+        return GameData(data)
@@ -24,7 +24,7 @@ from typing import NamedTuple
 import yaml
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import Location, LocationSubPath
 from sofl.importer.source import SourceIterable, URLExecutableSource
@@ -91,6 +91,9 @@ class BottlesSource(URLExecutableSource):
 
     locations: BottlesLocations
 
+    def get_fingerprint_paths(self) -> tuple[Path, ...]:
+        return (self.locations.data["library.yml"], self.locations.data["data.yml"])
+
     def __init__(self) -> None:
         super().__init__()
         self.locations = BottlesLocations(
@@ -21,34 +21,67 @@ import os
 import shlex
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
 from pathlib import Path
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
 from gi.repository import GLib, Gtk
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
-from sofl.importer.source import Source, SourceIterable
+from sofl.importer.source import Source, SourceIterable, stat_fingerprint
+from sofl.utils.metadata_cache import MetadataCache, get_metadata_cache
 
 
 class DesktopSourceIterable(SourceIterable):
     source: "DesktopSource"
 
-    def __iter__(self):
-        """Generator method producing games"""
+    max_workers: int = min(8, os.cpu_count() or 1)
+    icon_cache_ttl = 30 * 24 * 60 * 60
+
+    which_cache: dict[str, bool]
+    icon_theme: Optional[Gtk.IconTheme] = None
+    icon_cache: MetadataCache
+    icons_stamp: str
+
+    def __init__(self, source: "DesktopSource") -> None:
+        super().__init__(source)
+        self.which_cache = {}
+        self.icon_cache = get_metadata_cache(shared.metadata_cache_db, "desktop_icons")
+
+    def get_entries(self) -> list[Path]:
+        """
+        List the desktop entries of every search path.
+        Following XDG precedence, an entry hides the ones with the same
+        desktop ID in the later search paths.
+        """
+        entries: dict[str, Path] = {}
+        for search_path in self.source.get_search_paths():
+            if str(search_path).startswith("/app/"):
+                continue
 
-        icon_theme = Gtk.IconTheme.new()
+            path = Path(search_path) / "applications"
 
-        search_paths = [
-            shared.host_data_dir,
-            "/run/host/usr/local/share",
-            "/run/host/usr/share",
-            "/run/host/usr/share/pixmaps",
-            "/usr/share/pixmaps",
-        ] + GLib.get_system_data_dirs()
+            if not path.is_dir():
+                continue
+
+            for entry in path.iterdir():
+                if entry.suffix != ".desktop":
+                    continue
 
-        for search_path in search_paths:
+                # Skip Lutris games
+                if str(entry.name).startswith("net.lutris."):
+                    continue
+
+                entries.setdefault(entry.name, entry)
+
+        return list(entries.values())
+
+    def get_icon_dirs(self) -> list[Path]:
+        icon_dirs = []
+        for search_path in self.source.get_search_paths():
             path = Path(search_path)
 
             if not str(search_path).endswith("/pixmaps"):
@@ -60,122 +93,149 @@ class DesktopSourceIterable(SourceIterable):
             if str(path).startswith("/app/"):
                 continue
 
-            icon_theme.add_search_path(str(path))
+            icon_dirs.append(path)
+        return icon_dirs
+
+    def get_icons_stamp(self, icon_dirs: list[Path]) -> str:
+        """Fingerprint the icon dirs, changes when icons or themes are installed"""
+        paths = []
+        for icon_dir in icon_dirs:
+            paths.append(icon_dir)
+            try:
+                theme_dirs = list(icon_dir.iterdir())
+            except OSError:
+                continue
+            for theme_dir in theme_dirs:
+                if theme_dir.is_dir():
+                    paths.extend((theme_dir, theme_dir / "icon-theme.cache"))
+        return blake2b(
+            stat_fingerprint(*paths).encode("utf-8"), digest_size=8
+        ).hexdigest()
+
+    def which(self, command: str) -> bool:
+        """Check if a command exists, memoized for the scan"""
+        if (exists := self.which_cache.get(command)) is None:
+            exists = self.which_cache[command] = shutil.which(command) is not None
+        return exists
+
+    def parse_entry(self, entry: Path) -> Optional[tuple[str, Optional[str]]]:
+        """Get the name and icon of a game's desktop entry, None if not a game"""
+        keyfile = GLib.KeyFile.new()
 
-        launch_command, full_path = self.check_launch_commands()
+        try:
+            keyfile.load_from_file(str(entry), 0)
 
-        for path in search_paths:
-            if str(path).startswith("/app/"):
-                continue
+            if "Game" not in keyfile.get_string_list("Desktop Entry", "Categories"):
+                return None
 
-            path = Path(path) / "applications"
+            name = keyfile.get_string("Desktop Entry", "Name")
+            executable = keyfile.get_string("Desktop Entry", "Exec").split(" %")[0]
+        except GLib.Error:
+            return None
 
-            if not path.is_dir():
-                continue
+        try:
+            if not self.which(keyfile.get_string("Desktop Entry", "TryExec")):
+                return None
+        except GLib.Error:
+            pass
+
+        # Skip Steam games
+        if "steam://rungameid/" in executable:
+            return None
+
+        # Skip Heroic games
+        if "heroic://launch/" in executable:
+            return None
+
+        # Skip Bottles games
+        if "bottles-cli " in executable:
+            return None
+
+        for key in ("NoDisplay", "Hidden"):
+            try:
+                if keyfile.get_boolean("Desktop Entry", key):
+                    return None
+            except GLib.Error:
+                pass
 
-            for entry in path.iterdir():
-                if entry.suffix != ".desktop":
-                    continue
+        try:
+            icon_str = keyfile.get_string("Desktop Entry", "Icon")
+        except GLib.Error:
+            icon_str = None
 
-                # Skip Lutris games
-                if str(entry.name).startswith("net.lutris."):
-                    continue
+        return name, icon_str
 
-                keyfile = GLib.KeyFile.new()
+    def lookup_icon(self, icon_name: str) -> Optional[Path]:
+        """Get the path of a themed icon, cached on disk until the icons change"""
+        key = f"{self.icons_stamp}:{icon_name}"
+        if (cached := self.icon_cache.get(key)) is not MetadataCache.MISSING:
+            return Path(cached) if cached else None
 
-                try:
-                    keyfile.load_from_file(str(entry), 0)
+        if self.icon_theme is None:
+            self.icon_theme = Gtk.IconTheme.new()
+            for icon_dir in self.get_icon_dirs():
+                self.icon_theme.add_search_path(str(icon_dir))
 
-                    if "Game" not in keyfile.get_string_list(
-                        "Desktop Entry", "Categories"
-                    ):
-                        continue
+        icon_path = None
+        try:
+            icon_path = (
+                self.icon_theme.lookup_icon(
+                    icon_name, None, 512, 1, Gtk.TextDirection.NONE, 0
+                )
+                .get_file()
+                .get_path()
+            )
+        except GLib.Error:
+            pass
 
-                    name = keyfile.get_string("Desktop Entry", "Name")
-                    executable = keyfile.get_string("Desktop Entry", "Exec").split(
-                        " %"
-                    )[0]
-                except GLib.Error:
-                    continue
+        self.icon_cache.set(key, icon_path, self.icon_cache_ttl)
+        return Path(icon_path) if icon_path else None
 
-                try:
-                    try_exec = "which " + keyfile.get_string("Desktop Entry", "TryExec")
-                    if not self.check_command(try_exec):
-                        continue
+    def __iter__(self):
+        """Generator method producing games"""
 
-                except GLib.Error:
-                    pass
+        launch_command, full_path = self.check_launch_commands()
+        self.icons_stamp = self.get_icons_stamp(self.get_icon_dirs())
 
-                # Skip Steam games
-                if "steam://rungameid/" in executable:
-                    continue
+        # Parse the entries in parallel, they're many small files
+        entries = self.get_entries()
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            parsed_entries = list(pool.map(self.parse_entry, entries))
 
-                # Skip Heroic games
-                if "heroic://launch/" in executable:
-                    continue
+        for entry, parsed_entry in zip(entries, parsed_entries):
+            if parsed_entry is None:
+                continue
+            name, icon_str = parsed_entry
 
-                # Skip Bottles games
-                if "bottles-cli " in executable:
-                    continue
+            # Strip /run/host from Flatpak paths
+            if entry.is_relative_to(prefix := "/run/host"):
+                entry = Path("/") / entry.relative_to(prefix)
 
-                try:
-                    if keyfile.get_boolean("Desktop Entry", "NoDisplay"):
-                        continue
-                except GLib.Error:
-                    pass
-
-                try:
-                    if keyfile.get_boolean("Desktop Entry", "Hidden"):
-                        continue
-                except GLib.Error:
-                    pass
-
-                # Strip /run/host from Flatpak paths
-                if entry.is_relative_to(prefix := "/run/host"):
-                    entry = Path("/") / entry.relative_to(prefix)
-
-                launch_arg = shlex.quote(str(entry if full_path else entry.stem))
-
-                values = {
-                    "name": name,
-                    "source": self.source.source_id,
-                    "game_id": f"desktop_{entry.stem}",
-                    "executable": f"{launch_command} {launch_arg}",
-                    "added": shared.import_time,
-                }
-                game = GameFactory.create_game(values)
-
-                additional_data = {}
-
-                try:
-                    icon_str = keyfile.get_string("Desktop Entry", "Icon")
-                except GLib.Error:
-                    yield game
-                    continue
-                else:
-                    if "/" in icon_str:
-                        additional_data = {"local_icon_path": Path(icon_str)}
-                        yield (game, additional_data)
-                        continue
-
-                try:
-                    if (
-                        icon_path := icon_theme.lookup_icon(
-                            icon_str,
-                            None,
-                            512,
-                            1,
-                            shared.win.get_direction(),
-                            0,
-                        )
-                        .get_file()
-                        .get_path()
-                    ):
-                        additional_data = {"local_icon_path": Path(icon_path)}
-                except GLib.Error:
-                    pass
-
-                yield (game, additional_data)
+            launch_arg = shlex.quote(str(entry if full_path else entry.stem))
+
+            values = {
+                "name": name,
+                "source": self.source.source_id,
+                "game_id": f"desktop_{entry.stem}",
+                "executable": f"{launch_command} {launch_arg}",
+                "added": shared.import_time,
+            }
+            game = GameFactory.create_game(values)
+
+            if icon_str is None:
+                yield game
+                continue
+
+            if "/" in icon_str:
+                icon_path = Path(icon_str)
+            else:
+                icon_path = self.lookup_icon(icon_str)
+
+            additional_data = {}
+            if icon_path:
+                additional_data = {"local_icon_path": icon_path}
+
+            yield (game, additional_data)
 
     def check_command(self, command) -> bool:
         try:
@@ -228,3 +288,21 @@ class DesktopSource(Source):
     def __init__(self) -> None:
         super().__init__()
         self.locations = DesktopLocations()
+
+    def get_search_paths(self) -> list:
+        """Get the data dirs containing the desktop entries and their icons"""
+        return [
+            shared.host_data_dir,
+            "/run/host/usr/local/share",
+            "/run/host/usr/share",
+            "/run/host/usr/share/pixmaps",
+            "/usr/share/pixmaps",
+        ] + GLib.get_system_data_dirs()
+
+    def get_watch_paths(self) -> set[Path]:
+        return {
+            path
+            for search_path in self.get_search_paths()
+            if not str(search_path).startswith("/app/")
+            and (path := Path(search_path) / "applications").is_dir()
+        }
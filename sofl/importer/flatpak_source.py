@@ -24,7 +24,7 @@ from typing import NamedTuple
 from gi.repository import GLib, Gtk
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import Location, LocationSubPath
 from sofl.importer.source import ExecutableFormatSource, SourceIterable
@@ -121,7 +121,7 @@ class FlatpakSourceIterable(SourceIterable):
                         None,
                         512,
                         1,
-                        shared.win.get_direction(),
+                        Gtk.TextDirection.NONE,
                         0,
                     )
                     .get_file()
@@ -152,6 +152,14 @@ class FlatpakSource(ExecutableFormatSource):
 
     locations: FlatpakLocations
 
+    def get_watch_paths(self) -> set[Path]:
+        # Installed apps are exported there, the location roots barely change
+        return super().get_watch_paths() | {
+            path
+            for location in self.locations
+            if (path := location["applications"]) and path.is_dir()
+        }
+
     def __init__(self) -> None:
         super().__init__()
         self.locations = FlatpakLocations(
@@ -28,7 +28,7 @@ from pathlib import Path
 from typing import Iterable, NamedTuple, Optional, TypedDict
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import Location, LocationSubPath
 from sofl.importer.source import (
@@ -36,6 +36,7 @@ from sofl.importer.source import (
     SourceIterationResult,
     URLExecutableSource,
 )
+from sofl.utils.json_stream import iter_json_array
 
 
 def path_json_load(path: Path):
@@ -120,21 +121,28 @@ class SubSourceIterable(Iterable):
 
         return (game, additional_data)
 
-    def __iter__(self):
-        """
-        Iterate through the games with a generator
-        :raises InvalidLibraryFileError: on initial call if the library file is bad
+    def iter_library_entries(self) -> Iterable[HeroicLibraryEntry]:
         """
+        Decode the library entries as the library file is read,
+        these files can be tens of MB for big accounts.
 
+        :raises InvalidLibraryFileError: if the library file is bad
+        """
         try:
-            iterator = iter(
-                path_json_load(self.library_path)[self.library_json_entries_key]
-            )
-        except (OSError, JSONDecodeError, TypeError, KeyError) as error:
+            with self.library_path.open("r", encoding="utf-8") as open_file:
+                yield from iter_json_array(open_file, self.library_json_entries_key)
+        except (OSError, JSONDecodeError, KeyError) as error:
             raise InvalidLibraryFileError(
                 f"Invalid {self.library_path.name}"
             ) from error
-        for entry in iterator:
+
+    def __iter__(self):
+        """
+        Iterate through the games with a generator
+        :raises InvalidLibraryFileError: if the library file is bad,
+        the games of the entries before the error are still produced
+        """
+        for entry in self.iter_library_entries():
             try:
                 yield self.process_library_entry(entry)
             except KeyError as error:
@@ -191,7 +199,7 @@ class StoreSubSourceIterable(SubSourceIterable):
     def __iter__(self):
         """
         Iterate through the installed games with a generator
-        :raises InvalidLibraryFileError: on initial call if the library file is bad
+        :raises InvalidLibraryFileError: if the library file is bad
         :raises InvalidInstalledFileError: on initial call if the installed file is bad
         """
         self.installed_app_names = self.get_installed_app_names()
@@ -365,6 +373,20 @@ class HeroicSource(URLExecutableSource):
         """The string format used to construct game IDs"""
         return self.source_id + "_{service}_{game_id}"
 
+    def get_fingerprint_paths(self) -> tuple[Path, ...]:
+        paths = [self.locations.config["store_config.json"]]
+        for sub_source_class in (
+            SideloadIterable,
+            LegendaryIterable,
+            GogIterable,
+            NileIterable,
+        ):
+            sub_source = sub_source_class(self, None)
+            paths.append(sub_source.library_path)
+            if isinstance(sub_source, StoreSubSourceIterable):
+                paths.append(sub_source.installed_path)
+        return tuple(paths)
+
     def __init__(self) -> None:
         super().__init__()
         self.locations = HeroicLocations(
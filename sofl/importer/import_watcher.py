@@ -0,0 +1,189 @@
+# import_watcher.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+from pathlib import Path
+from threading import Thread
+from time import monotonic
+from typing import Any, Iterable, Optional
+
+from gi.repository import Gio, GLib
+
+from sofl import shared
+from sofl.importer.importer import Importer
+from sofl.importer.location import UnresolvableLocationError
+from sofl.importer.source import Source
+
+
+class ImportWatcher:
+    """
+    Imports the new games of the sources as they are installed.
+
+    * The directories of every enabled source are watched with `Gio.FileMonitor`
+    * Bursts of changes are debounced, a busy source is still scanned
+    at least every `max_delay_ms`
+    * Only the changed sources are scanned, by a background `Importer`
+    * Must only be used from the main thread
+    """
+
+    debounce_ms: int = 3000
+    max_delay_ms: int = 30000
+
+    # Events telling that a file is done changing
+    watched_events = {
+        Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+        Gio.FileMonitorEvent.CREATED,
+        Gio.FileMonitorEvent.DELETED,
+        Gio.FileMonitorEvent.MOVED_IN,
+        Gio.FileMonitorEvent.MOVED_OUT,
+        Gio.FileMonitorEvent.RENAMED,
+    }
+
+    source_classes: dict[str, type[Source]]
+    monitors: list[Gio.FileMonitor]
+    pending_source_ids: set[str]
+    pending_since: float = 0
+    timeout_id: Optional[int] = None
+    running: bool = False
+    generation: int = 0
+    # Kept apart from `shared.importer`, whose last manual import can be undone
+    importer: Optional[Importer] = None
+
+    def __init__(self, source_classes: Iterable[type[Source]]) -> None:
+        self.source_classes = {
+            source_class.source_id: source_class for source_class in source_classes
+        }
+        self.monitors = []
+        self.pending_source_ids = set()
+        shared.schema.connect("changed", self.on_settings_changed)
+
+    def start(self) -> None:
+        """Start watching the enabled sources"""
+        self.stop()
+        self.running = True
+        source_ids = {
+            source_id
+            for source_id in self.source_classes
+            if shared.schema.get_boolean(source_id)
+        }
+        # Resolving the locations hits the disk, do it in the background
+        Thread(
+            target=self.resolve_thread_func,
+            args=(source_ids, self.generation),
+            daemon=True,
+        ).start()
+
+    def stop(self) -> None:
+        """Stop watching, forget the pending changes"""
+        # Results of a resolution started before are obsolete
+        self.running = False
+        self.generation += 1
+        for monitor in self.monitors:
+            monitor.cancel()
+        self.monitors = []
+        self.pending_source_ids = set()
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+
+    def resolve_thread_func(self, source_ids: set[str], generation: int) -> None:
+        watch_paths = {}
+        for source_id in source_ids:
+            source = self.source_classes[source_id]()
+            if not source.is_available:
+                continue
+            try:
+                watch_paths[source_id] = source.get_watch_paths()
+            except (OSError, UnresolvableLocationError) as error:
+                logging.debug("Not watching source %s", source_id, exc_info=error)
+        GLib.idle_add(self.create_monitors, watch_paths, generation)
+
+    def create_monitors(
+        self, watch_paths: dict[str, set[Path]], generation: int
+    ) -> bool:
+        if generation != self.generation:
+            return GLib.SOURCE_REMOVE
+        for source_id, paths in watch_paths.items():
+            for path in paths:
+                try:
+                    monitor = Gio.File.new_for_path(str(path)).monitor_directory(
+                        Gio.FileMonitorFlags.WATCH_MOVES, None
+                    )
+                except GLib.Error as error:
+                    logging.debug("Couldn't watch %s", path, exc_info=error)
+                    continue
+                monitor.connect("changed", self.on_changed, source_id)
+                self.monitors.append(monitor)
+                logging.debug("Watching %s for source %s", path, source_id)
+        return GLib.SOURCE_REMOVE
+
+    def on_changed(
+        self,
+        _monitor: Gio.FileMonitor,
+        file: Gio.File,
+        _other_file: Optional[Gio.File],
+        event: Gio.FileMonitorEvent,
+        source_id: str,
+    ) -> None:
+        if event not in self.watched_events:
+            return
+        logging.debug("Change in source %s: %s", source_id, file.get_path())
+        self.schedule_import(source_id)
+
+    def schedule_import(self, source_id: str) -> None:
+        """Debounce the import of a changed source"""
+        now = monotonic()
+        if not self.pending_source_ids:
+            self.pending_since = now
+        self.pending_source_ids.add(source_id)
+
+        # Wait for the changes to settle, but not forever
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+        elapsed_ms = (now - self.pending_since) * 1000
+        delay_ms = max(0, min(self.debounce_ms, self.max_delay_ms - elapsed_ms))
+        self.timeout_id = GLib.timeout_add(int(delay_ms), self.on_timeout)
+
+    def on_timeout(self) -> bool:
+        self.timeout_id = None
+
+        # Another import or the initial loading is running, try again later
+        if shared.win.get_application().state != shared.AppState.DEFAULT:
+            self.timeout_id = GLib.timeout_add(self.debounce_ms, self.on_timeout)
+            return GLib.SOURCE_REMOVE
+
+        source_ids = self.pending_source_ids
+        self.pending_source_ids = set()
+        logging.info("Importing changed sources: %s", ", ".join(sorted(source_ids)))
+
+        self.importer = Importer(background=True)
+        for source_id in source_ids:
+            self.importer.add_source(self.source_classes[source_id]())
+        self.importer.run()
+        return GLib.SOURCE_REMOVE
+
+    def on_settings_changed(self, _settings: Any, key: str) -> None:
+        """Follow the watcher switch and the enabled sources"""
+        if key == "watch-sources":
+            if shared.schema.get_boolean(key):
+                self.start()
+            else:
+                self.stop()
+        elif key in self.source_classes and self.running:
+            self.start()
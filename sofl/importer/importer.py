@@ -19,6 +19,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
+from threading import Thread
 from time import time
 from typing import Any, Optional
 
@@ -27,16 +28,24 @@ from gi.repository import Adw, Gio, GLib, Gtk
 from sofl import shared
 from sofl.errors.error_producer import ErrorProducer
 from sofl.errors.friendly_error import FriendlyError
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.importer.location import UnresolvableLocationError
 from sofl.importer.source import Source
 from sofl.store.managers.async_manager import AsyncManager
 from sofl.store.pipeline import Pipeline
+from sofl.utils.cover_backdrop import prune_backdrops
+from sofl.utils.save_cover import prune_cover_cache
 
 
 # pylint: disable=too-many-instance-attributes
 class Importer(ErrorProducer):
-    """A class in charge of scanning sources for games"""
+    """
+    A class in charge of scanning sources for games
+
+    * In the background mode (used by the import watcher) no dialog is shown,
+    only the removed games of the scanned sources are considered
+    and the summary is only shown if something changed
+    """
 
     progressbar: Gtk.ProgressBar
     import_statuspage: Adw.StatusPage
@@ -52,12 +61,17 @@ class Importer(ErrorProducer):
 
     removed_game_ids: set[str]
     imported_game_ids: set[str]
+    # Games of the sources (or source entries) skipped because they didn't change
+    kept_game_ids: set[str]
 
     close_attempt_id: int
+    background: bool
 
-    def __init__(self) -> None:
+    def __init__(self, background: bool = False) -> None:
         super().__init__()
 
+        self.background = background
+
         shared.import_time = int(time())
 
         # TODO: make this stateful
@@ -66,6 +80,7 @@ class Importer(ErrorProducer):
 
         self.removed_game_ids = set()
         self.imported_game_ids = set()
+        self.kept_game_ids = set()
 
         self.game_pipelines = set()
         self.sources = set()
@@ -108,19 +123,21 @@ class Importer(ErrorProducer):
         """Use several Gio.Task to import games from added sources"""
         shared.win.get_application().state = shared.AppState.IMPORT
 
-        if self.__class__.summary_toast:
+        if self.__class__.summary_toast and not self.background:
             self.__class__.summary_toast.dismiss()
 
         shared.win.get_application().lookup_action("import").set_enabled(False)
-        shared.win.get_application().lookup_action("add_game").set_enabled(False)
-        shared.win.get_application().lookup_action("preferences").set_enabled(False)
+        if not self.background:
+            shared.win.get_application().lookup_action("add_game").set_enabled(False)
+            shared.win.get_application().lookup_action("preferences").set_enabled(False)
 
         self.n_pipelines_done = 0
         self.n_source_tasks_done = 0
 
-        self.create_dialog()
         GLib.timeout_add(100, self.monitor_import)
-        GLib.timeout_add(100, self.__watchdog)
+        if not self.background:
+            self.create_dialog()
+            GLib.timeout_add(100, self.__watchdog)
 
         # Collect all errors and reset the cancellables for the managers
         # - Only one importer exists at any given time
@@ -150,7 +167,6 @@ class Importer(ErrorProducer):
         self.import_dialog.force_close()
         return shared.win.get_visible_dialog() == self.import_dialog
 
-
     def monitor_import(self) -> bool:
         """Monitor import progress to update dialog and to trigger import cleanup
         once the work has finished"""
@@ -164,27 +180,46 @@ class Importer(ErrorProducer):
     def finish_import(self) -> None:
         """Callback called when importing has finished"""
         logging.info("Import done")
+        logging.debug(
+            "Scheduler peak running tasks: %d, per manager: %s",
+            shared.store.scheduler.peak_total_running,
+            shared.store.scheduler.stats,
+        )
         self.remove_games()
+        Thread(target=prune_cover_cache, daemon=True).start()
+        Thread(target=prune_backdrops, daemon=True).start()
         self.imported_game_ids = shared.store.new_game_ids
         shared.store.new_game_ids = set()
         shared.store.duplicate_game_ids = set()
-        # Disconnect the close-attempt signal that closes the main window
-        self.import_dialog.disconnect(self.close_attempt_id)
-        # Workaround: Dialog won't close if closed too soon after opening.
-        self.import_dialog.force_close()
-        self.__class__.summary_toast = self.create_summary_toast()
-        self.create_error_dialog()
+        if self.background:
+            if self.n_games_added or self.removed_game_ids:
+                if self.__class__.summary_toast:
+                    self.__class__.summary_toast.dismiss()
+                self.__class__.summary_toast = self.create_summary_toast()
+            # The errors were logged, don't interrupt the user with them
+            self.collect_errors()
+            for manager in shared.store.managers.values():
+                manager.collect_errors()
+        else:
+            # Disconnect the close-attempt signal that closes the main window
+            self.import_dialog.disconnect(self.close_attempt_id)
+            # Workaround: Dialog won't close if closed too soon after opening.
+            self.import_dialog.force_close()
+            self.__class__.summary_toast = self.create_summary_toast()
+            self.create_error_dialog()
         shared.win.get_application().lookup_action("import").set_enabled(True)
         shared.win.get_application().lookup_action("add_game").set_enabled(True)
         shared.win.get_application().lookup_action("preferences").set_enabled(True)
         shared.win.get_application().state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
+        shared.win.update_source_rows()
 
     def remove_games(self) -> None:
         """Set removed to True for missing games"""
         if not shared.schema.get_boolean("remove-missing"):
             return
 
+        scanned_source_ids = {source.source_id for source in self.sources}
+
         for game in shared.store:
             if game.removed:
                 continue
@@ -192,10 +227,14 @@ class Importer(ErrorProducer):
                 continue
             if not shared.schema.get_boolean(game.base_source):
                 continue
+            if self.background and game.base_source not in scanned_source_ids:
+                continue
             if game.game_id in shared.store.duplicate_game_ids:
                 continue
             if game.game_id in shared.store.new_game_ids:
                 continue
+            if game.game_id in self.kept_game_ids:
+                continue
 
             logging.debug("Removing missing game %s (%s)", game.name, game.game_id)
 
@@ -222,8 +261,16 @@ class Importer(ErrorProducer):
             logging.info("Source %s skipped, bad location", source.source_id)
             return
 
+        # Skip the source if its inputs didn't change since the last scan
+        fingerprint = source.get_fingerprint()
+        if source.begin_scan(fingerprint):
+            logging.info("Source %s skipped, unchanged", source.source_id)
+            return
+
         # Get games from source
         logging.info("Scanning source %s", source.source_id)
+        scanned_game_ids = set()
+        has_errors = False
         while True:
             # Handle exceptions raised when iterating
             try:
@@ -233,10 +280,11 @@ class Importer(ErrorProducer):
             except Exception as error:  # pylint: disable=broad-exception-caught
                 logging.exception("%s in %s", type(error).__name__, source.source_id)
                 self.report_error(error)
+                has_errors = True
                 continue
 
             # Handle the result depending on its type
-            if isinstance(iteration_result, Game):
+            if isinstance(iteration_result, GameData):
                 game = iteration_result
                 additional_data = {}
             elif isinstance(iteration_result, tuple):
@@ -254,7 +302,16 @@ class Importer(ErrorProducer):
                 continue
 
             # Register game
-            pipeline: Pipeline = shared.store.add_game(game, additional_data)
+            scanned_game_ids.add(game.game_id)
+            pipeline: Pipeline = shared.store.add_game(
+                game,
+                additional_data,
+                priority=(
+                    Pipeline.PRIORITY_BACKGROUND
+                    if self.background
+                    else Pipeline.PRIORITY_DEFAULT
+                ),
+            )
             if pipeline is not None:
                 logging.info("Imported %s (%s)", game.name, game.game_id)
                 pipeline.connect(
@@ -263,9 +320,13 @@ class Importer(ErrorProducer):
                 )
                 self.game_pipelines.add(pipeline)
 
+        if not has_errors:
+            source.end_scan(fingerprint, scanned_game_ids)
+
     def source_callback(self, _obj: Any, _result: Any, data: tuple) -> None:
         """Callback executed when a source is fully scanned"""
         source, *_rest = data
+        self.kept_game_ids.update(source.kept_game_ids)
         logging.debug("Import done for source %s", source.source_id)
         self.n_source_tasks_done += 1
 
@@ -355,14 +416,16 @@ class Importer(ErrorProducer):
 
     def undo_import(self, *_args: Any) -> None:
         for game_id in self.imported_game_ids:
-            shared.store[game_id].removed = True
-            shared.store[game_id].update()
-            shared.store[game_id].save()
+            game = shared.store[game_id]
+            game.removed = True
+            game.update()
+            game.save()
 
         for game_id in self.removed_game_ids:
-            shared.store[game_id].removed = False
-            shared.store[game_id].update()
-            shared.store[game_id].save()
+            game = shared.store[game_id]
+            game.removed = False
+            game.update()
+            game.save()
 
         self.imported_game_ids = set()
         self.removed_game_ids = set()
@@ -18,16 +18,15 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from shutil import rmtree
-from sqlite3 import connect
+from pathlib import Path
 from typing import NamedTuple
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import Location, LocationSubPath
 from sofl.importer.source import SourceIterable, URLExecutableSource
-from sofl.utils.sqlite import copy_db
+from sofl.utils.sqlite import query_db
 
 
 class ItchSourceIterable(SourceIterable):
@@ -52,12 +51,10 @@ class ItchSourceIterable(SourceIterable):
             caves.game_id = games.id
         ;
         """
-        db_path = copy_db(self.source.locations.config["butler.db"])
-        connection = connect(db_path)
-        cursor = connection.execute(db_request)
+        rows = query_db(self.source.locations.config["butler.db"], db_request)
 
         # Create games from the db results
-        for row in cursor:
+        for row in rows:
             values = {
                 "name": row[1],
                 "source": self.source.source_id,
@@ -69,9 +66,6 @@ class ItchSourceIterable(SourceIterable):
             game = GameFactory.create_game(values)
             yield (game, additional_data)
 
-        # Cleanup
-        rmtree(str(db_path.parent))
-
 
 class ItchLocations(NamedTuple):
     config: Location
@@ -86,6 +80,10 @@ class ItchSource(URLExecutableSource):
 
     locations: ItchLocations
 
+    def get_fingerprint_paths(self) -> tuple[Path, ...]:
+        db_path = self.locations.config["butler.db"]
+        return (db_path, db_path.with_name(db_path.name + "-wal"))
+
     def __init__(self) -> None:
         super().__init__()
         self.locations = ItchLocations(
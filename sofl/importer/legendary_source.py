@@ -20,10 +20,11 @@
 import json
 import logging
 from json import JSONDecodeError
+from pathlib import Path
 from typing import NamedTuple
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import Location, LocationSubPath
 from sofl.importer.source import (
@@ -102,6 +103,9 @@ class LegendarySource(ExecutableFormatSource):
 
     locations: LegendaryLocations
 
+    def get_fingerprint_paths(self) -> tuple[Path, ...]:
+        return (self.locations.config["installed.json"],)
+
     def __init__(self) -> None:
         super().__init__()
         self.locations = LegendaryLocations(
@@ -17,16 +17,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
-from shutil import rmtree
-from sqlite3 import connect
+from pathlib import Path
 from typing import NamedTuple
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import Location, LocationSubPath
 from sofl.importer.source import SourceIterable, URLExecutableSource
-from sofl.utils.sqlite import copy_db
+from sofl.utils.sqlite import query_db
 
 
 class LutrisSourceIterable(SourceIterable):
@@ -63,15 +62,13 @@ class LutrisSourceIterable(SourceIterable):
             "import_steam": shared.schema.get_boolean("lutris-import-steam"),
             "import_flatpak": shared.schema.get_boolean("lutris-import-flatpak"),
         }
-        db_path = copy_db(self.source.locations.data["pga.db"])
-        connection = connect(db_path)
-        cursor = connection.execute(request, params)
+        rows = query_db(self.source.locations.data["pga.db"], request, params)
         coverart_is_dir = (
             coverart_path := self.source.locations.data.root / "coverart"
         ).is_dir()
 
         # Create games from the DB results
-        for row in cursor:
+        for row in rows:
             # Create game
             values = {
                 "added": shared.import_time,
@@ -93,9 +90,6 @@ class LutrisSourceIterable(SourceIterable):
 
             yield (game, additional_data)
 
-        # Cleanup
-        rmtree(str(db_path.parent))
-
 
 class LutrisLocations(NamedTuple):
     data: Location
@@ -116,6 +110,10 @@ class LutrisSource(URLExecutableSource):
     def game_id_format(self):
         return self.source_id + "_{runner}_{game_id}"
 
+    def get_fingerprint_paths(self) -> tuple[Path, ...]:
+        db_path = self.locations.data["pga.db"]
+        return (db_path, db_path.with_name(db_path.name + "-wal"))
+
     def __init__(self) -> None:
         super().__init__()
         self.locations = LutrisLocations(
@@ -17,7 +17,6 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import json
 import logging
 import re
 from hashlib import sha256
@@ -28,7 +27,7 @@ from typing import NamedTuple
 
 from sofl import shared
 from sofl.errors.friendly_error import FriendlyError
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import (
     Location,
@@ -37,10 +36,13 @@ from sofl.importer.location import (
 )
 from sofl.importer.source import Source, SourceIterable
 from sofl.importer.steam_source import SteamSource
+from sofl.utils.json_stream import iter_json_array
+from sofl.utils.steam import SteamFileHelper
 
 
 class RetroarchSourceIterable(SourceIterable):
     source: "RetroarchSource"
+    bad_playlists: set[str]
 
     def get_config_value(self, key: str, config_data: str):
         for item in re.findall(f'{key}\\s*=\\s*"(.*)"\n', config_data, re.IGNORECASE):
@@ -53,7 +55,7 @@ class RetroarchSourceIterable(SourceIterable):
         raise KeyError(f"Key not found in RetroArch config: {key}")
 
     def __iter__(self):
-        bad_playlists = set()
+        self.bad_playlists = set()
 
         config_file = self.source.locations.config["retroarch.cfg"]
         with config_file.open(encoding="utf-8") as open_file:
@@ -71,67 +73,88 @@ class RetroarchSourceIterable(SourceIterable):
 
         for playlist_file in playlist_files:
             logging.debug(playlist_file)
+
+            # Items are decoded as the playlist is read, the playlist header
+            # (with the default core) is written before them.
+            playlist_json = {}
+            deferred_items = []
             try:
                 with playlist_file.open(
                     encoding="utf-8",
                 ) as open_file:
-                    playlist_json = json.load(open_file)
+                    for item in iter_json_array(open_file, "items", playlist_json):
+                        if "default_core_path" not in playlist_json:
+                            deferred_items.append(item)
+                            continue
+                        yield from self.process_item(
+                            item, playlist_json, playlist_file, thumbnail_folder
+                        )
             except (JSONDecodeError, OSError):
                 logging.warning("Cannot read playlist file: %s", str(playlist_file))
                 continue
 
-            for item in playlist_json["items"]:
-                # Select the core.
-                # Try the content's core first, then the playlist's default core.
-                # If none can be used, warn the user and continue.
-                for core_path in (
-                    item["core_path"],
-                    playlist_json["default_core_path"],
-                ):
-                    if core_path not in ("DETECT", ""):
-                        break
-                else:
-                    logging.warning("Cannot find core for: %s", str(item["path"]))
-                    bad_playlists.add(playlist_file.stem)
-                    continue
-                # Use secure hashing algorithm
-                game_id = sha256(item["path"].encode("utf-8")).hexdigest()
-
-                values = {
-                    "name": item["label"],
-                    "source": self.source.source_id,
-                    "game_id": self.source.game_id_format.format(game_id=game_id),
-                    "executable": self.source.make_executable(
-                        core_path=core_path,
-                        rom_path=item["path"],
-                    ),
-                    "added": shared.import_time,
-                }
-                game = GameFactory.create_game(values)
-
-                # Get boxart
-                boxart_image_name = item["label"] + ".png"
-                boxart_image_name = re.sub(r"[&\*\/:`<>\?\\\|]", "_", boxart_image_name)
-                boxart_folder_name = playlist_file.stem
-                image_path = (
-                    thumbnail_folder
-                    / boxart_folder_name
-                    / "Named_Boxarts"
-                    / boxart_image_name
+            for item in deferred_items:
+                yield from self.process_item(
+                    item, playlist_json, playlist_file, thumbnail_folder
                 )
-                additional_data = {"local_image_path": image_path}
-
-                yield (game, additional_data)
 
-        if bad_playlists:
+        if self.bad_playlists:
             raise FriendlyError(
                 _("No RetroArch Core Selected"),
                 # The variable is a newline separated list of playlists
                 _("The following playlists have no default core:")
-                + "\n\n{}\n\n".format("\n".join(bad_playlists))
+                + "\n\n{}\n\n".format("\n".join(self.bad_playlists))
                 + _("Games with no core selected were not imported"),
             )
 
+    def process_item(
+        self,
+        item: dict,
+        playlist_json: dict,
+        playlist_file: Path,
+        thumbnail_folder: Path,
+    ):
+        """Generator producing the game of a playlist item, if it has a core"""
+
+        # Select the core.
+        # Try the content's core first, then the playlist's default core.
+        # If none can be used, warn the user and continue.
+        for core_path in (
+            item["core_path"],
+            playlist_json.get("default_core_path", ""),
+        ):
+            if core_path not in ("DETECT", ""):
+                break
+        else:
+            logging.warning("Cannot find core for: %s", str(item["path"]))
+            self.bad_playlists.add(playlist_file.stem)
+            return
+        # Use secure hashing algorithm
+        game_id = sha256(item["path"].encode("utf-8")).hexdigest()
+
+        values = {
+            "name": item["label"],
+            "source": self.source.source_id,
+            "game_id": self.source.game_id_format.format(game_id=game_id),
+            "executable": self.source.make_executable(
+                core_path=core_path,
+                rom_path=item["path"],
+            ),
+            "added": shared.import_time,
+        }
+        game = GameFactory.create_game(values)
+
+        # Get boxart
+        boxart_image_name = item["label"] + ".png"
+        boxart_image_name = re.sub(r"[&\*\/:`<>\?\\\|]", "_", boxart_image_name)
+        boxart_folder_name = playlist_file.stem
+        image_path = (
+            thumbnail_folder / boxart_folder_name / "Named_Boxarts" / boxart_image_name
+        )
+        additional_data = {"local_image_path": image_path}
+
+        yield (game, additional_data)
+
 
 class RetroarchLocations(NamedTuple):
     config: Location
@@ -175,6 +198,19 @@ class RetroarchSource(Source):
         # TODO enable when we get the Steam RetroArch games working
         # self.add_steam_location_candidate()
 
+    def get_fingerprint_paths(self) -> tuple[Path, ...]:
+        config_file = self.locations.config["retroarch.cfg"]
+        config_data = config_file.read_text(encoding="utf-8")
+        try:
+            playlist_folder = Path(
+                self.iterable_class(self).get_config_value(
+                    "playlist_directory", config_data
+                )
+            ).expanduser()
+        except KeyError:
+            return ()
+        return (config_file, playlist_folder, *sorted(playlist_folder.glob("*.lpl")))
+
     def add_steam_location_candidate(self) -> None:
         """Add the Steam RetroAcrh location to the config candidates"""
         try:
@@ -196,21 +232,12 @@ class RetroarchSource(Source):
 
         # Find Steam location
         libraryfolders = SteamSource().locations.data["libraryfolders.vdf"]
-        parse_apps = False
         with open(libraryfolders, "r", encoding="utf-8") as open_file:
-            # Search each line for a library path and store it each time a new one is found.
-            for line in open_file:
-                if '"path"' in line:
-                    library_path = re.findall(
-                        '"path"\\s+"(.*)"\n', line, re.IGNORECASE
-                    )[0]
-                elif '"apps"' in line:
-                    parse_apps = True
-                elif parse_apps and "}" in line:
-                    parse_apps = False
-                # Stop searching, as the library path directly above the appid has been found.
-                elif parse_apps and '"1118310"' in line:
-                    return Path(f"{library_path}/steamapps/common/RetroArch")
+            folders = SteamFileHelper().get_library_folders(open_file)
+        # Find the library folder where RetroArch is installed
+        for folder in folders:
+            if "1118310" in folder.get("apps", {}):
+                return Path(folder["path"]) / "steamapps" / "common" / "RetroArch"
         # Not found
         raise ValueError("RetroArch not found in Steam library")
 
@@ -17,17 +17,39 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import logging
 import sys
 from abc import abstractmethod
 from collections.abc import Iterable
+from pathlib import Path
 from typing import Any, Collection, Generator, Optional, TypeVar
 
-from sofl.game import Game
+from sofl import shared
+from sofl.game_data import GameData
 from sofl.importer.location import Location, UnresolvableLocationError
 from sofl.errors.friendly_error import FriendlyError
+from sofl.utils.metadata_cache import MetadataCache, get_metadata_cache
 
 # Type of the data returned by iterating on a Source
-SourceIterationResult = Optional[Game | tuple[Game, tuple[Any]]]
+SourceIterationResult = Optional[GameData | tuple[GameData, tuple[Any]]]
+
+
+def stat_fingerprint(*paths: Path) -> str:
+    """Fingerprint files from their metadata, missing files included"""
+    parts = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            parts.append(f"{path}:missing")
+        else:
+            parts.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}")
+    return "|".join(parts)
+
+
+def is_game_known(game_id: str) -> bool:
+    """Check that a game from a previous scan is still in the library"""
+    return (game := shared.store.get(game_id)) is not None and not game.removed
 
 
 class SourceIterable(Iterable):
@@ -38,6 +60,24 @@ class SourceIterable(Iterable):
     def __init__(self, source: "Source") -> None:
         self.source = source
 
+    def is_entry_unchanged(self, key: str, fingerprint: str) -> bool:
+        """
+        Check if an entry (eg. a manifest file) is unchanged since the last scan.
+        Unchanged entries don't need to be parsed again, their games are kept.
+        """
+        previous = self.source.previous_state.get("entries", {}).get(key)
+        if previous is None or previous[0] != fingerprint:
+            return False
+        if not all(is_game_known(game_id) for game_id in previous[1]):
+            return False
+        self.source.kept_game_ids.update(previous[1])
+        self.record_entry(key, fingerprint, *previous[1])
+        return True
+
+    def record_entry(self, key: str, fingerprint: str, *game_ids: str) -> None:
+        """Remember the fingerprint of a scanned entry and the games it produced"""
+        self.source.entries[key] = (fingerprint, game_ids)
+
     @abstractmethod
     def __iter__(self) -> Generator[SourceIterationResult, None, None]:
         """
@@ -62,6 +102,16 @@ class Source(Iterable):
     # They must not be shared between source instances.
     locations: Collection[Location]
 
+    # Incremental scan state
+    fingerprint_ttl = 30 * 24 * 60 * 60
+    previous_state: dict[str, Any] = {}
+    entries: dict[str, tuple[str, tuple[str, ...]]]
+    kept_game_ids: set[str]
+
+    def __init__(self) -> None:
+        self.entries = {}
+        self.kept_game_ids = set()
+
     @property
     def full_name(self) -> str:
         """The source's full name"""
@@ -85,6 +135,84 @@ class Source(Iterable):
         Should be implemented by child classes.
         """
 
+    @property
+    def fingerprint_cache(self) -> MetadataCache:
+        return get_metadata_cache(shared.metadata_cache_db, "source_fingerprints")
+
+    def get_fingerprint_paths(self) -> Iterable[Path]:
+        """
+        Get the files whose metadata change when the source's games change.
+        Should be implemented by child classes, if empty the source is always scanned.
+        """
+        return ()
+
+    def get_fingerprint(self) -> Optional[str]:
+        """Get the fingerprint of the source inputs and settings, None if unsupported"""
+        try:
+            paths = tuple(self.get_fingerprint_paths())
+        except OSError as error:
+            logging.debug(
+                "Couldn't fingerprint source %s", self.source_id, exc_info=error
+            )
+            return None
+        if not paths:
+            return None
+        settings_schema = shared.schema.props.settings_schema
+        settings = (
+            f"{key}={shared.schema.get_value(key)}"
+            for key in sorted(settings_schema.list_keys())
+            if key.startswith(self.source_id)
+        )
+        return "|".join((*settings, stat_fingerprint(*paths)))
+
+    def get_watch_paths(self) -> set[Path]:
+        """
+        Get the directories to watch for changes to the source's games.
+        Defaults to the locations roots and the dirs of the fingerprinted files.
+
+        :raises UnresolvableLocationError: if a required location can't be resolved
+        """
+        paths = set()
+        for location in self.locations:
+            try:
+                location.resolve()
+            except UnresolvableLocationError as error:
+                if error.optional:
+                    continue
+                raise
+            paths.add(location.root)
+        paths.update(path.parent for path in self.get_fingerprint_paths())
+        return {path for path in paths if path.is_dir()}
+
+    def begin_scan(self, fingerprint: Optional[str]) -> bool:
+        """
+        Prepare an incremental scan of the source.
+        Returns True if the source is unchanged and doesn't need to be scanned.
+        """
+        self.entries = {}
+        self.kept_game_ids = set()
+        self.previous_state = self.fingerprint_cache.get(self.source_id)
+        if self.previous_state is MetadataCache.MISSING:
+            self.previous_state = {}
+        if fingerprint is None or fingerprint != self.previous_state.get("fingerprint"):
+            return False
+        game_ids = self.previous_state.get("game_ids", ())
+        if not all(is_game_known(game_id) for game_id in game_ids):
+            return False
+        self.kept_game_ids.update(game_ids)
+        return True
+
+    def end_scan(self, fingerprint: Optional[str], game_ids: Iterable[str]) -> None:
+        """Remember the scan result, for the next scans to be incremental"""
+        if fingerprint is None:
+            return
+        state = {
+            "fingerprint": fingerprint,
+            "game_ids": sorted({*game_ids, *self.kept_game_ids}),
+            "entries": self.entries,
+        }
+        self.fingerprint_cache.set(self.source_id, state, self.fingerprint_ttl)
+
     def __iter__(self) -> Generator[SourceIterationResult, None, None]:
         """
         Get an iterator for the source
@@ -19,64 +19,85 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
-import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 from pathlib import Path
-from typing import Iterable, NamedTuple
+from typing import Iterable, NamedTuple, Optional
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.game_factory import GameFactory
 from sofl.importer.location import Location, LocationSubPath
-from sofl.importer.source import SourceIterable, URLExecutableSource
-from sofl.utils.steam import SteamFileHelper, SteamInvalidManifestError
+from sofl.importer.source import (
+    SourceIterable,
+    URLExecutableSource,
+    stat_fingerprint,
+)
+from sofl.utils.steam import (
+    SteamFileHelper,
+    SteamInvalidManifestError,
+    SteamManifestData,
+)
 
 
 class SteamSourceIterable(SourceIterable):
     source: "SteamSource"
 
-    def get_manifest_dirs(self) -> Iterable[Path]:
-        """Get dirs that contain Steam app manifests"""
-        libraryfolders_path = self.source.locations.data["libraryfolders.vdf"]
-        with open(libraryfolders_path, "r", encoding="utf-8") as file:
-            contents = file.read()
-        return [
-            Path(path) / "steamapps"
-            for path in re.findall('"path"\\s+"(.*)"\n', contents, re.IGNORECASE)
-        ]
+    max_workers: int = 4
+    steam = SteamFileHelper()
 
-    def get_manifests(self) -> Iterable[Path]:
-        """Get app manifests"""
-        manifests = set()
-        for steamapps_dir in self.get_manifest_dirs():
-            if not steamapps_dir.is_dir():
-                continue
-            manifests.update(
-                [
-                    manifest
-                    for manifest in steamapps_dir.glob("appmanifest_*.acf")
-                    if manifest.is_file()
-                ]
-            )
-        return manifests
+    def read_manifest(self, manifest: Path) -> Optional[SteamManifestData]:
+        try:
+            return self.steam.get_manifest_data(manifest)
+        except (OSError, UnicodeDecodeError, SteamInvalidManifestError) as error:
+            logging.debug("Couldn't load appmanifest %s", manifest, exc_info=error)
+            return None
+
+    def read_manifests(
+        self, manifests: list[Path]
+    ) -> list[Optional[SteamManifestData]]:
+        return [self.read_manifest(manifest) for manifest in manifests]
 
     def __iter__(self):
         """Generator method producing games"""
         appid_cache = set()
-        manifests = self.get_manifests()
-
-        for manifest in manifests:
-            # Get metadata from manifest
-            steam = SteamFileHelper()
-            try:
-                local_data = steam.get_manifest_data(manifest)
-            except (OSError, SteamInvalidManifestError) as error:
-                logging.debug("Couldn't load appmanifest %s", manifest, exc_info=error)
+
+        # Skip the manifests that didn't change since the last scan
+        changed = []
+        for manifest in sorted(self.source.get_manifests()):
+            fingerprint = stat_fingerprint(manifest)
+            if not self.is_entry_unchanged(str(manifest), fingerprint):
+                changed.append((manifest, fingerprint))
+
+        # Read the manifests of the library folders (often on different disks)
+        # in parallel, each folder sequentially
+        folders = [
+            list(entries)
+            for _parent, entries in groupby(changed, lambda entry: entry[0].parent)
+        ]
+        with ThreadPoolExecutor(max(1, min(self.max_workers, len(folders)))) as pool:
+            folders_data = pool.map(
+                self.read_manifests,
+                (
+                    [manifest for manifest, _fingerprint in entries]
+                    for entries in folders
+                ),
+            )
+            results = [
+                (*entry, local_data)
+                for entries, folder_data in zip(folders, folders_data)
+                for entry, local_data in zip(entries, folder_data)
+            ]
+
+        for manifest, fingerprint, local_data in results:
+            if local_data is None:
                 continue
 
             # Skip non installed games
             installed_mask = 4
             if not int(local_data["stateflags"]) & installed_mask:
                 logging.debug("Skipped %s: not installed", manifest)
+                self.record_entry(str(manifest), fingerprint)
                 continue
 
             # Skip duplicate appids
@@ -104,6 +125,7 @@ class SteamSourceIterable(SourceIterable):
             )
             additional_data = {"local_image_path": image_path, "steam_appid": appid}
 
+            self.record_entry(str(manifest), fingerprint, game.game_id)
             yield (game, additional_data)
 
 
@@ -120,6 +142,34 @@ class SteamSource(URLExecutableSource):
 
     locations: SteamLocations
 
+    def get_manifest_dirs(self) -> Iterable[Path]:
+        """Get dirs that contain Steam app manifests"""
+        libraryfolders_path = self.locations.data["libraryfolders.vdf"]
+        with open(libraryfolders_path, "r", encoding="utf-8") as file:
+            folders = SteamFileHelper().get_library_folders(file)
+        return [Path(folder["path"]) / "steamapps" for folder in folders]
+
+    def get_manifests(self) -> Iterable[Path]:
+        """Get app manifests"""
+        manifests = set()
+        for steamapps_dir in self.get_manifest_dirs():
+            if not steamapps_dir.is_dir():
+                continue
+            manifests.update(
+                [
+                    manifest
+                    for manifest in steamapps_dir.glob("appmanifest_*.acf")
+                    if manifest.is_file()
+                ]
+            )
+        return manifests
+
+    def get_fingerprint_paths(self) -> Iterable[Path]:
+        return (
+            self.locations.data["libraryfolders.vdf"],
+            *sorted(self.get_manifests()),
+        )
+
     def __init__(self) -> None:
         super().__init__()
         self.locations = SteamLocations(
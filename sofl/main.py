@@ -17,12 +17,13 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import json
+import logging
 import lzma
 import os
 import shlex
+import sqlite3
 import sys
-from time import time
+from time import perf_counter, time
 from typing import Any, Optional
 from urllib.parse import quote
 
@@ -36,12 +37,12 @@ from gi.repository import Adw, Gio, GLib, Gtk
 
 from sofl import shared
 from sofl.details_dialog import DetailsDialog
-from sofl.game import Game
-from sofl.game_factory import GameFactory
+from sofl.game_data import GameData
 from sofl.importer.bottles_source import BottlesSource
 from sofl.importer.desktop_source import DesktopSource
 from sofl.importer.flatpak_source import FlatpakSource
 from sofl.importer.heroic_source import HeroicSource
+from sofl.importer.import_watcher import ImportWatcher
 from sofl.importer.importer import Importer  # yo dawg
 from sofl.importer.itch_source import ItchSource
 from sofl.importer.legendary_source import LegendarySource
@@ -53,12 +54,14 @@ from sofl.importer.steam_source import SteamSource
 from sofl.importer.onlinefix_source import OnlineFixSource
 from sofl.logging.setup import log_system_info, setup_logging
 from sofl.preferences import SOFLPreferences
+from sofl.store.game_loader import GameLoader
 from sofl.store.managers.cover_manager import CoverManager
 from sofl.store.managers.display_manager import DisplayManager
 from sofl.store.managers.file_manager import FileManager
 from sofl.store.managers.sgdb_manager import SgdbManager
 from sofl.store.managers.steam_api_manager import SteamAPIManager
 from sofl.store.store import Store
+from sofl.utils.http import HTTPClient
 from sofl.utils.run_executable import run_executable
 from sofl.window import SOFLWindow
 from sofl.dialogs.install_dialog import InstallDialog
@@ -72,10 +75,13 @@ if sys.platform.startswith("darwin"):
 
 class SOFLApplication(Adw.Application):
     state = shared.AppState.DEFAULT
+    activate_time: float = 0
     win: SOFLWindow
     init_search_term: Optional[str] = None
+    import_watcher: Optional[ImportWatcher] = None
 
     def __init__(self) -> None:
+        shared.http_client = HTTPClient()
         shared.store = Store()
         super().__init__(application_id=shared.APP_ID)
 
@@ -112,6 +118,8 @@ class SOFLApplication(Adw.Application):
     def do_activate(self) -> None:  # pylint: disable=arguments-differ
         """Called on app creation"""
 
+        self.activate_time = perf_counter()
+
         if os.getenv("XDG_CURRENT_DESKOP") == "COSMIC":
             Gio.AppInfo.launch_default_for_uri("https://stopthemingmy.app")
             self.quit()
@@ -139,19 +147,12 @@ class SOFLApplication(Adw.Application):
             "is-maximized", shared.win, "maximized", Gio.SettingsBindFlags.DEFAULT
         )
 
-        # Load games from disk
-        shared.store.add_manager(FileManager(), False)
+        # Add the managers, games loaded from disk skip the pipelines
+        shared.store.add_manager(FileManager())
         shared.store.add_manager(DisplayManager())
-        self.state = shared.AppState.LOAD_FROM_DISK
-        self.load_games_from_disk()
-        self.state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
-
-        # Add rest of the managers for game imports
         shared.store.add_manager(CoverManager())
         shared.store.add_manager(SteamAPIManager())
         shared.store.add_manager(SgdbManager())
-        shared.store.toggle_manager_in_pipelines(FileManager, True)
 
         # Create actions
         self.create_actions(
@@ -198,21 +199,34 @@ class SOFLApplication(Adw.Application):
             shared.win.search_entry.set_text(self.init_search_term)
             shared.win.search_entry.set_position(-1)
 
+        # Load games from disk in the background, the window fills in progressively
+        self.load_games_from_disk()
+
         shared.win.present()
+        shared.win.add_tick_callback(self.on_first_frame)
 
-        if shared.schema.get_boolean("auto-import"):
-            self.on_import_action()
+    def do_shutdown(self) -> None:  # pylint: disable=arguments-differ
+        """Called on app exit"""
+
+        # Write the games still waiting in the save queue
+        if file_manager := shared.store.managers.get(FileManager):
+            file_manager.save_queue.stop()
+            logging.debug("Save queue stats: %s", file_manager.save_queue.stats)
+
+        if self.import_watcher:
+            self.import_watcher.stop()
+
+        shared.http_client.close()
+
+        Adw.Application.do_shutdown(self)
 
     def do_handle_local_options(self, options: GLib.VariantDict) -> int:
         if search := options.lookup_value("search"):
             self.init_search_term = search.get_string()
         elif game_id := options.lookup_value("launch"):
             try:
-                data = json.load(
-                    (path := shared.games_dir / (game_id.get_string() + ".json")).open(
-                        "r", encoding="utf-8"
-                    )
-                )
+                if not (data := shared.store.storage.get(game_id.get_string())):
+                    return 1
                 executable = (
                     shlex.join(data["executable"])
                     if isinstance(data["executable"], list)
@@ -223,9 +237,9 @@ class SOFLApplication(Adw.Application):
                 run_executable(executable)
 
                 data["last_played"] = int(time())
-                json.dump(data, path.open("w", encoding="utf-8"))
+                shared.store.storage.save(data)
 
-            except (IndexError, KeyError, OSError, json.decoder.JSONDecodeError):
+            except (IndexError, KeyError, OSError, sqlite3.Error):
                 return 1
 
             self.register()
@@ -242,14 +256,59 @@ class SOFLApplication(Adw.Application):
         return -1
 
     def load_games_from_disk(self) -> None:
-        if shared.games_dir.is_dir():
-            for game_file in shared.games_dir.iterdir():
-                try:
-                    data = json.load(game_file.open())
-                except (OSError, json.decoder.JSONDecodeError):
-                    continue
-                game = GameFactory.create_game(data)
-                shared.store.add_game(game, {"skip_save": True})
+        self.state = shared.AppState.LOAD_FROM_DISK
+        shared.win.set_library_loading(True)
+
+        # Importing before every stored game is known would overwrite them
+        self.lookup_action("import").set_enabled(False)
+
+        GameLoader(
+            shared.store.storage, self.on_games_loaded, self.on_loading_done
+        ).start()
+
+    def on_games_loaded(self, games: list[GameData]) -> None:
+        displayed = []
+        for game in games:
+            shared.store.add_game(game, {"skip_save": True}, run_pipeline=False)
+            if shared.store.get(game.game_id) is game and not game.blacklisted:
+                displayed.append(game)
+        shared.win.add_library_games(displayed)
+
+    def on_loading_done(self) -> None:
+        self.state = shared.AppState.DEFAULT
+        shared.win.set_library_loading(False)
+        shared.win.update_source_rows()
+        self.lookup_action("import").set_enabled(True)
+
+        logging.info(
+            "Startup complete after %.0f ms",
+            (perf_counter() - self.activate_time) * 1000,
+        )
+
+        if shared.schema.get_boolean("auto-import"):
+            self.on_import_action()
+
+        self.import_watcher = ImportWatcher(
+            (
+                LutrisSource,
+                SteamSource,
+                HeroicSource,
+                BottlesSource,
+                FlatpakSource,
+                DesktopSource,
+                ItchSource,
+                LegendarySource,
+                RetroarchSource,
+            )
+        )
+        if shared.schema.get_boolean("watch-sources"):
+            self.import_watcher.start()
+
+    def on_first_frame(self, *_args: Any) -> bool:
+        logging.info(
+            "First frame after %.0f ms", (perf_counter() - self.activate_time) * 1000
+        )
+        return GLib.SOURCE_REMOVE
 
     def get_source_name(self, source_id: str) -> Any:
         if source_id == "all":
@@ -32,7 +32,7 @@ from gi.repository import Adw, Gio, GLib, Gtk
 
 from sofl import shared
 from sofl.errors.friendly_error import FriendlyError
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.importer.bottles_source import BottlesSource
 from sofl.importer.desktop_source import DesktopSource
 from sofl.importer.flatpak_source import FlatpakSource
@@ -46,6 +46,8 @@ from sofl.importer.source import Source
 from sofl.importer.steam_source import SteamSource
 from sofl.proton.proton_manager import ProtonManager
 from sofl.store.managers.sgdb_manager import SgdbManager
+from sofl.store.managers.steam_api_manager import SteamAPIManager
+from sofl.store.pipeline import Pipeline
 from sofl.utils.create_dialog import create_dialog
 
 
@@ -66,11 +68,15 @@ class SOFLPreferences(Adw.PreferencesDialog):
     force_theme_switch: Adw.SwitchRow = Gtk.Template.Child()
 
     auto_import_switch: Adw.SwitchRow = Gtk.Template.Child()
+    watch_sources_switch: Adw.SwitchRow = Gtk.Template.Child()
     remove_missing_switch: Adw.SwitchRow = Gtk.Template.Child()
 
     steam_expander_row: Adw.ExpanderRow = Gtk.Template.Child()
     steam_data_action_row: Adw.ActionRow = Gtk.Template.Child()
     steam_data_file_chooser_button: Gtk.Button = Gtk.Template.Child()
+    steam_refresh_button: Gtk.Button = Gtk.Template.Child()
+    steam_refresh_stack: Gtk.Stack = Gtk.Template.Child()
+    steam_refresh_spinner: Gtk.Spinner = Gtk.Template.Child()
 
     lutris_expander_row: Adw.ExpanderRow = Gtk.Template.Child()
     lutris_data_action_row: Adw.ActionRow = Gtk.Template.Child()
@@ -139,7 +145,7 @@ class SOFLPreferences(Adw.PreferencesDialog):
     # Proton Manager
     proton_manager_group: Adw.PreferencesGroup = Gtk.Template.Child()
 
-    removed_games: set[Game] = set()
+    removed_games: set[GameData] = set()
     warning_menu_buttons: dict = {}
     
     # Download progress tracking
@@ -261,6 +267,57 @@ class SOFLPreferences(Adw.PreferencesDialog):
 
         self.sgdb_fetch_button.connect("clicked", update_sgdb)
 
+        def refresh_steam_data(*_args: Any) -> None:
+            games = [
+                game
+                for game in shared.store
+                if game.base_source == "steam" and not game.removed
+            ]
+            if not games:
+                return
+            counter = 0
+            steam_api_manager = shared.store.managers[SteamAPIManager]
+            steam_api_manager.reset_cancellable()
+
+            self.steam_refresh_spinner.set_visible(True)
+            self.steam_refresh_stack.set_visible_child(self.steam_refresh_spinner)
+
+            def on_advanced(pipeline: Pipeline) -> None:
+                nonlocal counter
+
+                pipeline.game.save()
+                pipeline.game.update()
+
+                counter += 1
+                if counter != len(games):
+                    return
+
+                for error in steam_api_manager.collect_errors():
+                    if isinstance(error, FriendlyError):
+                        create_dialog(self, error.title, error.subtitle)
+                        break
+
+                self.add_toast(Adw.Toast.new(_("Steam data refreshed")))
+
+                self.steam_refresh_spinner.set_visible(False)
+                self.steam_refresh_stack.set_visible_child(self.steam_refresh_button)
+
+            # Go through the scheduler, which respects the API rate limit
+            for game in games:
+                pipeline = Pipeline(
+                    game,
+                    {
+                        "steam_appid": game.game_id.removeprefix("steam_"),
+                        "refresh": True,
+                    },
+                    (steam_api_manager,),
+                    shared.store.scheduler,
+                )
+                pipeline.connect("advanced", on_advanced)
+                pipeline.advance()
+
+        self.steam_refresh_button.connect("clicked", refresh_steam_data)
+
         # Switches
         self.bind_switches(
             {
@@ -268,6 +325,7 @@ class SOFLPreferences(Adw.PreferencesDialog):
                 "cover-launches-game",
                 "high-quality-images",
                 "auto-import",
+                "watch-sources",
                 "remove-missing",
                 "lutris-import-steam",
                 "lutris-import-flatpak",
@@ -342,7 +400,7 @@ class SOFLPreferences(Adw.PreferencesDialog):
         self.removed_games = set()
         self.toast.dismiss()
         shared.win.get_application().state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
+        shared.win.update_source_rows()
 
         return True
 
@@ -361,7 +419,7 @@ class SOFLPreferences(Adw.PreferencesDialog):
 
         self.add_toast(self.toast)
         shared.win.get_application().state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
+        shared.win.update_source_rows()
 
     def reset_app(self, *_args: Any) -> None:
         rmtree(shared.data_dir / "sofl", True)
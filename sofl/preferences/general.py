@@ -7,7 +7,7 @@ from typing import Any
 from gi.repository import Adw, Gio
 
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
 
 
 class GeneralSection:
@@ -68,7 +68,7 @@ class GeneralSection:
         dialog.removed_games = set()
         dialog.toast.dismiss()
         shared.win.get_application().state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
+        shared.win.update_source_rows()
 
         return True
 
@@ -89,7 +89,7 @@ class GeneralSection:
 
         dialog.add_toast(dialog.toast)
         shared.win.get_application().state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
+        shared.win.update_source_rows()
 
     def reset_app(self, *_args: Any) -> None:
         dialog = self.dialog
@@ -55,6 +55,7 @@ class ImportSourcesSection:
         dialog.bind_switches(
             {
                 "auto-import",
+                "watch-sources",
                 "remove-missing",
                 "lutris-import-steam",
                 "lutris-import-flatpak",
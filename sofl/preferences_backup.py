@@ -338,7 +338,7 @@ class SOFLPreferences(Adw.PreferencesDialog):
         self.removed_games = set()
         self.toast.dismiss()
         shared.win.get_application().state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
+        shared.win.update_source_rows()
 
         return True
 
@@ -357,7 +357,7 @@ class SOFLPreferences(Adw.PreferencesDialog):
 
         self.add_toast(self.toast)
         shared.win.get_application().state = shared.AppState.DEFAULT
-        shared.win.create_source_rows()
+        shared.win.update_source_rows()
 
     def reset_app(self, *_args: Any) -> None:
         rmtree(shared.data_dir / "sofl", True)
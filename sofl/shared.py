@@ -44,7 +44,11 @@ config_dir = Path.home() / ".config"
 cache_dir = Path.home() / ".cache"
 
 games_dir = data_dir / "sofl" / "games"
+games_db = data_dir / "sofl" / "games.db"
 covers_dir = data_dir / "sofl" / "covers"
+cover_cache_dir = cache_dir / "sofl" / "covers"
+metadata_cache_db = cache_dir / "sofl" / "metadata.db"
 
 # Mock window for testing
 win = None
+http_client = None
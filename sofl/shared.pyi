@@ -24,6 +24,7 @@ from gi.repository import Gio
 
 from sofl.importer.importer import Importer
 from sofl.store.store import Store
+from sofl.utils.http import HTTPClient
 from sofl.window import SOFLWindow
 
 
@@ -59,7 +60,10 @@ host_cache_dir: Path
 flatpak_dir: Path
 
 games_dir: Path
+games_db: Path
 covers_dir: Path
+cover_cache_dir: Path
+metadata_cache_db: Path
 
 appdata_dir: Path
 local_appdata_dir: Path
@@ -75,4 +79,5 @@ win: Optional[SOFLWindow]
 importer: Optional[Importer]
 import_time: Optional[int]
 store: Optional[Store]
+http_client: Optional[HTTPClient]
 log_files: list[Path]
@@ -0,0 +1,113 @@
+# game_loader.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+from time import perf_counter
+from typing import Callable
+
+from gi.repository import GLib
+
+from sofl.game_data import GameData
+from sofl.game_factory import GameFactory
+from sofl.store.game_storage import GameStorage
+
+
+class GameLoader:
+    """
+    Loads the stored games in the background.
+
+    * Records are read in batches and parsed on a worker pool
+    * Every parsed batch is handed to the main loop with `GLib.idle_add`,
+    in storage order
+    * `on_done` is called on the main loop once every batch was delivered
+    """
+
+    batch_size: int = 250
+    max_workers: int = min(4, os.cpu_count() or 1)
+
+    storage: GameStorage
+    on_batch: Callable[[list[GameData]], None]
+    on_done: Callable[[], None]
+
+    start_time: float = 0
+    first_batch_time: float = 0
+    n_loaded: int = 0
+
+    def __init__(
+        self,
+        storage: GameStorage,
+        on_batch: Callable[[list[GameData]], None],
+        on_done: Callable[[], None],
+    ) -> None:
+        self.storage = storage
+        self.on_batch = on_batch
+        self.on_done = on_done
+
+    def start(self) -> None:
+        """Start loading the games"""
+        self.start_time = perf_counter()
+        Thread(target=self.loader_thread_func, daemon=True).start()
+
+    @staticmethod
+    def create_games(batch: list[str]) -> list[GameData]:
+        """Parse a batch of serialized records into games"""
+        games = []
+        for serialized in batch:
+            try:
+                data = json.loads(serialized)
+            except json.decoder.JSONDecodeError:
+                continue
+            games.append(GameFactory.create_game(data))
+        return games
+
+    def loader_thread_func(self) -> None:
+        """Entry point for the thread feeding the worker pool"""
+        try:
+            with ThreadPoolExecutor(self.max_workers) as pool:
+                for games in pool.map(
+                    self.create_games, self.storage.iter_serialized(self.batch_size)
+                ):
+                    GLib.idle_add(self.deliver_batch, games)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logging.error("Couldn't load the games from disk", exc_info=error)
+        GLib.idle_add(self.deliver_done)
+
+    def deliver_batch(self, games: list[GameData]) -> bool:
+        if not self.first_batch_time:
+            self.first_batch_time = perf_counter()
+            logging.debug(
+                "First batch of games loaded in %.0f ms",
+                (self.first_batch_time - self.start_time) * 1000,
+            )
+        self.n_loaded += len(games)
+        self.on_batch(games)
+        return GLib.SOURCE_REMOVE
+
+    def deliver_done(self) -> bool:
+        logging.info(
+            "Loaded %d games from disk in %.0f ms",
+            self.n_loaded,
+            (perf_counter() - self.start_time) * 1000,
+        )
+        self.on_done()
+        return GLib.SOURCE_REMOVE
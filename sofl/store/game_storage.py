@@ -0,0 +1,283 @@
+# game_storage.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+import sqlite3
+from abc import abstractmethod
+from pathlib import Path
+from threading import Lock
+from typing import Any, Generator, Iterable, Optional
+
+
+class GameStorage:
+    """Backend in charge of persisting game records, keyed by game_id"""
+
+    @abstractmethod
+    def __iter__(self) -> Generator[dict[str, Any], None, None]:
+        """Iterate through every stored game record"""
+
+    @abstractmethod
+    def get(self, game_id: str) -> Optional[dict[str, Any]]:
+        """Get a game record by its ID, None if not found"""
+
+    @abstractmethod
+    def save_many(self, records: Iterable[dict[str, Any]]) -> None:
+        """Insert or replace several game records at once"""
+
+    @abstractmethod
+    def delete(self, game_id: str) -> None:
+        """Delete a game record, if present"""
+
+    def delete_many(self, game_ids: Iterable[str]) -> None:
+        """Delete several game records at once"""
+        for game_id in game_ids:
+            self.delete(game_id)
+
+    def save(self, record: dict[str, Any]) -> None:
+        """Insert or replace a game record"""
+        self.save_many((record,))
+
+    def iter_serialized(self, batch_size: int) -> Generator[list[str], None, None]:
+        """Iterate through the stored records as batches of unparsed JSON"""
+        batch = []
+        for record in self:
+            batch.append(json.dumps(record))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def iter_visible(self) -> Generator[dict[str, Any], None, None]:
+        """Iterate through the records that are not hidden, removed or blacklisted"""
+        for record in self:
+            if not any(
+                (record.get("hidden"), record.get("removed"), record.get("blacklisted"))
+            ):
+                yield record
+
+
+class JsonGameStorage(GameStorage):
+    """Legacy storage, one `<game_id>.json` file per game in a directory"""
+
+    directory: Path
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def path(self, game_id: str) -> Path:
+        return self.directory / f"{game_id}.json"
+
+    def __iter__(self) -> Generator[dict[str, Any], None, None]:
+        if not self.directory.is_dir():
+            return
+        for game_file in self.directory.iterdir():
+            try:
+                with game_file.open("r", encoding="utf-8") as file:
+                    yield json.load(file)
+            except (OSError, json.decoder.JSONDecodeError):
+                continue
+
+    def iter_serialized(self, batch_size: int) -> Generator[list[str], None, None]:
+        if not self.directory.is_dir():
+            return
+        batch = []
+        for game_file in self.directory.iterdir():
+            try:
+                batch.append(game_file.read_text("utf-8"))
+            except OSError:
+                continue
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def get(self, game_id: str) -> Optional[dict[str, Any]]:
+        try:
+            with self.path(game_id).open("r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            return None
+
+    def save_many(self, records: Iterable[dict[str, Any]]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for record in records:
+            # Write to a temporary file first so that a crash never truncates a game
+            path = self.path(record["game_id"])
+            tmp_path = path.with_suffix(".json.tmp")
+            with tmp_path.open("w", encoding="utf-8") as file:
+                json.dump(record, file, indent=4, sort_keys=True)
+            tmp_path.replace(path)
+
+    def delete(self, game_id: str) -> None:
+        self.path(game_id).unlink(missing_ok=True)
+
+
+class SqliteGameStorage(GameStorage):
+    """
+    Single file storage backed by a SQLite database in WAL mode.
+
+    Records are stored as JSON, the columns used for filtering
+    are duplicated and indexed.
+    On first open, the legacy JSON directory (if any) is imported once.
+    """
+
+    path: Path
+    connection: sqlite3.Connection
+    lock: Lock
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS games (
+            game_id TEXT PRIMARY KEY NOT NULL,
+            base_source TEXT NOT NULL,
+            hidden INTEGER NOT NULL DEFAULT 0,
+            removed INTEGER NOT NULL DEFAULT 0,
+            blacklisted INTEGER NOT NULL DEFAULT 0,
+            last_played INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS games_base_source ON games (base_source)",
+        "CREATE INDEX IF NOT EXISTS games_state ON games (hidden, removed, blacklisted)",
+        "CREATE INDEX IF NOT EXISTS games_last_played ON games (last_played)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    )
+
+    def __init__(self, path: Path, legacy_dir: Optional[Path] = None) -> None:
+        self.path = path
+        self.lock = Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Connection is shared between threads, access is serialized by the lock
+        self.connection = sqlite3.connect(
+            path, timeout=10, check_same_thread=False, isolation_level=None
+        )
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.schema:
+                self.connection.execute(statement)
+
+        if legacy_dir is not None:
+            self.import_json_dir(legacy_dir)
+
+    @staticmethod
+    def to_row(record: dict[str, Any]) -> tuple:
+        return (
+            record["game_id"],
+            record.get("source", "").split("_")[0],
+            int(bool(record.get("hidden"))),
+            int(bool(record.get("removed"))),
+            int(bool(record.get("blacklisted"))),
+            int(record.get("last_played") or 0),
+            json.dumps(record, separators=(",", ":")),
+        )
+
+    def import_json_dir(self, directory: Path) -> None:
+        """Import the legacy one-JSON-per-game directory, only once"""
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                if self.connection.execute(
+                    "SELECT 1 FROM meta WHERE key = 'json_imported'"
+                ).fetchone():
+                    self.connection.execute("COMMIT")
+                    return
+                n_imported = 0
+                for record in JsonGameStorage(directory):
+                    if "game_id" not in record:
+                        continue
+                    self.connection.execute(
+                        "INSERT OR IGNORE INTO games VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        self.to_row(record),
+                    )
+                    n_imported += 1
+                self.connection.execute(
+                    "INSERT INTO meta VALUES ('json_imported', ?)", (str(directory),)
+                )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        logging.info(
+            "Imported %d games from %s into %s", n_imported, directory, self.path
+        )
+
+    def __iter__(self) -> Generator[dict[str, Any], None, None]:
+        with self.lock:
+            rows = self.connection.execute("SELECT data FROM games").fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def iter_visible(self) -> Generator[dict[str, Any], None, None]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT data FROM games "
+                "WHERE hidden = 0 AND removed = 0 AND blacklisted = 0"
+            ).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def iter_serialized(self, batch_size: int) -> Generator[list[str], None, None]:
+        # Only hold the lock while fetching, saves can happen between batches
+        with self.lock:
+            cursor = self.connection.execute("SELECT data FROM games")
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [data for (data,) in rows]
+
+    def get(self, game_id: str) -> Optional[dict[str, Any]]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT data FROM games WHERE game_id = ?", (game_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_many(self, records: Iterable[dict[str, Any]]) -> None:
+        rows = tuple(self.to_row(record) for record in records)
+        if not rows:
+            return
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def delete(self, game_id: str) -> None:
+        self.delete_many((game_id,))
+
+    def delete_many(self, game_ids: Iterable[str]) -> None:
+        rows = tuple((game_id,) for game_id in game_ids)
+        with self.lock:
+            self.connection.executemany("DELETE FROM games WHERE game_id = ?", rows)
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
@@ -17,18 +17,19 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 from gi.repository import Gio
 
-from sofl.game import Game
-from sofl.store.managers.manager import Manager
+from sofl.game_data import GameData
+from sofl.store.managers.manager import BackoffCallback, Manager
 
 
 class AsyncManager(Manager):
     """Manager that can run asynchronously"""
 
     blocking = False
+    max_concurrent = 4
     cancellable: Gio.Cancellable = None
 
     def __init__(self) -> None:
@@ -44,19 +45,38 @@ class AsyncManager(Manager):
         Already scheduled Tasks will no longer be cancellable."""
         self.cancellable = Gio.Cancellable()
 
-    def process_game(
-        self, game: Game, additional_data: dict, callback: Callable[["Manager"], Any]
+    def run_try(
+        self,
+        game: GameData,
+        additional_data: dict,
+        callback: Callable[["Manager"], Any],
+        tries: int,
+        on_backoff: Optional[BackoffCallback] = None,
     ) -> None:
-        """Create a task to process the game in a separate thread"""
-        task = Gio.Task.new(None, self.cancellable, self._task_callback, (callback,))
-        task.run_in_thread(lambda *_: self._task_thread_func((game, additional_data)))
-
-    def _task_thread_func(self, data):
-        """Task thread entry point"""
-        game, additional_data, *_rest = data
-        self.run(game, additional_data)
+        """Create a task to try the manager logic in a separate thread"""
+        if tries > 1 and self.cancellable.is_cancelled():
+            callback(self)
+            return
+        # Filled by the task thread with the delay before retrying, if any
+        retry_delay = []
+        task = Gio.Task.new(
+            None,
+            self.cancellable,
+            self._task_callback,
+            (game, additional_data, callback, tries, retry_delay, on_backoff),
+        )
+        task.run_in_thread(
+            lambda *_: retry_delay.append(self.try_main(game, additional_data, tries))
+        )
 
     def _task_callback(self, _source_object, _result, data):
         """Method run after the task is done"""
-        callback, *_rest = data
-        callback(self)
+        game, additional_data, callback, tries, retry_delay, on_backoff = data
+        self.after_try(
+            game,
+            additional_data,
+            callback,
+            tries,
+            retry_delay[0] if retry_delay else None,
+            on_backoff,
+        )
@@ -18,18 +18,24 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import os
 from pathlib import Path
 from typing import NamedTuple
 
-import requests
 from gi.repository import GdkPixbuf, Gio
 from requests.exceptions import HTTPError, SSLError
 
 from sofl import shared
-from sofl.game import Game
-from sofl.store.managers.manager import Manager
+from sofl.game_data import GameData
+from sofl.store.managers.async_manager import AsyncManager
 from sofl.store.managers.steam_api_manager import SteamAPIManager
-from sofl.utils.save_cover import convert_cover, save_cover
+from sofl.utils.save_cover import (
+    cache_cover,
+    convert_cover,
+    cover_cache_key,
+    get_cached_cover,
+    save_cover,
+)
 
 
 class ImageSize(NamedTuple):
@@ -80,7 +86,7 @@ class ImageSize(NamedTuple):
         return ImageSize(1, 1).element_wise_div(self)
 
 
-class CoverManager(Manager):
+class CoverManager(AsyncManager):
     """
     Manager in charge of adding the cover image of the game
 
@@ -92,11 +98,13 @@ class CoverManager(Manager):
 
     run_after = (SteamAPIManager,)
     retryable_on = (HTTPError, SSLError, ConnectionError)
+    # Decoding, compositing and encoding images is CPU bound
+    max_concurrent = os.cpu_count() or 1
 
     def download_image(self, url: str) -> Path:
         image_file = Gio.File.new_tmp()[0]
         path = Path(image_file.get_path())
-        with requests.get(url, timeout=5) as cover:
+        with shared.http_client.get(url) as cover:
             cover.raise_for_status()
             path.write_bytes(cover.content)
         return path
@@ -165,7 +173,7 @@ class CoverManager(Manager):
         )
         return cover
 
-    def main(self, game: Game, additional_data: dict) -> None:
+    def main(self, game: GameData, additional_data: dict) -> None:
         if game.blacklisted:
             return
         for key in (
@@ -190,9 +198,15 @@ class CoverManager(Manager):
                 composite_kwargs["scale"] = 0.7
                 composite_kwargs["blur_size"] = ImageSize(1, 2)
 
-            save_cover(
-                game.game_id,
-                convert_cover(
-                    pixbuf=self.composite_cover(image_path, **composite_kwargs)
-                ),
+            # An unchanged source skips the compositing and conversion entirely
+            cache_key = cover_cache_key(
+                "composite", sorted(composite_kwargs.items()), path=image_path
             )
+            if not (cover_path := get_cached_cover(cache_key)):
+                cover_path = convert_cover(
+                    pixbuf=self.composite_cover(image_path, **composite_kwargs)
+                )
+                if cover_path:
+                    cover_path = cache_cover(cache_key, cover_path)
+
+            save_cover(game.game_id, cover_path)
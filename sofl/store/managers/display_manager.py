@@ -18,8 +18,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from sofl import shared
-from sofl.game import Game
-from sofl.game_cover import GameCover
+from sofl.game_data import GameData
 from sofl.store.managers.manager import Manager
 from sofl.store.managers.sgdb_manager import SgdbManager
 from sofl.store.managers.steam_api_manager import SteamAPIManager
@@ -31,36 +30,14 @@ class DisplayManager(Manager):
     run_after = (SteamAPIManager, SgdbManager)
     signals = {"update-ready"}
 
-    def main(self, game: Game, _additional_data: dict) -> None:
-        if game.get_parent():
-            game.get_parent().get_parent().remove(game)
-            if game.get_parent():
-                game.get_parent().set_child()
+    def main(self, game: GameData, _additional_data: dict) -> None:
+        shared.store.count_game(game)
 
-        if game.source == "online-fix":
-            game.menu_button.set_menu_model(
-                game.hidden_game_options if game.hidden else game.online_fix_options
-            )
-        else:
-            game.menu_button.set_menu_model(
-                game.hidden_game_options if game.hidden else game.game_options
-            )
-
-        game.title.set_label(game.name)
-
-        game.menu_button.get_popover().connect(
-            "notify::visible", game.toggle_play, None
-        )
-        game.menu_button.get_popover().connect(
-            "notify::visible", shared.win.set_active_game, game
-        )
-
-        if game.game_id in shared.win.game_covers:
-            game.game_cover = shared.win.game_covers[game.game_id]
-            game.game_cover.add_picture(game.cover)
+        # Widgets are created by the library views for the visible games only
+        if not game.removed and not game.blacklisted:
+            shared.win.add_library_game(game)
         else:
-            game.game_cover = GameCover({game.cover}, game.get_cover_path())
-            shared.win.game_covers[game.game_id] = game.game_cover
+            shared.win.remove_library_game(game)
 
         if (
             shared.win.navigation_view.get_visible_page() == shared.win.details_page
@@ -68,14 +45,5 @@ class DisplayManager(Manager):
         ):
             shared.win.show_details_page(game)
 
-        if not game.removed and not game.blacklisted:
-            if game.hidden:
-                shared.win.hidden_library.append(game)
-            else:
-                shared.win.library.append(game)
-            game.get_parent().set_focusable(False)
-
-        shared.win.set_library_child()
-
         if shared.win.get_application().state == shared.AppState.DEFAULT:
-            shared.win.create_source_rows()
+            shared.win.update_source_rows()
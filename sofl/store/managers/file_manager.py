@@ -17,43 +17,65 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import json
+from typing import Any, Iterable
 
 from sofl import shared
-from sofl.game import Game
-from sofl.store.managers.async_manager import AsyncManager
+from sofl.game_data import GameData
+from sofl.store.game_storage import JsonGameStorage
+from sofl.store.managers.manager import Manager
 from sofl.store.managers.steam_api_manager import SteamAPIManager
+from sofl.store.save_queue import SaveQueue
 
 
-class FileManager(AsyncManager):
-    """Manager in charge of saving a game to a file"""
+class FileManager(Manager):
+    """
+    Manager in charge of saving a game to the game storage
+
+    Saves are queued and written behind in batches, repeated saves of a game
+    are merged into one write. Deletions go through the same queue.
+    """
 
     run_after = (SteamAPIManager,)
     signals = {"save-ready"}
 
-    def main(self, game: Game, additional_data: dict) -> None:
+    attrs = (
+        "added",
+        "executable",
+        "game_id",
+        "source",
+        "hidden",
+        "last_played",
+        "name",
+        "developer",
+        "removed",
+        "blacklisted",
+        "version",
+    )
+
+    save_queue: SaveQueue
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.save_queue = SaveQueue(self.write_records, self.delete_records)
+
+    def write_records(self, records: Iterable[dict[str, Any]]) -> None:
+        """Write a batch of records, called from the save queue worker"""
+        records = tuple(records)
+        shared.store.storage.save_many(records)
+
+        # Optionally keep the legacy one-JSON-per-game layout up to date
+        if shared.schema.get_boolean("json-export"):
+            JsonGameStorage(shared.games_dir).save_many(records)
+
+    def delete_records(self, game_ids: Iterable[str]) -> None:
+        """Delete a batch of records, called from the save queue worker"""
+        game_ids = tuple(game_ids)
+        shared.store.storage.delete_many(game_ids)
+        JsonGameStorage(shared.games_dir).delete_many(game_ids)
+
+    def main(self, game: GameData, additional_data: dict) -> None:
         if additional_data.get("skip_save"):  # Skip saving when loading games from disk
             return
 
-        shared.games_dir.mkdir(parents=True, exist_ok=True)
-
-        attrs = (
-            "added",
-            "executable",
-            "game_id",
-            "source",
-            "hidden",
-            "last_played",
-            "name",
-            "developer",
-            "removed",
-            "blacklisted",
-            "version",
-        )
-
-        json.dump(
-            {attr: getattr(game, attr) for attr in attrs if attr},
-            (shared.games_dir / f"{game.game_id}.json").open("w", encoding="utf-8"),
-            indent=4,
-            sort_keys=True,
-        )
+        # Snapshot the values now, the write happens later on the worker
+        self.save_queue.enqueue({attr: getattr(game, attr) for attr in self.attrs})
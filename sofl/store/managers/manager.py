@@ -19,12 +19,37 @@
 
 import logging
 from abc import abstractmethod
-from time import sleep
-from typing import Any, Callable, Container
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from random import uniform
+from typing import Any, Callable, Container, Optional
+
+from gi.repository import GLib
 
 from sofl.errors.error_producer import ErrorProducer
 from sofl.errors.friendly_error import FriendlyError
-from sofl.game import Game
+from sofl.game_data import GameData
+
+# Called with the retry delay and the function retrying, instead of a timer
+BackoffCallback = Callable[[float, Callable[[], None]], Any]
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Get the delay in seconds asked by the Retry-After header of an HTTP error"""
+    response = getattr(error, "response", None)
+    if response is None or not (value := response.headers.get("Retry-After")):
+        return None
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0, (date - datetime.now(timezone.utc)).total_seconds())
 
 
 class Manager(ErrorProducer):
@@ -33,24 +58,34 @@ class Manager(ErrorProducer):
     * May connect to signals on the game to handle them.
     * May cancel its running tasks on critical error,
     in that case a new cancellable must be generated for new tasks to run.
-    * May be retried on some specific error types
+    * May be retried on some specific error types,
+    retries are scheduled on the main loop with an exponential backoff.
+    The scheduler frees the manager for other games during the backoff.
     """
 
     run_after: Container[type["Manager"]] = tuple()
     blocking: bool = True
+    # Maximum number of games processed at once, for non blocking managers
+    max_concurrent: int = 1
 
     retryable_on: Container[type[Exception]] = tuple()
     continue_on: Container[type[Exception]] = tuple()
     signals: Container[type[str]] = set()
-    retry_delay: int = 3
+    retry_delay: float = 3
+    max_retry_delay: float = 60
+    max_retry_after: float = 300
     max_tries: int = 3
 
+    # Measurements
+    n_retries: int = 0
+    total_backoff: float = 0
+
     @property
     def name(self) -> str:
         return type(self).__name__
 
     @abstractmethod
-    def main(self, game: Game, additional_data: dict) -> None:
+    def main(self, game: GameData, additional_data: dict) -> None:
         """
         Manager specific logic triggered by the run method
         * Implemented by final child classes
@@ -59,15 +94,25 @@ class Manager(ErrorProducer):
         * May raise other exceptions that will be reported
         """
 
-    def run(self, game: Game, additional_data: dict) -> None:
-        """Handle errors (retry, ignore or raise) that occur in the manager logic"""
-
-        # Keep track of the number of tries
-        tries = 1
-
-        def handle_error(error: Exception) -> None:
-            nonlocal tries
+    def get_retry_delay(self, error: Exception, tries: int) -> float:
+        """Get the delay before the next try, exponential with jitter"""
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (tries - 1))
+        delay = delay / 2 + uniform(0, delay / 2)
+        if (retry_after := get_retry_after(error)) is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+    def try_main(
+        self, game: GameData, additional_data: dict, tries: int
+    ) -> Optional[float]:
+        """
+        Run the manager logic once, handle the errors (ignore or report)
 
+        Returns the delay in seconds before the next try if it should be retried
+        """
+        try:
+            self.main(game, additional_data)
+        except Exception as error:  # pylint: disable=broad-exception-caught
             # If FriendlyError, handle its cause instead
             base_error = error
             if isinstance(error, FriendlyError):
@@ -80,12 +125,12 @@ class Manager(ErrorProducer):
             )
 
             out_of_retries_format = "Out of retries dues to %s in %s for %s"
-            retrying_format = "Retrying %s in %s for %s"
+            retrying_format = "Retrying %s in %s for %s in %.1f s"
             unretryable_format = "Unretryable %s in %s for %s"
 
             if type(error) in self.continue_on:
                 # Handle skippable errors (skip silently)
-                return
+                return None
 
             if type(error) in self.retryable_on:
                 if tries > self.max_tries:
@@ -94,27 +139,73 @@ class Manager(ErrorProducer):
                     self.report_error(base_error)
                 else:
                     # Handle retryable errors
-                    logging.error(retrying_format, *log_args)
-                    sleep(self.retry_delay)
-                    tries += 1
-                    try_manager_logic()
+                    delay = self.get_retry_delay(error, tries)
+                    logging.error(retrying_format, *log_args, delay)
+                    return delay
 
             else:
                 # Handle unretryable errors
                 logging.error(unretryable_format, *log_args, exc_info=error)
                 self.report_error(base_error)
 
-        def try_manager_logic() -> None:
-            try:
-                self.main(game, additional_data)
-            except Exception as error:  # pylint: disable=broad-exception-caught
-                handle_error(error)
+        return None
+
+    def run(self, game: GameData, additional_data: dict) -> None:
+        """Handle errors (retry, ignore or raise) that occur in the manager logic"""
+        self.run_try(game, additional_data, lambda _manager: None, 1)
+
+    def run_try(
+        self,
+        game: GameData,
+        additional_data: dict,
+        callback: Callable[["Manager"], Any],
+        tries: int,
+        on_backoff: Optional[BackoffCallback] = None,
+    ) -> None:
+        """Try the manager logic, then retry or call back"""
+        retry_delay = self.try_main(game, additional_data, tries)
+        self.after_try(game, additional_data, callback, tries, retry_delay, on_backoff)
+
+    def after_try(
+        self,
+        game: GameData,
+        additional_data: dict,
+        callback: Callable[["Manager"], Any],
+        tries: int,
+        retry_delay: Optional[float],
+        on_backoff: Optional[BackoffCallback] = None,
+    ) -> None:
+        """
+        Schedule a retry if needed, else call back
+
+        The retry is handed to `on_backoff` if given, else scheduled on the main loop
+        """
+        if retry_delay is None:
+            callback(self)
+            return
+
+        self.n_retries += 1
+        self.total_backoff += retry_delay
+
+        def retry() -> None:
+            self.run_try(game, additional_data, callback, tries + 1, on_backoff)
+
+        if on_backoff is not None:
+            on_backoff(retry_delay, retry)
+            return
+
+        def on_timeout() -> bool:
+            retry()
+            return GLib.SOURCE_REMOVE
 
-        try_manager_logic()
+        GLib.timeout_add(int(retry_delay * 1000), on_timeout)
 
     def process_game(
-        self, game: Game, additional_data: dict, callback: Callable[["Manager"], Any]
+        self,
+        game: GameData,
+        additional_data: dict,
+        callback: Callable[["Manager"], Any],
+        on_backoff: Optional[BackoffCallback] = None,
     ) -> None:
         """Pass the game through the manager"""
-        self.run(game, additional_data)
-        callback(self)
+        self.run_try(game, additional_data, callback, 1, on_backoff)
@@ -22,7 +22,7 @@ from json import JSONDecodeError
 from requests.exceptions import HTTPError, SSLError
 
 from sofl.errors.friendly_error import FriendlyError
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.store.managers.async_manager import AsyncManager
 from sofl.store.managers.cover_manager import CoverManager
 from sofl.store.managers.steam_api_manager import SteamAPIManager
@@ -35,10 +35,17 @@ class SgdbManager(AsyncManager):
     run_after = (SteamAPIManager, CoverManager)
     retryable_on = (HTTPError, SSLError, ConnectionError, JSONDecodeError)
 
-    def main(self, game: Game, _additional_data: dict) -> None:
+    sgdb_helper: SgdbHelper = None
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sgdb_helper = SgdbHelper()
+
+    def main(self, game: GameData, additional_data: dict) -> None:
         try:
-            sgdb = SgdbHelper()
-            sgdb.conditionaly_update_cover(game)
+            self.sgdb_helper.conditionaly_update_cover(
+                game, refresh=additional_data.get("refresh", False)
+            )
         except SgdbAuthError as error:
             # If invalid auth, cancel all SGDBManager tasks
             self.cancellable.cancel()
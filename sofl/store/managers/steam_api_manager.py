@@ -20,7 +20,7 @@
 from requests.exceptions import HTTPError, SSLError
 from urllib3.exceptions import ConnectionError as Urllib3ConnectionError
 
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.store.managers.async_manager import AsyncManager
 from sofl.utils.steam import (
     SteamAPIHelper,
@@ -34,6 +34,8 @@ class SteamAPIManager(AsyncManager):
     """Manager in charge of completing a game's data from the Steam API"""
 
     retryable_on = (HTTPError, SSLError, Urllib3ConnectionError)
+    # Requests are rate limited, running more at once would only wait longer
+    max_concurrent = 1
 
     steam_api_helper: SteamAPIHelper = None
     steam_rate_limiter: SteamRateLimiter = None
@@ -43,14 +45,16 @@ class SteamAPIManager(AsyncManager):
         self.steam_rate_limiter = SteamRateLimiter()
         self.steam_api_helper = SteamAPIHelper(self.steam_rate_limiter)
 
-    def main(self, game: Game, additional_data: dict) -> None:
+    def main(self, game: GameData, additional_data: dict) -> None:
         # Skip non-Steam games
         appid = additional_data.get("steam_appid", None)
         if appid is None:
             return
         # Get online metadata
         try:
-            online_data = self.steam_api_helper.get_api_data(appid=appid)
+            online_data = self.steam_api_helper.get_api_data(
+                appid=appid, refresh=additional_data.get("refresh", False)
+            )
         except (SteamNotAGameError, SteamGameNotFoundError):
             game.update_values({"blacklisted": True})
         else:
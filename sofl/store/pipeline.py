@@ -18,30 +18,46 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
 from gi.repository import GObject
 
-from sofl.game import Game
+from sofl.game_data import GameData
 from sofl.store.managers.manager import Manager
 
+if TYPE_CHECKING:
+    from sofl.store.scheduler import Scheduler
+
 
 class Pipeline(GObject.Object):
     """Class representing a set of managers for a game"""
 
-    game: Game
+    game: GameData
     additional_data: dict
+    scheduler: "Scheduler"
+    # Lower values are dispatched first
+    priority: int
+
+    PRIORITY_DEFAULT = 0
+    PRIORITY_BACKGROUND = 1
 
     waiting: set[Manager]
     running: set[Manager]
     done: set[Manager]
 
     def __init__(
-        self, game: Game, additional_data: dict, managers: Iterable[Manager]
+        self,
+        game: GameData,
+        additional_data: dict,
+        managers: Iterable[Manager],
+        scheduler: "Scheduler",
+        priority: int = PRIORITY_DEFAULT,
     ) -> None:
         super().__init__()
         self.game = game
         self.additional_data = additional_data
+        self.scheduler = scheduler
+        self.priority = priority
         self.waiting = set(managers)
         self.running = set()
         self.done = set()
@@ -55,22 +71,15 @@ class Pipeline(GObject.Object):
     def is_done(self) -> bool:
         return len(self.waiting) == 0 and len(self.running) == 0
 
-    @property
-    def blocked(self) -> set[Manager]:
-        """Get the managers that cannot run because their dependencies aren't done"""
-        blocked = set()
-        for waiting in self.waiting:
-            for not_done in self.not_done:
-                if waiting == not_done:
-                    continue
-                if type(not_done) in waiting.run_after:
-                    blocked.add(waiting)
-        return blocked
-
     @property
     def ready(self) -> set[Manager]:
         """Get the managers that can be run"""
-        return self.waiting - self.blocked
+        not_done = self.not_done
+        return {
+            manager
+            for manager in self.waiting
+            if self.scheduler.dependencies[manager].isdisjoint(not_done)
+        }
 
     @property
     def progress(self) -> float:
@@ -84,18 +93,24 @@ class Pipeline(GObject.Object):
         return progress
 
     def advance(self) -> None:
-        """Spawn tasks for managers that are able to run for a game"""
+        """Submit the managers that are able to run for a game to the scheduler"""
 
         # Separate blocking / async managers
         managers = self.ready
         blocking = set(filter(lambda manager: manager.blocking, managers))
         parallel = managers - blocking
 
-        # Schedule parallel managers, then run the blocking ones
-        for manager in (*parallel, *blocking):
+        # Schedule parallel managers, then run the blocking ones,
+        # each in the dependency order
+        managers = (
+            *sorted(parallel, key=self.scheduler.order.get),
+            *sorted(blocking, key=self.scheduler.order.get),
+        )
+        for manager in managers:
             self.waiting.remove(manager)
             self.running.add(manager)
-            manager.process_game(self.game, self.additional_data, self.manager_callback)
+        for manager in managers:
+            self.scheduler.submit(self, manager)
 
     def manager_callback(self, manager: Manager) -> None:
         """Method called by a manager when it's done"""
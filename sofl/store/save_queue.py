@@ -0,0 +1,191 @@
+# save_queue.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+from threading import Condition, Thread
+from time import monotonic
+from typing import Any, Callable, Iterable, Optional
+
+
+class SaveQueue:
+    """
+    Write-behind queue for game records.
+
+    * Records are keyed by game_id, a newer record replaces a pending one
+    * Deletions are queued as tombstones, so a pending save can't write
+    a deleted game back
+    * Pending records are written in one batch by a single worker thread,
+    once no new record arrived for `delay` seconds (or after `max_delay`)
+    * `flush` blocks until everything pending has been written
+    """
+
+    delay: float = 0.3
+    max_delay: float = 2
+
+    writer: Callable[[Iterable[dict[str, Any]]], None]
+    deleter: Callable[[Iterable[str]], None]
+    # Pending records by game_id, None for the games to delete
+    pending: dict[str, Optional[dict[str, Any]]]
+    condition: Condition
+
+    # Timestamps (monotonic) of the oldest and newest pending record
+    oldest_enqueue: float = 0
+    newest_enqueue: float = 0
+
+    writing: bool = False
+    flush_requested: bool = False
+    stopped: bool = False
+
+    # Measurements
+    n_enqueued: int = 0
+    n_coalesced: int = 0
+    n_written: int = 0
+    n_deleted: int = 0
+    n_batches: int = 0
+    last_flush_latency: float = 0
+    max_flush_latency: float = 0
+    total_write_time: float = 0
+
+    def __init__(
+        self,
+        writer: Callable[[Iterable[dict[str, Any]]], None],
+        deleter: Callable[[Iterable[str]], None],
+    ) -> None:
+        self.writer = writer
+        self.deleter = deleter
+        self.pending = {}
+        self.condition = Condition()
+        Thread(target=self.worker_thread_func, daemon=True).start()
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Get the queue measurements"""
+        with self.condition:
+            return {
+                "enqueued": self.n_enqueued,
+                "coalesced": self.n_coalesced,
+                "written": self.n_written,
+                "deleted": self.n_deleted,
+                "batches": self.n_batches,
+                "pending": len(self.pending),
+                "last_flush_latency": self.last_flush_latency,
+                "max_flush_latency": self.max_flush_latency,
+                "total_write_time": self.total_write_time,
+            }
+
+    def enqueue(self, record: dict[str, Any]) -> None:
+        """Schedule a record to be written"""
+        self.put(record["game_id"], record)
+
+    def delete(self, game_id: str) -> None:
+        """Schedule a game to be deleted, replacing its pending record if any"""
+        self.put(game_id, None)
+
+    def put(self, game_id: str, record: Optional[dict[str, Any]]) -> None:
+        with self.condition:
+            now = monotonic()
+            if not self.pending:
+                self.oldest_enqueue = now
+            if game_id in self.pending:
+                self.n_coalesced += 1
+            self.pending[game_id] = record
+            self.newest_enqueue = now
+            self.n_enqueued += 1
+            self.condition.notify_all()
+
+    def flush(self) -> None:
+        """Write the pending records now and wait until they are written"""
+        with self.condition:
+            self.flush_requested = True
+            self.condition.notify_all()
+            while (self.pending or self.writing) and not self.stopped:
+                self.condition.wait()
+            self.flush_requested = False
+
+    def stop(self) -> None:
+        """Drain the queue and stop the worker"""
+        self.flush()
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def batch_is_due(self) -> bool:
+        if self.flush_requested:
+            return True
+        now = monotonic()
+        return (
+            now - self.newest_enqueue >= self.delay
+            or now - self.oldest_enqueue >= self.max_delay
+        )
+
+    def worker_thread_func(self) -> None:
+        """Entry point for the worker thread writing the batches"""
+        while True:
+            with self.condition:
+                while not self.stopped and not (self.pending and self.batch_is_due()):
+                    if not self.pending:
+                        self.condition.wait()
+                        continue
+                    # Wait for the burst to settle down
+                    self.condition.wait(
+                        min(
+                            self.newest_enqueue + self.delay,
+                            self.oldest_enqueue + self.max_delay,
+                        )
+                        - monotonic()
+                    )
+                if self.stopped:
+                    return
+                batch, self.pending = self.pending, {}
+                oldest_enqueue = self.oldest_enqueue
+                self.writing = True
+
+            records = [record for record in batch.values() if record is not None]
+            deleted_ids = [
+                game_id for game_id, record in batch.items() if record is None
+            ]
+
+            start = monotonic()
+            try:
+                if deleted_ids:
+                    self.deleter(deleted_ids)
+                if records:
+                    self.writer(records)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logging.error("Couldn't save %d games", len(batch), exc_info=error)
+            end = monotonic()
+
+            with self.condition:
+                self.writing = False
+                self.n_written += len(records)
+                self.n_deleted += len(deleted_ids)
+                self.n_batches += 1
+                self.total_write_time += end - start
+                self.last_flush_latency = end - oldest_enqueue
+                self.max_flush_latency = max(
+                    self.max_flush_latency, self.last_flush_latency
+                )
+                self.condition.notify_all()
+
+            logging.debug(
+                "Saved %d games in %.1f ms (%.1f ms after first save request)",
+                len(batch),
+                (end - start) * 1000,
+                self.last_flush_latency * 1000,
+            )
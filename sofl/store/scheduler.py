@@ -0,0 +1,206 @@
+# scheduler.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import heapq
+import logging
+from itertools import count
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from gi.repository import GLib
+
+from sofl.store.managers.manager import Manager
+
+if TYPE_CHECKING:
+    from sofl.store.pipeline import Pipeline
+
+
+class Scheduler:
+    """
+    Dispatches the pipelines work to the managers.
+
+    * The managers dependency graph (from `run_after`) is resolved once,
+    when the managers change. Pipelines submit their ready managers in that order.
+    * Blocking managers run right away on the main thread
+    * Other managers run at most `max_concurrent` games at a time,
+    queued work is dispatched by pipeline priority, then in submission order
+    * Games waiting to be retried free their slot, they are queued again
+    once their backoff is over
+    * Not thread-safe, must only be used from the main loop.
+    The store advances the pipelines there, even for games added from threads.
+    """
+
+    managers: tuple[Manager, ...]
+    order: dict[Manager, int]
+    dependencies: dict[Manager, frozenset[Manager]]
+
+    # Queued pipelines, with the function resuming them if they are retried
+    queues: dict[
+        Manager, list[tuple[int, int, "Pipeline", Optional[Callable[[], None]]]]
+    ]
+    running: dict[Manager, int]
+    sequence: count
+
+    # Measurements
+    peak_running: dict[Manager, int]
+    peak_total_running: int = 0
+
+    def __init__(self) -> None:
+        self.managers = tuple()
+        self.order = {}
+        self.dependencies = {}
+        self.queues = {}
+        self.running = {}
+        self.peak_running = {}
+        self.sequence = count()
+
+    def set_managers(self, managers: Iterable[Manager]) -> None:
+        """Resolve the dependency graph of the managers"""
+        managers = tuple(managers)
+        by_type = {type(manager): manager for manager in managers}
+        dependencies = {
+            manager: frozenset(
+                by_type[dependency]
+                for dependency in by_type
+                if dependency in manager.run_after
+            )
+            for manager in managers
+        }
+
+        # Topological sort, stable with regard to the managers order
+        order: dict[Manager, int] = {}
+        remaining = list(managers)
+        while remaining:
+            ready = [
+                manager
+                for manager in remaining
+                if all(dependency in order for dependency in dependencies[manager])
+            ]
+            if not ready:
+                raise ValueError(
+                    "Circular manager dependencies: "
+                    + ", ".join(manager.name for manager in remaining)
+                )
+            for manager in ready:
+                order[manager] = len(order)
+                remaining.remove(manager)
+
+        self.managers = managers
+        self.order = order
+        self.dependencies = dependencies
+        for manager in managers:
+            self.queues.setdefault(manager, [])
+            self.running.setdefault(manager, 0)
+            self.peak_running.setdefault(manager, 0)
+
+        logging.debug(
+            "Manager order: %s",
+            ", ".join(manager.name for manager in sorted(order, key=order.get)),
+        )
+
+    @property
+    def total_running(self) -> int:
+        return sum(self.running.values())
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get the per manager measurements"""
+        return {
+            manager.name: {
+                "running": self.running[manager],
+                "queued": len(self.queues[manager]),
+                "peak_running": self.peak_running[manager],
+                "retries": manager.n_retries,
+                "total_backoff": round(manager.total_backoff),
+            }
+            for manager in self.managers
+        }
+
+    def submit(
+        self,
+        pipeline: "Pipeline",
+        manager: Manager,
+        resume: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Schedule a manager to process the game of a pipeline
+
+        :param resume: Function retrying the game, instead of processing it anew
+        """
+        if manager.blocking:
+            self.start(pipeline, manager, resume)
+            return
+        heapq.heappush(
+            self.queues[manager],
+            (pipeline.priority, next(self.sequence), pipeline, resume),
+        )
+        self.dispatch(manager)
+
+    def dispatch(self, manager: Manager) -> None:
+        """Start the queued work of a manager, within its concurrency limit"""
+        queue = self.queues[manager]
+        while queue and self.running[manager] < manager.max_concurrent:
+            _priority, _sequence, pipeline, resume = heapq.heappop(queue)
+            self.start(pipeline, manager, resume)
+
+    def start(
+        self,
+        pipeline: "Pipeline",
+        manager: Manager,
+        resume: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.running[manager] += 1
+        self.peak_running[manager] = max(
+            self.peak_running[manager], self.running[manager]
+        )
+        self.peak_total_running = max(self.peak_total_running, self.total_running)
+        if resume is not None:
+            resume()
+            return
+        manager.process_game(
+            pipeline.game,
+            pipeline.additional_data,
+            lambda manager: self.on_manager_done(pipeline, manager),
+            lambda delay, retry: self.on_manager_backoff(
+                pipeline, manager, delay, retry
+            ),
+        )
+
+    def on_manager_backoff(
+        self,
+        pipeline: "Pipeline",
+        manager: Manager,
+        delay: float,
+        retry: Callable[[], None],
+    ) -> None:
+        """Free the slot of a game waiting for a retry, queue it after the delay"""
+        self.running[manager] -= 1
+        if not manager.blocking:
+            self.dispatch(manager)
+
+        def on_timeout() -> bool:
+            self.submit(pipeline, manager, retry)
+            return GLib.SOURCE_REMOVE
+
+        GLib.timeout_add(int(delay * 1000), on_timeout)
+
+    def on_manager_done(self, pipeline: "Pipeline", manager: Manager) -> None:
+        self.running[manager] -= 1
+        pipeline.manager_callback(manager)
+        if not manager.blocking:
+            self.dispatch(manager)
@@ -18,12 +18,18 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
+from threading import Lock
 from typing import Any, Generator, MutableMapping, Optional
 
+from gi.repository import GLib
+
 from sofl import shared
-from sofl.game import Game
+from sofl.game_data import GameData
+from sofl.store.game_storage import GameStorage, SqliteGameStorage
+from sofl.store.managers.file_manager import FileManager
 from sofl.store.managers.manager import Manager
 from sofl.store.pipeline import Pipeline
+from sofl.store.scheduler import Scheduler
 
 
 class Store:
@@ -32,55 +38,120 @@ class Store:
     managers: dict[type[Manager], Manager]
     pipeline_managers: set[Manager]
     pipelines: dict[str, Pipeline]
-    source_games: MutableMapping[str, MutableMapping[str, Game]]
+    scheduler: Scheduler
+    source_games: MutableMapping[str, MutableMapping[str, GameData]]
+    games: MutableMapping[str, GameData]
     new_game_ids: set[str]
     duplicate_game_ids: set[str]
+    storage: GameStorage
+
+    # Number of shown games of each source, and the source each game is counted in.
+    # The sources whose count changed are kept until the sidebar is updated.
+    # Importer threads add games too, the counts are only touched with the lock.
+    source_counts: dict[str, int]
+    counted_sources: dict[str, str]
+    changed_source_ids: set[str]
+    counts_lock: Lock
 
     def __init__(self) -> None:
         self.managers = {}
         self.pipeline_managers = set()
         self.pipelines = {}
+        self.scheduler = Scheduler()
         self.source_games = {}
+        self.games = {}
         self.new_game_ids = set()
         self.duplicate_game_ids = set()
+        self.source_counts = {}
+        self.counted_sources = {}
+        self.changed_source_ids = set()
+        self.counts_lock = Lock()
+        self.storage = SqliteGameStorage(shared.games_db, legacy_dir=shared.games_dir)
 
     def __contains__(self, obj: object) -> bool:
         """Check if the game is present in the store with the `in` keyword"""
-        if not isinstance(obj, Game):
-            return False
-        if not (source_mapping := self.source_games.get(obj.base_source)):
+        if not isinstance(obj, GameData):
             return False
-        return obj.game_id in source_mapping
+        return obj.game_id in self.games
 
-    def __iter__(self) -> Generator[Game, None, None]:
+    def __iter__(self) -> Generator[GameData, None, None]:
         """Iterate through the games in the store with `for ... in`"""
-        for _source_id, games_mapping in self.source_games.items():
-            for _game_id, game in games_mapping.items():
-                yield game
+        yield from tuple(self.games.values())
 
     def __len__(self) -> int:
         """Get the number of games in the store with the `len` builtin"""
-        return sum(len(source_mapping) for source_mapping in self.source_games.values())
+        return len(self.games)
 
-    def __getitem__(self, game_id: str) -> Game:
+    def __getitem__(self, game_id: str) -> GameData:
         """Get a game by its id with `store["game_id_goes_here"]`"""
-        for game in iter(self):
-            if game.game_id == game_id:
-                return game
-        raise KeyError("Game not found in store")
+        try:
+            return self.games[game_id]
+        except KeyError as error:
+            raise KeyError("Game not found in store") from error
 
-    def get(self, game_id: str, default: Any = None) -> Game | Any:
+    def get(self, game_id: str, default: Any = None) -> GameData | Any:
         """Get a game by its ID, with a fallback if not found"""
-        try:
-            game = self[game_id]
-            return game
-        except KeyError:
-            return default
+        return self.games.get(game_id, default)
+
+    def remove_game(self, game: GameData) -> None:
+        """Forget a game, keeping the source mapping and the index in sync"""
+        self.games.pop(game.game_id, None)
+        self.count_game(game)
+        if (source_mapping := self.source_games.get(game.base_source)) is None:
+            return
+        source_mapping.pop(game.game_id, None)
+        if not source_mapping:
+            del self.source_games[game.base_source]
+
+    def move_game(self, game: GameData, old_base_source: str) -> None:
+        """Move a game to its new source mapping after its source changed"""
+        if (source_mapping := self.source_games.get(old_base_source)) is not None:
+            source_mapping.pop(game.game_id, None)
+            if not source_mapping:
+                del self.source_games[old_base_source]
+        self.source_games.setdefault(game.base_source, {})[game.game_id] = game
+        self.games[game.game_id] = game
+        self.count_game(game)
+
+    def count_game(self, game: GameData) -> None:
+        """Update the shown games counts after a game changed, in constant time"""
+        with self.counts_lock:
+            previous = self.counted_sources.pop(game.game_id, None)
+            current = (
+                game.base_source
+                if self.games.get(game.game_id) is game
+                and not (game.removed or game.hidden or game.blacklisted)
+                else None
+            )
+            if current is not None:
+                self.counted_sources[game.game_id] = current
+            if previous == current:
+                return
+
+            if previous is not None:
+                self.source_counts[previous] -= 1
+                if not self.source_counts[previous]:
+                    del self.source_counts[previous]
+                self.changed_source_ids.add(previous)
+            if current is not None:
+                self.source_counts[current] = self.source_counts.get(current, 0) + 1
+                self.changed_source_ids.add(current)
+
+    def take_changed_counts(self) -> tuple[dict[str, int], int]:
+        """Get the counts of the sources changed since the last call, and the total"""
+        with self.counts_lock:
+            changed_counts = {
+                source_id: self.source_counts.get(source_id, 0)
+                for source_id in self.changed_source_ids
+            }
+            self.changed_source_ids = set()
+            return changed_counts, sum(self.source_counts.values())
 
     def add_manager(self, manager: Manager, in_pipeline: bool = True) -> None:
         """Add a manager to the store"""
         manager_type = type(manager)
         self.managers[manager_type] = manager
+        self.scheduler.set_managers(self.managers.values())
         self.toggle_manager_in_pipelines(manager_type, in_pipeline)
 
     def toggle_manager_in_pipelines(
@@ -92,10 +163,17 @@ class Store:
         else:
             self.pipeline_managers.discard(self.managers[manager_type])
 
-    def cleanup_game(self, game: Game) -> None:
-        """Remove a game's files, dismiss any loose toasts"""
+    def cleanup_game(self, game: GameData) -> None:
+        """Remove a game's record and files, dismiss any loose toasts"""
+        # Deleted behind the pending saves of the game, if any
+        if file_manager := self.managers.get(FileManager):
+            file_manager.save_queue.delete(game.game_id)
+        else:
+            self.storage.delete(game.game_id)
+            (shared.games_dir / f"{game.game_id}.json").unlink(missing_ok=True)
+
+        # Backdrops may be shared by identical covers, they are pruned after imports
         for path in (
-            shared.games_dir / f"{game.game_id}.json",
             shared.covers_dir / f"{game.game_id}.tiff",
             shared.covers_dir / f"{game.game_id}.gif",
         ):
@@ -110,9 +188,18 @@ class Store:
                 pass
 
     def add_game(
-        self, game: Game, additional_data: dict, run_pipeline: bool = True
+        self,
+        game: GameData,
+        additional_data: dict,
+        run_pipeline: bool = True,
+        priority: int = Pipeline.PRIORITY_DEFAULT,
     ) -> Optional[Pipeline]:
-        """Add a game to the app"""
+        """
+        Add a game to the app
+
+        The pipeline of the game starts on the main loop,
+        this may be called from the importer threads.
+        """
 
         # Ignore games from a newer spec version
         if game.version > shared.SPEC_VERSION:
@@ -148,16 +235,27 @@ class Store:
         for manager in self.managers.values():
             for signal in manager.signals:
                 game.connect(signal, manager.run)
+        game.connect("toast", shared.win.on_game_toast)
 
         # Add the game to the store
+        if stored_game:
+            self.remove_game(stored_game)
         if not game.base_source in self.source_games:
             self.source_games[game.base_source] = {}
         self.source_games[game.base_source][game.game_id] = game
+        self.games[game.game_id] = game
+        self.count_game(game)
 
         # Run the pipeline for the game
         if not run_pipeline:
             return None
-        pipeline = Pipeline(game, additional_data, self.pipeline_managers)
+        pipeline = Pipeline(
+            game, additional_data, self.pipeline_managers, self.scheduler, priority
+        )
         self.pipelines[game.game_id] = pipeline
-        pipeline.advance()
+        GLib.idle_add(self.start_pipeline, pipeline)
         return pipeline
+
+    def start_pipeline(self, pipeline: Pipeline) -> bool:
+        pipeline.advance()
+        return GLib.SOURCE_REMOVE
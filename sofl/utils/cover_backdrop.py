@@ -0,0 +1,154 @@
+# cover_backdrop.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from pathlib import Path
+from threading import get_ident
+from time import time
+
+from PIL import Image, ImageFilter, ImageStat, UnidentifiedImageError
+
+from sofl import shared
+from sofl.utils.metadata_cache import MetadataCache, get_metadata_cache
+
+# Backdrop path and luminance values for light and dark mode
+Backdrop = tuple[Path, tuple[float, float]]
+
+# Hashes and luminances only change with the cover file, which changes their key
+CACHE_TTL = 365 * 24 * 60 * 60
+
+BACKDROP_SUFFIX = ".backdrop.tiff"
+
+# Covers are saved in bursts while importing, blur them a few at a time
+executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="backdrop")
+
+
+def get_luminance_cache() -> MetadataCache:
+    return get_metadata_cache(shared.metadata_cache_db, "cover_backdrops")
+
+
+def get_hash_cache() -> MetadataCache:
+    return get_metadata_cache(shared.metadata_cache_db, "cover_hashes")
+
+
+def get_cover_hash(cover_path: Path) -> str:
+    """Get the hash of a cover's content, only read again when the file changed"""
+    stat = cover_path.stat()
+    # Hard links of a cover share their inode, and their hash
+    key = f"{stat.st_dev}:{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+    if (cover_hash := get_hash_cache().get(key)) is not MetadataCache.MISSING:
+        return cover_hash
+
+    digest = blake2b(digest_size=16)
+    with open(cover_path, "rb") as file:
+        while chunk := file.read(1 << 16):
+            digest.update(chunk)
+    cover_hash = digest.hexdigest()
+    get_hash_cache().set(key, cover_hash, CACHE_TTL)
+    return cover_hash
+
+
+def get_backdrop_path(cover_hash: str) -> Path:
+    """Backdrops are stored next to the covers, shared by identical covers"""
+    return shared.covers_dir / f"{cover_hash}{BACKDROP_SUFFIX}"
+
+
+def get_backdrop(cover_path: Path) -> Backdrop:
+    """Get the blurred backdrop of a cover and its luminance, created if missing"""
+    cover_hash = get_cover_hash(cover_path)
+    path = get_backdrop_path(cover_hash)
+    luminance = get_luminance_cache().get(cover_hash)
+    if luminance is not MetadataCache.MISSING and path.is_file():
+        return path, tuple(luminance)
+    return create_backdrop(cover_path, cover_hash)
+
+
+def create_backdrop(cover_path: Path, cover_hash: str) -> Backdrop:
+    with Image.open(cover_path) as image:
+        image = (
+            image.convert("RGB").resize((100, 150)).filter(ImageFilter.GaussianBlur(20))
+        )
+
+        stat = ImageStat.Stat(image.convert("L"))
+        luminance = (
+            min((stat.mean[0] + stat.extrema[0][0]) / 510, 0.7),
+            max((stat.mean[0] + stat.extrema[0][1]) / 510, 0.3),
+        )
+
+        # Written aside first, as the details page may be loading it
+        path = get_backdrop_path(cover_hash)
+        tmp_path = path.with_name(f"{path.name}.{get_ident()}.tmp")
+        image.save(tmp_path, "tiff", compression=None)
+        tmp_path.replace(path)
+
+    get_luminance_cache().set(cover_hash, luminance, CACHE_TTL)
+    return path, luminance
+
+
+def queue_backdrop(cover_path: Path) -> None:
+    """Create the backdrop of a new cover in the background"""
+
+    def create() -> None:
+        try:
+            get_backdrop(cover_path)
+        except (OSError, UnidentifiedImageError) as error:
+            logging.error(
+                "Couldn't create the backdrop of %s", cover_path, exc_info=error
+            )
+
+    executor.submit(create)
+
+
+def prune_backdrops() -> None:
+    """
+    Delete the backdrops that no cover uses anymore.
+
+    Identical covers share their backdrop, so it can't be deleted with one of them.
+    Backdrops created during the pass are kept, their cover may be new.
+    """
+    start = time()
+    cover_hashes = set()
+    backdrops = []
+    try:
+        for path in shared.covers_dir.iterdir():
+            try:
+                if path.name.endswith(BACKDROP_SUFFIX):
+                    backdrops.append(path)
+                elif path.suffix in (".tiff", ".gif"):
+                    cover_hashes.add(get_cover_hash(path))
+            except OSError:
+                continue
+    except OSError:
+        return
+
+    n_removed = 0
+    for path in backdrops:
+        if path.name.removesuffix(BACKDROP_SUFFIX) in cover_hashes:
+            continue
+        try:
+            if path.stat().st_mtime >= start:
+                continue
+            path.unlink()
+        except OSError:
+            continue
+        n_removed += 1
+
+    logging.debug("Removed %d unused backdrops", n_removed)
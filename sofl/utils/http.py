@@ -0,0 +1,74 @@
+# http.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from threading import local
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPClient:
+    """
+    Thread-safe HTTP client reusing keep-alive connections.
+
+    * Every thread gets its own `requests.Session` (sessions are not thread-safe),
+    they all share the same adapters and thus the same per host connection pools
+    * Requests get a default timeout, retries are left to the callers
+    """
+
+    timeout: tuple[float, float] = (5, 10)
+    user_agent: str = "sofl"
+
+    adapter: HTTPAdapter
+    sessions: local
+
+    def __init__(self, pool_connections: int = 8, pool_maxsize: int = 8) -> None:
+        """
+        :param pool_connections: Number of hosts to keep a connection pool for
+        :param pool_maxsize: Number of kept-alive connections per host
+        """
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+        )
+        self.sessions = local()
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the session of the current thread"""
+        if (session := getattr(self.sessions, "session", None)) is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = self.user_agent
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self.sessions.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def close(self) -> None:
+        """Close the pooled connections"""
+        self.adapter.close()
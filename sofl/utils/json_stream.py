@@ -0,0 +1,138 @@
+# json_stream.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import re
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Iterator, Optional, TextIO
+
+WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+
+
+class JSONStreamReader:
+    """
+    Incremental reader over a JSON text file.
+
+    * The file is read in chunks, the consumed text is dropped
+    * Values are decoded one at a time with `JSONDecoder.raw_decode`
+    * A value cut by the end of the buffer is decoded again once more text was read
+    """
+
+    decoder = JSONDecoder()
+
+    file: TextIO
+    chunk_size: int
+    buffer: str = ""
+    position: int = 0
+    eof: bool = False
+
+    def __init__(self, file: TextIO, chunk_size: int = 64 * 1024) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+
+    def read_more(self, size: int) -> None:
+        # Drop the consumed text to bound the memory use
+        self.buffer = self.buffer[self.position :]
+        self.position = 0
+        if chunk := self.file.read(size):
+            self.buffer += chunk
+        else:
+            self.eof = True
+
+    def peek(self) -> str:
+        """Skip whitespace and get the next character, empty at the end"""
+        while True:
+            self.position = WHITESPACE_RE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position : self.position + 1]
+            self.read_more(self.chunk_size)
+
+    def expect(self, *characters: str) -> str:
+        if (character := self.peek()) not in characters:
+            raise JSONDecodeError(
+                f"Expecting {' or '.join(characters)}", self.buffer, self.position
+            )
+        self.position += 1
+        return character
+
+    def decode(self) -> Any:
+        """Decode the next value"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number may continue past the end of the buffer
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            # Grow the reads, big values would be decoded again too many times
+            self.read_more(size)
+            size *= 2
+
+
+def iter_json_array(
+    file: TextIO, key: Optional[str] = None, others: Optional[dict] = None
+) -> Iterator[Any]:
+    """
+    Lazily decode the elements of a JSON array.
+
+    :param file: File containing the array, or an object containing it
+    :param key: Key of the array in the top level object, None if the file is an array
+    :param others: Dict receiving the other values of the top level object,
+    the values after the array are only read if the iteration completes
+    :raises JSONDecodeError: if the file isn't valid JSON
+    :raises KeyError: if the object has no such key
+    """
+    reader = JSONStreamReader(file)
+    others = {} if others is None else others
+
+    if key is not None:
+        found = False
+        reader.expect("{")
+        if reader.peek() == "}":
+            raise KeyError(key)
+        while True:
+            name = reader.decode()
+            reader.expect(":")
+            if name == key and not found:
+                found = True
+                yield from iter_array_elements(reader)
+            else:
+                others[name] = reader.decode()
+            if reader.expect(",", "}") == "}":
+                break
+        if not found:
+            raise KeyError(key)
+    else:
+        yield from iter_array_elements(reader)
+
+
+def iter_array_elements(reader: JSONStreamReader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.position += 1
+        return
+    while True:
+        yield reader.decode()
+        if reader.expect(",", "]") == "]":
+            return
@@ -0,0 +1,146 @@
+# metadata_cache.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+import sqlite3
+from functools import cache
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Optional
+
+
+class MetadataCache:
+    """
+    Persistent key-value cache for online metadata, backed by SQLite.
+
+    * Entries of several caches live in the same database, separated by namespace
+    * Every entry expires after its own TTL
+    * Values are stored as JSON, so negative results can be cached too
+    * Expired entries are purged when the cache is opened
+
+    Use `get_metadata_cache` rather than opening a cache per use.
+    """
+
+    MISSING = object()
+
+    path: Path
+    namespace: str
+    connection: Optional[sqlite3.Connection]
+    lock: Lock
+
+    def __init__(self, path: Path, namespace: str) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.lock = Lock()
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Connection is shared between threads, access is serialized by the lock
+            self.connection = sqlite3.connect(
+                path, timeout=10, check_same_thread=False, isolation_level=None
+            )
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """)
+            self.prune()
+        except (OSError, sqlite3.Error) as error:
+            # The cache is an optimization, work without it
+            logging.error("Couldn't open the metadata cache %s", path, exc_info=error)
+            self.connection = None
+
+    def get(self, key: str) -> Any:
+        """Get a cached value, `MetadataCache.MISSING` if absent or expired"""
+        if self.connection is None:
+            return self.MISSING
+        try:
+            with self.lock:
+                row = self.connection.execute(
+                    "SELECT value FROM cache "
+                    "WHERE namespace = ? AND key = ? AND expires > ?",
+                    (self.namespace, key, time()),
+                ).fetchone()
+        except sqlite3.Error as error:
+            logging.error("Couldn't read the metadata cache", exc_info=error)
+            return self.MISSING
+        return self.MISSING if row is None else json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Cache a value for `ttl` seconds"""
+        if self.connection is None:
+            return
+        try:
+            with self.lock:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value), time() + ttl),
+                )
+        except sqlite3.Error as error:
+            logging.error("Couldn't write the metadata cache", exc_info=error)
+
+    def delete(self, key: str) -> None:
+        """Forget a cached value"""
+        if self.connection is None:
+            return
+        try:
+            with self.lock:
+                self.connection.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+        except sqlite3.Error as error:
+            logging.error("Couldn't write the metadata cache", exc_info=error)
+
+    def prune(self) -> None:
+        """Delete the expired entries of this cache"""
+        with self.lock:
+            n_deleted = self.connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires <= ?",
+                (self.namespace, time()),
+            ).rowcount
+        if n_deleted:
+            logging.debug(
+                "Pruned %d expired %s cache entries", n_deleted, self.namespace
+            )
+
+    def clear(self) -> None:
+        """Forget every entry of this cache"""
+        if self.connection is None:
+            return
+        try:
+            with self.lock:
+                self.connection.execute(
+                    "DELETE FROM cache WHERE namespace = ?", (self.namespace,)
+                )
+        except sqlite3.Error as error:
+            logging.error("Couldn't write the metadata cache", exc_info=error)
+
+
+@cache
+def get_metadata_cache(path: Path, namespace: str) -> MetadataCache:
+    """Get the cache of a namespace, opened once and shared by all of its users"""
+    return MetadataCache(path, namespace)
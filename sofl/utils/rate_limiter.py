@@ -17,67 +17,66 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import asyncio
 from collections import deque
 from contextlib import AbstractContextManager
-from threading import BoundedSemaphore, Lock, Thread
-from time import sleep, time
-from typing import Any, Sized
+from threading import Lock
+from time import monotonic, sleep, time
+from typing import Any, Optional, Sized
 
 
 class PickHistory(Sized):
     """Utility class used for rate limiters, counting how many picks
-    happened in a given period"""
+    happened in a given period.
+
+    Timestamps are monotonic and kept in increasing order,
+    so old entries are dropped from the left in amortized O(1).
+    Not thread-safe, the owner is in charge of locking."""
 
     period: int
 
-    timestamps: list[float]
-    timestamps_lock: Lock
+    timestamps: deque[float]
 
     def __init__(self, period: int) -> None:
         self.period = period
-        self.timestamps = []
-        self.timestamps_lock = Lock()
+        self.timestamps = deque()
 
-    def remove_old_entries(self) -> None:
+    def remove_old_entries(self, now: Optional[float] = None) -> None:
         """Remove history entries older than the period"""
-        now = time()
-        cutoff = now - self.period
-        with self.timestamps_lock:
-            self.timestamps = [entry for entry in self.timestamps if entry > cutoff]
+        cutoff = (monotonic() if now is None else now) - self.period
+        while self.timestamps and self.timestamps[0] <= cutoff:
+            self.timestamps.popleft()
 
     def add(self, *new_timestamps: float) -> None:
-        """Add timestamps to the history.
+        """Add monotonic timestamps to the history.
         If none given, will add the current timestamp"""
         if len(new_timestamps) == 0:
-            new_timestamps = (time(),)
-        with self.timestamps_lock:
-            self.timestamps.extend(new_timestamps)
+            new_timestamps = (monotonic(),)
+        self.timestamps.extend(new_timestamps)
+
+    def add_wall_clock(self, *new_timestamps: float) -> None:
+        """Add wall clock timestamps (eg. loaded from disk) to the history"""
+        offset = time() - monotonic()
+        self.add(*sorted(timestamp - offset for timestamp in new_timestamps))
 
     def __len__(self) -> int:
         """How many entries were logged in the period"""
         self.remove_old_entries()
-        with self.timestamps_lock:
-            return len(self.timestamps)
+        return len(self.timestamps)
 
     @property
     def start(self) -> float:
         """Get the time at which the history started"""
         self.remove_old_entries()
-        with self.timestamps_lock:
-            try:
-                entry = self.timestamps[0]
-            except IndexError:
-                entry = time()
-        return entry
-
-    def copy_timestamps(self) -> list[float]:
-        """Get a copy of the timestamps history"""
+        return self.timestamps[0] if self.timestamps else monotonic()
+
+    def copy_wall_clock_timestamps(self) -> list[float]:
+        """Get a copy of the timestamps history, as wall clock timestamps"""
         self.remove_old_entries()
-        with self.timestamps_lock:
-            return self.timestamps.copy()
+        offset = time() - monotonic()
+        return [timestamp + offset for timestamp in self.timestamps]
 
 
-# pylint: disable=too-many-instance-attributes
 class RateLimiter(AbstractContextManager):
     """
     Base rate limiter implementing the token bucket algorithm.
@@ -85,6 +84,12 @@ class RateLimiter(AbstractContextManager):
     Do not use directly, create a child class to tailor the rate limiting to the
     underlying service's limits.
 
+    * Up to `burst_tokens` can be consumed instantly, the bucket then refills
+    at a rate of `refill_period_tokens` per `refill_period_seconds`
+    * No more than `refill_period_tokens` are ever consumed in a period
+    * Every caller reserves the next free slot under the lock, then waits for it
+    outside of it. Slots are handed out in call order and no thread is spawned.
+
     Subclasses must provide values to the following attributes:
     * refill_period_seconds - Period in which we have a max amount of tokens
     * refill_period_tokens - Number of tokens allowed in this period
@@ -96,23 +101,12 @@ class RateLimiter(AbstractContextManager):
     burst_tokens: int
 
     pick_history: PickHistory
-    bucket: BoundedSemaphore
-    queue: deque[Lock]
-    queue_lock: Lock
-
-    # Protect the number of tokens behind a lock
-    __n_tokens_lock: Lock
-    __n_tokens = 0
+    lock: Lock
 
-    @property
-    def n_tokens(self) -> int:
-        with self.__n_tokens_lock:
-            return self.__n_tokens
-
-    @n_tokens.setter
-    def n_tokens(self, value: int) -> None:
-        with self.__n_tokens_lock:
-            self.__n_tokens = value
+    # Tokens in the bucket at `tokens_time`, may be fractional
+    n_tokens: float
+    tokens_time: float
+    last_slot: float = 0
 
     def _init_pick_history(self) -> None:
         """
@@ -126,91 +120,65 @@ class RateLimiter(AbstractContextManager):
 
     def __init__(self) -> None:
         """Initialize the limiter"""
-
+        self.lock = Lock()
         self._init_pick_history()
-
-        # Create synchronization data
-        self.__n_tokens_lock = Lock()
-        self.queue_lock = Lock()
-        self.queue = deque()
-
-        # Initialize the token bucket
-        self.bucket = BoundedSemaphore(self.burst_tokens)
         self.n_tokens = self.burst_tokens
-
-        # Spawn daemon thread that refills the bucket
-        refill_thread = Thread(target=self.refill_thread_func, daemon=True)
-        refill_thread.start()
+        self.tokens_time = monotonic()
 
     @property
-    def refill_spacing(self) -> float:
-        """
-        Get the current refill spacing.
+    def refill_rate(self) -> float:
+        """Tokens added to the bucket per second"""
+        return self.refill_period_tokens / self.refill_period_seconds
+
+    def refill(self, until: float) -> None:
+        """Add the tokens refilled until the given time to the bucket"""
+        self.n_tokens = min(
+            self.burst_tokens,
+            self.n_tokens + (until - self.tokens_time) * self.refill_rate,
+        )
+        self.tokens_time = until
+
+    def reserve(self) -> float:
+        """Reserve a token, return the monotonic time at which it may be used"""
+        with self.lock:
+            slot = max(monotonic(), self.last_slot)
+
+            # Wait for the bucket to contain a token
+            self.refill(slot)
+            if self.n_tokens < 1:
+                slot += (1 - self.n_tokens) / self.refill_rate
+
+            # Never exceed the period limit, even after a burst
+            self.pick_history.remove_old_entries(slot)
+            timestamps = self.pick_history.timestamps
+            if len(timestamps) >= self.refill_period_tokens:
+                slot = max(
+                    slot,
+                    timestamps[-self.refill_period_tokens] + self.refill_period_seconds,
+                )
+
+            self.refill(slot)
+            self.n_tokens -= 1
+            self.pick_history.add(slot)
+            self.last_slot = slot
+            self.on_reserved()
+        return slot
 
-        Ensures that even with a burst in the period, the limit will not be exceeded.
+    def on_reserved(self) -> None:
+        """
+        Called with the lock held after a token is reserved.
+        May be extended by subclasses.
         """
-
-        # Compute ideal spacing
-        tokens_left = self.refill_period_tokens - len(self.pick_history)  # type: ignore
-        seconds_left = self.pick_history.start + self.refill_period_seconds - time()  # type: ignore
-        try:
-            spacing_seconds = seconds_left / tokens_left
-        except ZeroDivisionError:
-            # There were no remaining tokens, gotta wait until end of the period
-            spacing_seconds = seconds_left
-
-        # Prevent spacing dropping down lower than the natural spacing
-        natural_spacing = self.refill_period_seconds / self.refill_period_tokens
-        return max(natural_spacing, spacing_seconds)
-
-    def refill(self) -> None:
-        """Add a token back in the bucket"""
-        sleep(self.refill_spacing)
-        try:
-            self.bucket.release()
-        except ValueError:
-            # Bucket was full
-            pass
-        else:
-            self.n_tokens += 1
-
-    def refill_thread_func(self) -> None:
-        """Entry point for the daemon thread that is refilling the bucket"""
-        while True:
-            self.refill()
-
-    def update_queue(self) -> None:
-        """Update the queue, moving it forward if possible. Non-blocking."""
-        update_thread = Thread(target=self.queue_update_thread_func, daemon=True)
-        update_thread.start()
-
-    def queue_update_thread_func(self) -> None:
-        """Queue-updating thread's entry point"""
-        with self.queue_lock:
-            if len(self.queue) == 0:
-                return
-            # Not using with because we don't want to release to the bucket
-            self.bucket.acquire()  # pylint: disable=consider-using-with
-            self.n_tokens -= 1
-            lock = self.queue.pop()
-            lock.release()
-
-    def add_to_queue(self) -> Lock:
-        """Create a lock, add it to the queue and return it"""
-        lock = Lock()
-        # We want the lock locked until its turn in queue
-        lock.acquire()  # pylint: disable=consider-using-with
-        with self.queue_lock:
-            self.queue.appendleft(lock)
-        return lock
 
     def acquire(self) -> None:
         """Acquires a token from the bucket when it's your turn in queue"""
-        lock = self.add_to_queue()
-        self.update_queue()
-        # Wait until our turn in queue
-        lock.acquire()  # pylint: disable=consider-using-with
-        self.pick_history.add()  # type: ignore
+        if (delay := self.reserve() - monotonic()) > 0:
+            sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Acquires a token from the bucket without blocking the event loop"""
+        if (delay := self.reserve() - monotonic()) > 0:
+            await asyncio.sleep(delay)
 
     # --- Support for use in with statements
 
@@ -219,3 +187,11 @@ class RateLimiter(AbstractContextManager):
 
     def __exit__(self, *_args: Any) -> None:
         pass
+
+    # --- Support for use in async with statements
+
+    async def __aenter__(self) -> None:
+        await self.acquire_async()
+
+    async def __aexit__(self, *_args: Any) -> None:
+        pass
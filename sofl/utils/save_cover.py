@@ -18,14 +18,115 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
+import logging
+import os
+from hashlib import blake2b
 from pathlib import Path
 from shutil import copyfile
-from typing import Optional
+from threading import get_ident
+from time import time
+from typing import Any, Optional
 
 from gi.repository import Gdk, GdkPixbuf, Gio, GLib
 from PIL import Image, ImageSequence, UnidentifiedImageError
 
 from sofl import shared
+from sofl.utils.cover_backdrop import queue_backdrop
+
+# Bounds of the converted covers cache, the least recently used are removed first
+COVER_CACHE_MAX_SIZE = 256 * 1024 * 1024
+COVER_CACHE_MAX_AGE = 90 * 24 * 60 * 60
+# Age after which a temporary file left in the cache is considered abandoned
+COVER_CACHE_TMP_MAX_AGE = 60 * 60
+
+
+def cover_cache_key(
+    *params: Any, path: Optional[Path] = None, data: Optional[bytes] = None
+) -> str:
+    """
+    Hash the source of a cover with its transform
+
+    Source files are identified by their path, modification time and size.
+    Temporary files (eg. downloads) get a new path every time,
+    so they and raw data are identified by their content.
+    """
+    digest = blake2b(digest_size=16)
+    params += (shared.image_size, shared.schema.get_boolean("high-quality-images"))
+    digest.update(repr(params).encode("utf-8"))
+    if path and Path(path).is_relative_to(GLib.get_tmp_dir()):
+        with open(path, "rb") as file:
+            while chunk := file.read(1 << 16):
+                digest.update(chunk)
+    elif path:
+        stat = os.stat(path)
+        digest.update(repr((str(path), stat.st_mtime_ns, stat.st_size)).encode("utf-8"))
+    if data:
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def get_cached_cover(key: str) -> Optional[Path]:
+    for suffix in (".tiff", ".gif"):
+        path = shared.cover_cache_dir / f"{key}{suffix}"
+        try:
+            # Mark the cover as recently used
+            os.utime(path)
+        except OSError:
+            continue
+        return path
+    return None
+
+
+def prune_cover_cache(
+    max_size: int = COVER_CACHE_MAX_SIZE, max_age: float = COVER_CACHE_MAX_AGE
+) -> None:
+    """Remove the least recently used cached covers beyond the size or age bounds"""
+    entries = []
+    try:
+        for path in shared.cover_cache_dir.iterdir():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return
+
+    # The covers of the games are hard links, they stay when evicted from the cache
+    now = time()
+    total_size = 0
+    n_removed = 0
+    for mtime, size, path in sorted(entries, reverse=True):
+        if path.name.startswith("."):
+            if now - mtime < COVER_CACHE_TMP_MAX_AGE:
+                continue
+        else:
+            total_size += size
+            if total_size <= max_size and now - mtime <= max_age:
+                continue
+        path.unlink(missing_ok=True)
+        n_removed += 1
+
+    logging.debug("Removed %d covers from the cache", n_removed)
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hard link a file, so that identical covers are stored once, or copy it"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        copyfile(source, destination)
+
+
+def cache_cover(key: str, path: Path) -> Path:
+    """Store a converted cover in the cache under the given key"""
+    shared.cover_cache_dir.mkdir(parents=True, exist_ok=True)
+    cached_path = shared.cover_cache_dir / f"{key}{path.suffix}"
+    # Write under a temporary name so that concurrent writers never see a partial file
+    tmp_path = cached_path.with_name(f".{cached_path.name}.{get_ident()}")
+    link_or_copy(path, tmp_path)
+    tmp_path.replace(cached_path)
+    return cached_path
 
 
 def convert_cover(
@@ -35,6 +136,8 @@ def convert_cover(
 ) -> Optional[Path]:
     if not cover_path and not pixbuf:
         return None
+    if cover_path:
+        cover_path = Path(cover_path)
 
     pixbuf_extensions = set()
     for pixbuf_format in GdkPixbuf.Pixbuf.get_formats():
@@ -44,6 +147,26 @@ def convert_cover(
     if not resize and cover_path and cover_path.suffix.lower()[1:] in pixbuf_extensions:
         return cover_path
 
+    # Skip all the decoding and encoding if the same source was already converted
+    key = None
+    if resize:
+        if pixbuf:
+            key = cover_cache_key(
+                "pixbuf",
+                pixbuf.get_width(),
+                pixbuf.get_height(),
+                pixbuf.get_rowstride(),
+                pixbuf.get_has_alpha(),
+                data=pixbuf.read_pixel_bytes().get_data(),
+            )
+        else:
+            try:
+                key = cover_cache_key("file", path=cover_path)
+            except OSError:
+                return None
+        if cached_path := get_cached_cover(key):
+            return cached_path
+
     if pixbuf:
         cover_path = Path(Gio.File.new_tmp("XXXXXX.tiff")[0].get_path())
         pixbuf.savev(str(cover_path), "tiff", ["compression"], ["1"])
@@ -81,11 +204,14 @@ def convert_cover(
             Gdk.Texture.new_from_filename(str(cover_path)).save_to_tiff(
                 tmp_path := Gio.File.new_tmp("XXXXXX.tiff")[0].get_path()
             )
-            return convert_cover(tmp_path)
+            converted_path = convert_cover(Path(tmp_path))
         except GLib.Error:
             return None
+        if key and converted_path:
+            return cache_cover(key, converted_path)
+        return converted_path
 
-    return tmp_path
+    return cache_cover(key, tmp_path) if key else tmp_path
 
 
 def save_cover(game_id: str, cover_path: Path) -> None:
@@ -94,19 +220,30 @@ def save_cover(game_id: str, cover_path: Path) -> None:
     animated_path = shared.covers_dir / f"{game_id}.gif"
     static_path = shared.covers_dir / f"{game_id}.tiff"
 
-    # Remove previous covers
-    animated_path.unlink(missing_ok=True)
-    static_path.unlink(missing_ok=True)
+    # Remove previous covers, their backdrops may be shared and are pruned later
+    for path in (animated_path, static_path):
+        path.unlink(missing_ok=True)
 
     if not cover_path:
         return
 
-    copyfile(
-        cover_path,
-        animated_path if cover_path.suffix == ".gif" else static_path,
+    new_path = animated_path if cover_path.suffix == ".gif" else static_path
+    link_or_copy(cover_path, new_path)
+    queue_backdrop(new_path)
+
+    if game_id not in shared.win.game_covers:
+        return
+
+    # May run in a worker thread, decode here and only hand the texture to the UI
+    texture = (
+        None
+        if new_path == animated_path
+        else Gdk.Texture.new_from_filename(str(new_path))
     )
 
-    if game_id in shared.win.game_covers:
-        shared.win.game_covers[game_id].new_cover(
-            animated_path if cover_path.suffix == ".gif" else static_path
-        )
+    def update_cover() -> bool:
+        if game_cover := shared.win.game_covers.get(game_id):
+            game_cover.new_cover(new_path, texture)
+        return GLib.SOURCE_REMOVE
+
+    GLib.idle_add(update_cover)
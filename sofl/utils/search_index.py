@@ -0,0 +1,248 @@
+# search_index.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Collection, Iterator, NamedTuple, Optional
+
+WORD_RE = re.compile(r"\w+")
+
+# Ranks of a query word match, lower is better
+RANK_NAME_START = 0
+RANK_NAME_WORD = 1
+RANK_NAME = 2
+RANK_DEVELOPER = 3
+RANK_TYPO = 4
+
+
+def normalize(text: str) -> str:
+    """Lowercase and accent-fold a text, keeping its words separated by spaces"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(WORD_RE.findall(folded))
+
+
+def iter_trigrams(word: str) -> Iterator[str]:
+    for index in range(len(word) - 2):
+        yield word[index : index + 3]
+
+
+def get_typo_budget(word: str) -> int:
+    """Number of typos tolerated in a query word, short words must be exact"""
+    if len(word) < 5:
+        return 0
+    if len(word) < 9:
+        return 1
+    return 2
+
+
+def is_refinement(previous: str, query: str) -> bool:
+    """
+    Check that the matches of a normalized query are a subset of the previous one's,
+    so only the previous matches have to be checked again
+    """
+    if not query.startswith(previous):
+        return False
+    # Words that got longer must not have been allowed more typos
+    return all(
+        get_typo_budget(previous_word) == get_typo_budget(word)
+        for previous_word, word in zip(previous.split(), query.split())
+    )
+
+
+def get_prefix_distance(query: str, word: str, budget: int) -> int:
+    """
+    Edit distance between a query word and the closest prefix of a word.
+    Transpositions count as one edit, gives up with `budget + 1` when over budget.
+    """
+    word = word[: len(query) + budget]
+    before_previous: Optional[list[int]] = None
+    previous = list(range(len(word) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        for j, word_char in enumerate(word, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (query_char != word_char),
+            )
+            if (
+                before_previous is not None
+                and j > 1
+                and query_char == word[j - 2]
+                and query[i - 2] == word_char
+            ):
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        if min(current) > budget:
+            return budget + 1
+        before_previous, previous = previous, current
+    return min(previous)
+
+
+class IndexEntry(NamedTuple):
+    name: str
+    developer: str
+    words: tuple[str, ...]
+
+
+class SearchIndex:
+    """
+    Index of the games' names and developers, built as games are added or updated.
+
+    * Texts are normalized once, queries don't lowercase every game again
+    * A trigram index restricts the games a query word is checked against,
+    words too short for it to be reliable with typos use an index of the initials
+    * Query words longer than 4 characters tolerate typos after their first letter,
+    the games are ranked by how well they match
+    """
+
+    entries: dict[str, IndexEntry]
+    trigrams: dict[str, set[str]]
+    initials: dict[str, set[str]]
+
+    def __init__(self) -> None:
+        self.entries = {}
+        self.trigrams = {}
+        self.initials = {}
+
+    def add(self, game_id: str, name: str, developer: Optional[str]) -> bool:
+        """Index a game, or update it. Returns False if it was already up to date."""
+        name = normalize(name)
+        developer = normalize(developer or "")
+        if (entry := self.entries.get(game_id)) is not None:
+            if entry.name == name and entry.developer == developer:
+                return False
+            self.remove(game_id)
+
+        words = tuple(dict.fromkeys((*name.split(), *developer.split())))
+        self.entries[game_id] = IndexEntry(name, developer, words)
+        for word in words:
+            self.initials.setdefault(word[0], set()).add(game_id)
+            for trigram in iter_trigrams(word):
+                self.trigrams.setdefault(trigram, set()).add(game_id)
+        return True
+
+    def remove(self, game_id: str) -> None:
+        if (entry := self.entries.pop(game_id, None)) is None:
+            return
+        for word in entry.words:
+            if (game_ids := self.initials.get(word[0])) is not None:
+                game_ids.discard(game_id)
+                if not game_ids:
+                    del self.initials[word[0]]
+            for trigram in iter_trigrams(word):
+                if (game_ids := self.trigrams.get(trigram)) is None:
+                    continue
+                game_ids.discard(game_id)
+                if not game_ids:
+                    del self.trigrams[trigram]
+
+    def search(
+        self, query: str, candidates: Optional[Collection[str]] = None
+    ) -> dict[str, int]:
+        """
+        Get the ranks of the games matching every word of a normalized query
+
+        :param candidates: Only check these games, eg. the matches of a previous query
+        """
+        results: Optional[dict[str, int]] = None
+        for query_word in query.split():
+            ranks = self.rank_word(query_word, candidates)
+            if results is not None:
+                ranks = {
+                    game_id: results[game_id] + rank
+                    for game_id, rank in ranks.items()
+                    if game_id in results
+                }
+            results = candidates = ranks
+            if not results:
+                break
+        return results or {}
+
+    def rank(self, game_id: str, query: str) -> Optional[int]:
+        """Get the rank of a single game for a normalized query, None if not matching"""
+        return self.search(query, {game_id}).get(game_id)
+
+    def rank_word(
+        self, query_word: str, candidates: Optional[Collection[str]]
+    ) -> dict[str, int]:
+        ranks = {}
+
+        # Exact matches contain every trigram of the query word
+        if len(query_word) >= 3:
+            postings = sorted(
+                (
+                    self.trigrams.get(trigram, set())
+                    for trigram in iter_trigrams(query_word)
+                ),
+                key=len,
+            )
+            exact_candidates = set.intersection(*postings)
+            if candidates is not None:
+                exact_candidates.intersection_update(candidates)
+        else:
+            exact_candidates = self.entries.keys() if candidates is None else candidates
+
+        for game_id in exact_candidates:
+            entry = self.entries[game_id]
+            if entry.name.startswith(query_word):
+                ranks[game_id] = RANK_NAME_START
+            elif f" {query_word}" in entry.name:
+                ranks[game_id] = RANK_NAME_WORD
+            elif query_word in entry.name:
+                ranks[game_id] = RANK_NAME
+            elif query_word in entry.developer:
+                ranks[game_id] = RANK_DEVELOPER
+
+        if not (budget := get_typo_budget(query_word)):
+            return ranks
+
+        # Words with typos still share some trigrams with the query word,
+        # an edit changes up to 4 of them
+        threshold = len(query_word) - 2 - 4 * budget
+        if threshold > 0:
+            counts = Counter()
+            for trigram in iter_trigrams(query_word):
+                counts.update(self.trigrams.get(trigram, ()))
+            typo_candidates = {
+                game_id for game_id, count in counts.items() if count >= threshold
+            }
+        else:
+            # Short words may share none, typos are only allowed after the initial
+            typo_candidates = self.initials.get(query_word[0], set())
+        if candidates is not None:
+            typo_candidates = typo_candidates.intersection(candidates)
+
+        for game_id in typo_candidates:
+            if game_id in ranks:
+                continue
+            distance = min(
+                (
+                    get_prefix_distance(query_word, word, budget)
+                    for word in self.entries[game_id].words
+                    if word[0] == query_word[0]
+                ),
+                default=budget + 1,
+            )
+            if distance <= budget:
+                ranks[game_id] = RANK_TYPO + distance
+
+        return ranks
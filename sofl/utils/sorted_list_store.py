@@ -0,0 +1,133 @@
+# sorted_list_store.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable
+
+from gi.repository import Gio, GObject
+
+
+class SortedListStore:
+    """
+    `Gio.ListStore` kept sorted by a key function.
+
+    * Keys are computed once per item, when it is added or updated
+    * Adding, updating or removing an item is a binary search and a single splice,
+    the views only see that item move
+    * The whole store is only sorted again when the key function changes
+    """
+
+    store: Gio.ListStore
+    key_func: Callable[[Any], Any]
+    reverse: bool
+
+    # Ascending keys and their items, the store is in reverse order if reversed
+    keys: list[Any]
+    items: list[GObject.Object]
+    item_keys: dict[GObject.Object, Any]
+
+    def __init__(
+        self,
+        item_type: type[GObject.Object],
+        key_func: Callable[[Any], Any],
+        reverse: bool = False,
+    ) -> None:
+        self.store = Gio.ListStore.new(item_type)
+        self.key_func = key_func
+        self.reverse = reverse
+        self.keys = []
+        self.items = []
+        self.item_keys = {}
+
+    def __contains__(self, item: GObject.Object) -> bool:
+        return item in self.item_keys
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def to_position(self, index: int) -> int:
+        """Get the store position of an index in the ascending lists"""
+        return len(self.items) - 1 - index if self.reverse else index
+
+    def find_index(self, item: GObject.Object) -> int:
+        key = self.item_keys[item]
+        index = bisect_left(self.keys, key)
+        # Items may share a key
+        while self.items[index] is not item:
+            index += 1
+        return index
+
+    def add(self, item: GObject.Object) -> None:
+        """Add an item, or move it to its new position if its key changed"""
+        key = self.key_func(item)
+        if item in self.item_keys:
+            if self.item_keys[item] == key:
+                # Let the models on top of the store re-evaluate the item
+                position = self.to_position(self.find_index(item))
+                self.store.splice(position, 1, (item,))
+                return
+            self.remove(item)
+
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.items.insert(index, item)
+        self.item_keys[item] = key
+        self.store.insert(self.to_position(index), item)
+
+    def add_many(self, items: Iterable[GObject.Object]) -> None:
+        """Add several new items at once"""
+        items = [item for item in items if item not in self.item_keys]
+
+        # Inserting a few items is cheaper than making the views reload every item
+        if len(items) <= len(self.items):
+            for item in items:
+                self.add(item)
+            return
+
+        for item in items:
+            self.item_keys[item] = self.key_func(item)
+        self.items.extend(items)
+        self.sort()
+
+    def remove(self, item: GObject.Object) -> None:
+        if item not in self.item_keys:
+            return
+        index = self.find_index(item)
+        position = self.to_position(index)
+        del self.keys[index]
+        del self.items[index]
+        del self.item_keys[item]
+        self.store.remove(position)
+
+    def set_key_func(self, key_func: Callable[[Any], Any], reverse: bool) -> None:
+        """Change the sort order, sorting all the items again"""
+        self.key_func = key_func
+        self.reverse = reverse
+        self.item_keys = {item: key_func(item) for item in self.items}
+        self.sort()
+
+    def sort(self) -> None:
+        # Sorting the cached keys compares them natively, without callbacks
+        self.items.sort(key=self.item_keys.__getitem__)
+        self.keys = [self.item_keys[item] for item in self.items]
+        self.store.splice(
+            0,
+            self.store.get_n_items(),
+            self.items[::-1] if self.reverse else self.items,
+        )
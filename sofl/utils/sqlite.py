@@ -18,9 +18,12 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import logging
+import sqlite3
 from glob import escape
 from pathlib import Path
-from shutil import copyfile
+from shutil import copyfile, rmtree
+from typing import Any, Iterator
 
 from gi.repository import GLib
 
@@ -35,3 +38,72 @@ def copy_db(original_path: Path) -> Path:
         copy = tmp / file.name
         copyfile(str(file), str(copy))
     return tmp / original_path.name
+
+
+def has_pending_wal(path: Path) -> bool:
+    """Check if a database has changes not yet checkpointed into its main file"""
+    try:
+        return path.with_name(path.name + "-wal").stat().st_size > 0
+    except FileNotFoundError:
+        return False
+
+
+def connect_readonly(path: Path, immutable: bool = False) -> sqlite3.Connection:
+    """
+    Open a live sqlite database read-only.
+    Immutable databases are read without any locking, their WAL is ignored.
+    """
+    uri = path.absolute().as_uri() + "?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return sqlite3.connect(uri, uri=True, timeout=0.5, check_same_thread=False)
+
+
+def query_db(
+    path: Path, request: str, params: Any = (), batch_size: int = 500
+) -> Iterator[tuple]:
+    """
+    Stream the rows of a query on a live sqlite database, without copying it.
+
+    * The database is opened read-only, in place
+    * If that isn't possible (eg. no write access to create its shared memory
+    file) and it has no pending WAL, it's opened as immutable
+    * It's only copied if it's locked by its owner, or can't be opened at all
+    * The connection and the copy are cleaned up even if the rows aren't consumed
+    """
+    connection = None
+    copy_path = None
+    try:
+        strategies = ["readonly", "immutable", "copy"]
+        while True:
+            strategy = strategies.pop(0)
+            try:
+                if strategy == "copy":
+                    copy_path = copy_db(path)
+                    connection = sqlite3.connect(copy_path, check_same_thread=False)
+                else:
+                    connection = connect_readonly(path, strategy == "immutable")
+                cursor = connection.execute(request, params)
+                rows = cursor.fetchmany(batch_size)
+                break
+            except sqlite3.OperationalError as error:
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                if strategy == "copy":
+                    raise
+                logging.debug("Couldn't query %s (%s): %s", path, strategy, error)
+                # Reading without locks a database being written or with
+                # changes in its WAL could return inconsistent data
+                if "locked" in str(error) or has_pending_wal(path):
+                    strategies = ["copy"]
+
+        logging.debug("Querying %s (%s)", path, strategy)
+        while rows:
+            yield from rows
+            rows = cursor.fetchmany(batch_size)
+    finally:
+        if connection is not None:
+            connection.close()
+        if copy_path is not None:
+            rmtree(copy_path.parent, ignore_errors=True)
@@ -22,12 +22,22 @@ import json
 import logging
 import re
 from pathlib import Path
-from typing import TypedDict
-
-import requests
+from typing import (
+    Any,
+    Collection,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    TypedDict,
+)
+
+from gi.repository import GLib
 from requests.exceptions import HTTPError
 
 from sofl import shared
+from sofl.utils.http import HTTPClient
+from sofl.utils.metadata_cache import MetadataCache, get_metadata_cache
 from sofl.utils.rate_limiter import RateLimiter
 
 
@@ -72,6 +82,10 @@ class SteamRateLimiter(RateLimiter):
     refill_period_tokens = 200
     burst_tokens = 100
 
+    # Delay before saving the pick history after a token was picked
+    save_delay_seconds = 5
+    save_scheduled: bool = False
+
     def _init_pick_history(self) -> None:
         """
         Load the pick history from schema.
@@ -80,32 +94,167 @@ class SteamRateLimiter(RateLimiter):
         """
         super()._init_pick_history()
         timestamps_str = shared.state_schema.get_string("steam-limiter-tokens-history")
-        self.pick_history.add(*json.loads(timestamps_str))
+        self.pick_history.add_wall_clock(*json.loads(timestamps_str))
         self.pick_history.remove_old_entries()
 
-    def acquire(self) -> None:
-        """Get a token from the bucket and store the pick history in the schema"""
-        super().acquire()
-        timestamps_str = json.dumps(self.pick_history.copy_timestamps())
-        shared.state_schema.set_string("steam-limiter-tokens-history", timestamps_str)
+    def on_reserved(self) -> None:
+        """Schedule saving the pick history, at most once per save delay"""
+        if not self.save_scheduled:
+            self.save_scheduled = True
+            GLib.timeout_add_seconds(self.save_delay_seconds, self.save_pick_history)
+
+    def save_pick_history(self) -> bool:
+        """Store the pick history in the schema"""
+        with self.lock:
+            self.save_scheduled = False
+            timestamps = self.pick_history.copy_wall_clock_timestamps()
+        shared.state_schema.set_string(
+            "steam-limiter-tokens-history", json.dumps(timestamps)
+        )
+        return GLib.SOURCE_REMOVE
+
+
+# KeyValues (VDF, ACF) tokens, strings are yielded as is
+BLOCK_START = object()
+BLOCK_END = object()
+
+KEYVALUES_TOKEN_RE = re.compile(
+    r'("[^"\\]*(?:\\.[^"\\]*)*")'  # Quoted string
+    r"|([{}])"  # Block delimiter
+    r"|//[^\n]*|\[[^\]\n]*\]"  # Comment or conditional, ignored
+    r'|([^\s"{}]+)'  # Unquoted string
+    r'|("[\s\S]*)'  # Unterminated quoted string, continued on the next line
+)
+KEYVALUES_BARE_RE = re.compile(r"[{}]|\[[^\]\n]*\]|[^\s{}\[]+")
+KEYVALUES_ESCAPE_RE = re.compile(r"\\(.)")
+KEYVALUES_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+
+def tokenize_keyvalues_text(text: str) -> Generator[Any, None, str]:
+    """
+    Tokenize KeyValues text with escapes or comments.
+    Returns the text of an unterminated quoted string.
+    """
+    for quoted, block, unquoted, unterminated in KEYVALUES_TOKEN_RE.findall(text):
+        if quoted:
+            quoted = quoted[1:-1]
+            if "\\" in quoted:
+                quoted = KEYVALUES_ESCAPE_RE.sub(
+                    lambda escape: KEYVALUES_ESCAPES.get(escape[1], escape[1]),
+                    quoted,
+                )
+            yield quoted
+        elif block:
+            yield BLOCK_START if block == "{" else BLOCK_END
+        elif unquoted:
+            yield unquoted
+        elif unterminated:
+            return unterminated
+    return ""
+
+
+def tokenize_keyvalues(lines: Iterable[str]) -> Iterator[Any]:
+    """
+    Lazily split KeyValues text into tokens, line by line.
+    Yields the strings (unescaped), `BLOCK_START` and `BLOCK_END`.
+    """
+    rest = ""
+    for line in lines:
+        if rest:
+            line = rest + line
+            rest = ""
+
+        # Plain lines are split on the quotes, the others need the full regex
+        if "\\" in line or "//" in line:
+            rest = yield from tokenize_keyvalues_text(line)
+            continue
+        parts = line.split('"')
+        if not len(parts) % 2:
+            # Unterminated quoted string, continued on the next line
+            rest = line
+            continue
+        is_quoted = False
+        for part in parts:
+            if is_quoted:
+                yield part
+            elif part and not part.isspace():
+                for word in KEYVALUES_BARE_RE.findall(part):
+                    if word == "{":
+                        yield BLOCK_START
+                    elif word == "}":
+                        yield BLOCK_END
+                    elif word[0] != "[":
+                        yield word
+            is_quoted = not is_quoted
+
+
+def parse_keyvalues(tokens: Iterable[Any]) -> dict[str, Any]:
+    """Build the nested dicts of a KeyValues document from its tokens"""
+    root: dict[str, Any] = {}
+    stack = [root]
+    key = None
+    for token in tokens:
+        if token is BLOCK_END:
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif token is BLOCK_START:
+            if key is None:
+                raise ValueError("KeyValues block without a key")
+            stack[-1][key] = block = {}
+            stack.append(block)
+            key = None
+        elif key is None:
+            key = token
+        else:
+            stack[-1][key] = token
+            key = None
+    return root
+
+
+def find_keyvalues(
+    tokens: Iterable[Any], keys: Collection[str], depth: int = 1
+) -> dict[str, str]:
+    """
+    Find the string values of case insensitive keys, at a block depth.
+    Stops consuming the tokens once every key is found.
+    """
+    found: dict[str, str] = {}
+    level = 0
+    key = None
+    for token in tokens:
+        if token is BLOCK_START:
+            level += 1
+            key = None
+        elif token is BLOCK_END:
+            level -= 1
+            key = None
+        elif key is None:
+            key = token
+        else:
+            if level == depth and (lower_key := key.lower()) in keys:
+                found.setdefault(lower_key, token)
+                if len(found) == len(keys):
+                    break
+            key = None
+    return found
 
 
 class SteamFileHelper:
     """Helper for Steam file formats"""
 
     def get_manifest_data(self, manifest_path: Path) -> SteamManifestData:
-        """Get local data for a game from its manifest"""
+        """
+        Get local data for a game from its manifest.
+        Only the beginning of the manifest is read, until the data is found.
+        """
 
+        keys = SteamManifestData.__required_keys__  # pylint: disable=no-member
         with open(manifest_path, "r", encoding="utf-8") as file:
-            contents = file.read()
+            data = find_keyvalues(tokenize_keyvalues(file), keys)
 
-        data = {}
-
-        for key in SteamManifestData.__required_keys__:  # pylint: disable=no-member
-            regex = f'"{key}"\\s+"(.*)"\n'
-            if (match := re.search(regex, contents, re.IGNORECASE)) is None:
-                raise SteamInvalidManifestError()
-            data[key] = match.group(1)
+        if len(data) != len(keys):
+            raise SteamInvalidManifestError()
 
         return SteamManifestData(
             name=data["name"],
@@ -113,29 +262,100 @@ class SteamFileHelper:
             stateflags=data["stateflags"],
         )
 
+    def get_library_folders(self, lines: Iterable[str]) -> list[dict[str, Any]]:
+        """
+        Get the library folders from the lines of a libraryfolders.vdf file.
+        Every folder has a "path" and an "apps" dict of installed appids.
+        """
+        document = parse_keyvalues(tokenize_keyvalues(lines))
+        folders = next(
+            (
+                value
+                for key, value in document.items()
+                if key.lower() == "libraryfolders" and isinstance(value, dict)
+            ),
+            {},
+        )
+        return [
+            folder
+            for folder in folders.values()
+            if isinstance(folder, dict) and "path" in folder
+        ]
+
 
 class SteamAPIHelper:
     """Helper around the Steam API"""
 
     base_url = "https://store.steampowered.com/api"
     rate_limiter: RateLimiter
-
-    def __init__(self, rate_limiter: RateLimiter) -> None:
+    http_client: HTTPClient
+    cache: MetadataCache
+
+    # Developers don't change, unknown appids may become games later
+    cache_ttl = 90 * 24 * 60 * 60
+    negative_cache_ttl = 7 * 24 * 60 * 60
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        http_client: Optional[HTTPClient] = None,
+        cache: Optional[MetadataCache] = None,
+    ) -> None:
         self.rate_limiter = rate_limiter
+        self.http_client = http_client or shared.http_client
+        self.cache = cache or get_metadata_cache(
+            shared.metadata_cache_db, "steam_appdetails"
+        )
 
-    def get_api_data(self, appid: str) -> SteamAPIData:
+    def get_api_data(self, appid: str, refresh: bool = False) -> SteamAPIData:
         """
         Get online data for a game from its appid.
         May block to satisfy the Steam web API limitations.
 
+        Results (including not found and not a game) are cached on disk,
+        pass `refresh` to ignore the cached value.
+
         See https://wiki.teamfortress.com/wiki/User:RJackson/StorefrontAPI#appdetails
         """
 
+        if not refresh:
+            cached = self.cache.get(appid)
+            if cached is not MetadataCache.MISSING:
+                return self.get_cached_data(appid, cached)
+
+        return self.fetch_api_data(appid)
+
+    def fetch_api_data(self, appid: str) -> SteamAPIData:
+        """Get the data for an appid from the API and cache it"""
+        try:
+            values = self.get_online_data(appid)
+        except SteamGameNotFoundError:
+            self.cache.set(appid, {"error": "not_found"}, self.negative_cache_ttl)
+            raise
+        except SteamNotAGameError:
+            self.cache.set(appid, {"error": "not_a_game"}, self.negative_cache_ttl)
+            raise
+        self.cache.set(appid, values, self.cache_ttl)
+        return values
+
+    def get_cached_data(self, appid: str, cached: dict) -> SteamAPIData:
+        match cached.get("error"):
+            case "not_found":
+                logging.debug("Appid %s not found (cached)", appid)
+                raise SteamGameNotFoundError()
+            case "not_a_game":
+                logging.debug("Appid %s is not a game (cached)", appid)
+                raise SteamNotAGameError()
+        return SteamAPIData(developer=cached["developer"])
+
+    def get_online_data(self, appid: str) -> SteamAPIData:
+        """Get the data for an appid from the API"""
+
         # Get data from the API (way block to satisfy its limits)
         with self.rate_limiter:
             try:
-                with requests.get(
-                    f"{self.base_url}/appdetails?appids={appid}", timeout=5
+                with self.http_client.get(
+                    f"{self.base_url}/appdetails?appids={appid}"
                 ) as response:
                     response.raise_for_status()
                     data = response.json()[appid]
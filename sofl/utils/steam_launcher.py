@@ -21,12 +21,11 @@ import os
 import subprocess
 import logging
 import shlex
-import vdf
-from io import StringIO
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from sofl import shared
+from sofl.utils.steam import SteamFileHelper
 
 
 class SteamLauncher:
@@ -97,7 +96,7 @@ class SteamLauncher:
         )
 
         try:
-            library_data = None
+            library_folders = []
             if in_flatpak:
                 try:
                     result = subprocess.run(
@@ -106,27 +105,25 @@ class SteamLauncher:
                         text=True,
                     )
                     if result.returncode == 0:
-                        try:
-                            library_data = vdf.loads(result.stdout)
-                        except Exception:
-                            library_data = vdf.load(StringIO(result.stdout))
+                        library_folders = SteamFileHelper().get_library_folders(
+                            result.stdout.splitlines(keepends=True)
+                        )
                 except Exception as e:
                     logging.debug(f"[SOFL] Could not read host libraryfolders.vdf: {e}")
             else:
                 if os.path.exists(library_folders_path):
-                    with open(library_folders_path, "r") as f:
-                        library_data = vdf.load(f)
+                    with open(library_folders_path, "r", encoding="utf-8") as f:
+                        library_folders = SteamFileHelper().get_library_folders(f)
 
             # Look for SteamLinuxRuntime_sniper
-            if library_data and "libraryfolders" in library_data:
-                for folder_data in library_data["libraryfolders"].values():
-                    if "apps" in folder_data and "1628350" in folder_data["apps"]:
-                        runtime_path = os.path.join(
-                            folder_data["path"],
-                            "steamapps/common/SteamLinuxRuntime_sniper/run",
-                        )
-                        if SteamLauncher._check_file_exists(runtime_path, in_flatpak):
-                            return runtime_path
+            for folder_data in library_folders:
+                if "1628350" in folder_data.get("apps", {}):
+                    runtime_path = os.path.join(
+                        folder_data["path"],
+                        "steamapps/common/SteamLinuxRuntime_sniper/run",
+                    )
+                    if SteamLauncher._check_file_exists(runtime_path, in_flatpak):
+                        return runtime_path
         except Exception as e:
             logging.error(f"[SOFL] Error finding Steam Runtime: {str(e)}")
 
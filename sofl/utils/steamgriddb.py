@@ -20,15 +20,22 @@
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-import requests
 from gi.repository import Gio
 from requests.exceptions import HTTPError
 
 from sofl import shared
-from sofl.game import Game
-from sofl.utils.save_cover import convert_cover, save_cover
+from sofl.game_data import GameData
+from sofl.utils.http import HTTPClient
+from sofl.utils.metadata_cache import MetadataCache, get_metadata_cache
+from sofl.utils.save_cover import (
+    cache_cover,
+    convert_cover,
+    cover_cache_key,
+    get_cached_cover,
+    save_cover,
+)
 
 
 class SgdbError(Exception):
@@ -55,6 +62,30 @@ class SgdbHelper:
     """Helper class to make queries to SteamGridDB"""
 
     base_url = "https://www.steamgriddb.com/api/v2/"
+    dimensions = "600x900"
+    http_client: HTTPClient
+    cache: MetadataCache
+
+    cache_ttl = 30 * 24 * 60 * 60
+    negative_cache_ttl = 3 * 24 * 60 * 60
+
+    def __init__(
+        self,
+        http_client: Optional[HTTPClient] = None,
+        cache: Optional[MetadataCache] = None,
+    ) -> None:
+        self.http_client = http_client or shared.http_client
+        self.cache = cache or get_metadata_cache(shared.metadata_cache_db, "sgdb")
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        return " ".join(name.casefold().split())
+
+    def get_cached(self, key: str, error: type[SgdbError]) -> Any:
+        """Get a cached resolution, raise `error` if it was cached as not found"""
+        if (value := self.cache.get(key)) is None:
+            raise error()
+        return value
 
     @property
     def auth_headers(self) -> dict[str, str]:
@@ -62,41 +93,90 @@ class SgdbHelper:
         headers = {"Authorization": f"Bearer {key}"}
         return headers
 
-    def get_game_id(self, game: Game) -> Any:
-        """Get grid results for a game. Can raise an exception."""
+    def get_game_id(self, game: GameData, refresh: bool = False) -> Any:
+        """
+        Get grid results for a game. Can raise an exception.
+
+        Pass `refresh` to ignore the cached value and overwrite it.
+        """
+        key = f"id:{self.normalize_name(game.name)}"
+        if (
+            not refresh
+            and (sgdb_id := self.get_cached(key, SgdbGameNotFound))
+            is not MetadataCache.MISSING
+        ):
+            return sgdb_id
+
         uri = f"{self.base_url}search/autocomplete/{game.name}"
-        res = requests.get(uri, headers=self.auth_headers, timeout=5)
+        res = self.http_client.get(uri, headers=self.auth_headers)
         match res.status_code:
             case 200:
-                return res.json()["data"][0]["id"]
+                if not (data := res.json()["data"]):
+                    self.cache.set(key, None, self.negative_cache_ttl)
+                    raise SgdbGameNotFound(res.status_code)
+                self.cache.set(key, data[0]["id"], self.cache_ttl)
+                return data[0]["id"]
             case 401:
                 raise SgdbAuthError(res.json()["errors"][0])
             case 404:
+                self.cache.set(key, None, self.negative_cache_ttl)
                 raise SgdbGameNotFound(res.status_code)
             case _:
                 res.raise_for_status()
 
-    def get_image_uri(self, game_id: str, animated: bool = False) -> Any:
+    def get_image_uri(
+        self, game_id: str, animated: bool = False, refresh: bool = False
+    ) -> Any:
         """Get the image for a SGDB game id"""
-        uri = f"{self.base_url}grids/game/{game_id}?dimensions=600x900"
+        key = f"uri:{game_id}:{self.dimensions}:{animated}"
+        if (
+            not refresh
+            and (image_uri := self.get_cached(key, SgdbNoImageFound))
+            is not MetadataCache.MISSING
+        ):
+            return image_uri
+
+        uri = f"{self.base_url}grids/game/{game_id}?dimensions={self.dimensions}"
         if animated:
             uri += "&types=animated"
-        res = requests.get(uri, headers=self.auth_headers, timeout=5)
+        res = self.http_client.get(uri, headers=self.auth_headers)
         match res.status_code:
             case 200:
                 data = res.json()["data"]
                 if len(data) == 0:
+                    self.cache.set(key, None, self.negative_cache_ttl)
                     raise SgdbNoImageFound()
+                self.cache.set(key, data[0]["url"], self.cache_ttl)
                 return data[0]["url"]
             case 401:
                 raise SgdbAuthError(res.json()["errors"][0])
             case 404:
+                self.cache.set(key, None, self.negative_cache_ttl)
                 raise SgdbGameNotFound(res.status_code)
             case _:
                 res.raise_for_status()
 
-    def conditionaly_update_cover(self, game: Game) -> None:
-        """Update the game's cover if appropriate"""
+    def get_cover(self, uri: str) -> Optional[Path]:
+        """Get a converted cover for an image URI, only downloading unknown ones"""
+        key = cover_cache_key("sgdb", uri)
+        if cover_path := get_cached_cover(key):
+            return cover_path
+
+        response = self.http_client.get(uri)
+        response.raise_for_status()
+        tmp_file = Gio.File.new_tmp()[0]
+        tmp_file_path = tmp_file.get_path()
+        Path(tmp_file_path).write_bytes(response.content)
+        if not (cover_path := convert_cover(tmp_file_path)):
+            return None
+        return cache_cover(key, cover_path)
+
+    def conditionaly_update_cover(self, game: GameData, refresh: bool = False) -> None:
+        """
+        Update the game's cover if appropriate
+
+        Pass `refresh` to look the game up again instead of using the cache.
+        """
 
         # Obvious skips
         use_sgdb = shared.schema.get_boolean("sgdb")
@@ -114,7 +194,7 @@ class SgdbHelper:
 
         # Get ID for the game
         try:
-            sgdb_id = self.get_game_id(game)
+            sgdb_id = self.get_game_id(game, refresh)
         except (HTTPError, SgdbError) as error:
             logging.warning(
                 "%s while getting SGDB ID for %s", type(error).__name__, game.name
@@ -129,12 +209,8 @@ class SgdbHelper:
         # Download covers
         for uri_kwargs in image_uri_kwargs_sets:
             try:
-                uri = self.get_image_uri(sgdb_id, **uri_kwargs)
-                response = requests.get(uri, timeout=5)
-                tmp_file = Gio.File.new_tmp()[0]
-                tmp_file_path = tmp_file.get_path()
-                Path(tmp_file_path).write_bytes(response.content)
-                save_cover(game.game_id, convert_cover(tmp_file_path))
+                uri = self.get_image_uri(sgdb_id, refresh=refresh, **uri_kwargs)
+                save_cover(game.game_id, self.get_cover(uri))
             except SgdbAuthError as error:
                 # Let caller handle auth errors
                 raise error
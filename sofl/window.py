@@ -20,7 +20,7 @@
 # pyright: reportAssignmentType=none
 
 from sys import platform
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 import subprocess
 import os
 import signal
@@ -30,8 +30,22 @@ from time import time
 from sofl import shared
 from sofl.game import Game
 from sofl.game_cover import GameCover
+from sofl.game_data import GameData
 from sofl.utils.relative_date import relative_date
-from gi.repository import Adw, Gio, GLib, Gtk, Pango
+from sofl.utils.search_index import SearchIndex, is_refinement, normalize
+from sofl.utils.sorted_list_store import SortedListStore
+from gi.repository import Adw, Gio, GLib, GObject, Gtk, Pango
+
+# All games, Added and the Imported heading come before the source rows
+SIDEBAR_FIXED_ROWS = 3
+
+
+class SidebarSource(GObject.Object):
+    """Source listed in the sidebar, with its number of shown games"""
+
+    source_id = GObject.Property(type=str)
+    count = GObject.Property(type=int)
+    row: Optional[Gtk.ListBoxRow] = None
 
 
 @Gtk.Template(resource_path=shared.PREFIX + "/gtk/window.ui")
@@ -52,10 +66,11 @@ class SOFLWindow(Adw.ApplicationWindow):
     details_view: Gtk.Overlay = Gtk.Template.Child()
     library_page: Adw.NavigationPage = Gtk.Template.Child()
     library_view: Adw.ToolbarView = Gtk.Template.Child()
-    library: Gtk.FlowBox = Gtk.Template.Child()
+    library: Gtk.GridView = Gtk.Template.Child()
     scrolledwindow: Gtk.ScrolledWindow = Gtk.Template.Child()
     library_overlay: Gtk.Overlay = Gtk.Template.Child()
     notice_empty: Adw.StatusPage = Gtk.Template.Child()
+    notice_loading: Adw.StatusPage = Gtk.Template.Child()
     notice_no_results: Adw.StatusPage = Gtk.Template.Child()
     search_bar: Gtk.SearchBar = Gtk.Template.Child()
     search_entry: Gtk.SearchEntry = Gtk.Template.Child()
@@ -75,11 +90,12 @@ class SOFLWindow(Adw.ApplicationWindow):
 
     hidden_library_page: Adw.NavigationPage = Gtk.Template.Child()
     hidden_primary_menu_button: Gtk.MenuButton = Gtk.Template.Child()
-    hidden_library: Gtk.FlowBox = Gtk.Template.Child()
+    hidden_library: Gtk.GridView = Gtk.Template.Child()
     hidden_library_view: Adw.ToolbarView = Gtk.Template.Child()
     hidden_scrolledwindow: Gtk.ScrolledWindow = Gtk.Template.Child()
     hidden_library_overlay: Gtk.Overlay = Gtk.Template.Child()
     hidden_notice_empty: Adw.StatusPage = Gtk.Template.Child()
+    hidden_notice_loading: Adw.StatusPage = Gtk.Template.Child()
     hidden_notice_no_results: Adw.StatusPage = Gtk.Template.Child()
     hidden_search_bar: Gtk.SearchBar = Gtk.Template.Child()
     hidden_search_entry: Gtk.SearchEntry = Gtk.Template.Child()
@@ -93,7 +109,7 @@ class SOFLWindow(Adw.ApplicationWindow):
 
     game_covers: dict = {}
     toasts: dict = {}
-    active_game: Game
+    active_game: GameData
     details_view_game_cover: Optional[GameCover] = None
 
     running_processes: dict = {}  # {game_id: {"process": Popen, "game": Game}}
@@ -102,117 +118,129 @@ class SOFLWindow(Adw.ApplicationWindow):
     filter_state: str = "all"
     source_rows: dict = {}
 
-    def create_source_rows(self) -> None:
-        def get_removed(source_id: str) -> Any:
-            removed = tuple(
-                game.removed or game.hidden or game.blacklisted
-                for game in shared.store.source_games[source_id].values()
-            )
-            return (
-                (count,) if (count := sum(removed)) != len(removed) else False
-            )  # Return a tuple because 0 == False and 1 == True
-
-        total_games_no = 0
-        restored = False
+    # Sources with shown games, sorted by their number of games
+    sources_model: SortedListStore
+    sidebar_sources: dict[str, "SidebarSource"]
+
+    # All the games that can be displayed, kept in the sort order.
+    # The library views filter them, and rank them while searching.
+    games_model: SortedListStore
+    library_items: Gtk.FilterListModel
+    hidden_library_items: Gtk.FilterListModel
+    library_filter: Gtk.CustomFilter
+    hidden_library_filter: Gtk.CustomFilter
+    library_search_sorter: Gtk.CustomSorter
+    hidden_library_search_sorter: Gtk.CustomSorter
+    library_model: Gtk.SortListModel
+    hidden_library_model: Gtk.SortListModel
+    # Set while the games are being loaded from disk
+    library_loading: bool = False
+
+    # Normalized query and ranks of the matching games, for each library by hidden
+    search_index: SearchIndex
+    search_queries: dict[bool, str]
+    search_results: dict[bool, Optional[dict[str, int]]]
+
+    def update_source_rows(self) -> None:
+        """Update the sidebar rows of the sources whose shown games count changed"""
+        changed_counts, total = shared.store.take_changed_counts()
+        selected_row = self.sidebar.get_selected_row()
+
+        for source_id, count in changed_counts.items():
+            if source_id == "imported":
+                self.added_games_no_label.set_label(str(count))
+                self.added_row_box.get_parent().set_visible(bool(count))
+                continue
 
-        selected_id = (
-            self.source_rows[selected_row][0]
-            if (selected_row := self.sidebar.get_selected_row()) in self.source_rows
-            else None
+            if (source := self.sidebar_sources.get(source_id)) is None:
+                if count:
+                    source = SidebarSource(source_id=source_id, count=count)
+                    self.sidebar_sources[source_id] = source
+                    self.sources_model.add(source)
+            elif not count:
+                del self.sidebar_sources[source_id]
+                self.sources_model.remove(source)
+                self.source_rows.pop(source.row, None)
+            elif source.count != count:
+                # Moves the row if its rank changed
+                source.count = count
+                self.sources_model.add(source)
+
+        self.all_games_no_label.set_label(str(total))
+        self.sidebar.get_row_at_index(SIDEBAR_FIXED_ROWS - 1).set_visible(
+            bool(self.sidebar_sources)
         )
 
-        if selected_row == self.added_row_box.get_parent():
-            self.sidebar.select_row(self.added_row_box.get_parent())
-            restored = True
-
-        if added_missing := (
-            not shared.store.source_games.get("imported")
-            or not (removed := get_removed("imported"))
+        # The selection is lost when the selected row moves, or disappears
+        if selected_row and (
+            selected_row.get_parent() != self.sidebar or not selected_row.get_visible()
         ):
             self.sidebar.select_row(self.all_games_row_box.get_parent())
-        else:
-            games_no = len(shared.store.source_games["imported"]) - removed[0]
-            self.added_games_no_label.set_label(str(games_no))
-            total_games_no += games_no
-        self.added_row_box.get_parent().set_visible(not added_missing)
+        elif selected_row and not self.sidebar.get_selected_row():
+            self.sidebar.select_row(selected_row)
 
-        self.sidebar.get_row_at_index(2).set_visible(False)
-
-        while row := self.sidebar.get_row_at_index(3):
-            self.sidebar.remove(row)
-
-        for source_id in shared.store.source_games:
-            if source_id == "imported":
-                continue
-            if not (removed := get_removed(source_id)):
-                continue
-
-            row = Gtk.Box(
-                margin_top=12,
-                margin_bottom=12,
-                margin_start=6,
-                margin_end=6,
-                spacing=12,
-            )
-            games_no = len(shared.store.source_games[source_id]) - removed[0]
-            total_games_no += games_no
-
-            row.append(
-                Gtk.Image.new_from_icon_name(
-                    "user-desktop-symbolic"
-                    if (split_id := source_id.split("_")[0]) == "desktop"
-                    else (
-                        "online-fix-source-symbolic"
-                        if source_id == "online-fix"
-                        else f"{split_id}-source-symbolic"
-                    )
-                )
+    def on_sources_changed(
+        self, model: Gio.ListStore, position: int, removed: int, added: int
+    ) -> None:
+        """Mirror the sorted sources model in the sidebar, after the fixed rows"""
+        for _index in range(removed):
+            self.sidebar.remove(
+                self.sidebar.get_row_at_index(SIDEBAR_FIXED_ROWS + position)
             )
+        for index in range(position, position + added):
+            source = model.get_item(index)
+            if source.row is None:
+                source.row = self.create_source_row(source)
+                self.source_rows[source.row] = source.source_id
+            self.sidebar.insert(source.row, SIDEBAR_FIXED_ROWS + index)
+
+    def create_source_row(self, source: "SidebarSource") -> Gtk.ListBoxRow:
+        row = Gtk.Box(
+            margin_top=12,
+            margin_bottom=12,
+            margin_start=6,
+            margin_end=6,
+            spacing=12,
+        )
 
-            row.append(
-                Gtk.Label(
-                    label=self.get_application().get_source_name(source_id),
-                    halign=Gtk.Align.START,
-                    wrap=True,
-                    wrap_mode=Pango.WrapMode.CHAR,
+        row.append(
+            Gtk.Image.new_from_icon_name(
+                "user-desktop-symbolic"
+                if (split_id := source.source_id.split("_")[0]) == "desktop"
+                else (
+                    "online-fix-source-symbolic"
+                    if source.source_id == "online-fix"
+                    else f"{split_id}-source-symbolic"
                 )
             )
+        )
 
-            row.append(
-                games_no_label := Gtk.Label(
-                    label=games_no,
-                    hexpand=True,
-                    halign=Gtk.Align.END,
-                )
+        row.append(
+            Gtk.Label(
+                label=self.get_application().get_source_name(source.source_id),
+                halign=Gtk.Align.START,
+                wrap=True,
+                wrap_mode=Pango.WrapMode.CHAR,
             )
+        )
 
-            games_no_label.add_css_class("dim-label")
-
-            # Order rows based on the number of games in them
-            index = 3
-            while source_row := self.sidebar.get_row_at_index(index):
-                if self.source_rows[source_row][1] < games_no:
-                    self.sidebar.insert(row, index)
-                    break
-                index += 1
-            if not row.get_parent():
-                self.sidebar.append(row)
-
-            self.source_rows[row.get_parent()] = (
-                source_id,
-                games_no,
+        row.append(
+            games_no_label := Gtk.Label(
+                hexpand=True,
+                halign=Gtk.Align.END,
             )
+        )
 
-            if source_id == selected_id:
-                self.sidebar.select_row(row.get_parent())
-                restored = True
-
-            self.sidebar.get_row_at_index(2).set_visible(True)
-
-        self.all_games_no_label.set_label(str(total_games_no))
+        games_no_label.add_css_class("dim-label")
+        source.bind_property(
+            "count",
+            games_no_label,
+            "label",
+            GObject.BindingFlags.SYNC_CREATE,
+            lambda _binding, count: str(count),
+        )
 
-        if not restored:
-            self.sidebar.select_row(self.all_games_row_box.get_parent())
+        return Gtk.ListBoxRow(child=row)
 
     def row_selected(self, _widget: Any, row: Gtk.ListBoxRow | None) -> None:
         if not row:
@@ -223,12 +251,17 @@ class SOFLWindow(Adw.ApplicationWindow):
             case self.added_row_box:
                 value = "imported"
             case _:
-                value = self.source_rows[row][0]
+                value = self.source_rows[row]
 
         self.library_page.set_title(self.get_application().get_source_name(value))
 
+        # Rows are selected again after moving in the sidebar
+        if value == self.filter_state:
+            return
+
         self.filter_state = value
-        self.library.invalidate_filter()
+        self.library_filter.changed(Gtk.FilterChange.DIFFERENT)
+        self.hidden_library_filter.changed(Gtk.FilterChange.DIFFERENT)
 
         if self.overlay_split_view.get_collapsed():
             self.overlay_split_view.set_show_sidebar(False)
@@ -242,11 +275,30 @@ class SOFLWindow(Adw.ApplicationWindow):
         self.details_view.set_measure_overlay(self.details_view_toolbar_view, True)
         self.details_view.set_clip_overlay(self.details_view_toolbar_view, False)
 
-        self.library.set_filter_func(self.filter_func)
-        self.hidden_library.set_filter_func(self.filter_func)
+        self.games_model = SortedListStore(GameData, *self.get_sort_key())
 
-        self.library.set_sort_func(self.sort_func)
-        self.hidden_library.set_sort_func(self.sort_func)
+        self.sidebar_sources = {}
+        self.sources_model = SortedListStore(
+            SidebarSource, lambda source: (-source.count, source.source_id)
+        )
+        self.sources_model.store.connect("items-changed", self.on_sources_changed)
+
+        self.search_index = SearchIndex()
+        self.search_queries = {False: "", True: ""}
+        self.search_results = {False: None, True: None}
+
+        (
+            self.library_items,
+            self.library_filter,
+            self.library_search_sorter,
+            self.library_model,
+        ) = self.setup_library(self.library, False)
+        (
+            self.hidden_library_items,
+            self.hidden_library_filter,
+            self.hidden_library_search_sorter,
+            self.hidden_library_model,
+        ) = self.setup_library(self.hidden_library, True)
 
         self.set_library_child()
 
@@ -256,6 +308,10 @@ class SOFLWindow(Adw.ApplicationWindow):
             shared.state_schema.get_boolean("show-sidebar")
         )
 
+        # Rows are shown once their sources have games
+        self.all_games_no_label.set_label("0")
+        self.added_row_box.get_parent().set_visible(False)
+        self.sidebar.get_row_at_index(SIDEBAR_FIXED_ROWS - 1).set_visible(False)
         self.sidebar.select_row(self.all_games_row_box.get_parent())
 
         if shared.PROFILE == "development":
@@ -308,92 +364,234 @@ class SOFLWindow(Adw.ApplicationWindow):
             shared.schema.bind(
                 "library-rows",
                 self.library,
-                "max-children-per-line",
+                "max-columns",
                 Gio.SettingsBindFlags.DEFAULT,
             )
             shared.schema.bind(
                 "library-rows",
                 self.hidden_library,
-                "max-children-per-line",
+                "max-columns",
                 Gio.SettingsBindFlags.DEFAULT,
             )
         else:
-            self.library.set_max_children_per_line(10)
-            self.hidden_library.set_max_children_per_line(10)
+            self.library.set_max_columns(10)
+            self.hidden_library.set_max_columns(10)
+
+    def setup_library(
+        self, library: Gtk.GridView, hidden: bool
+    ) -> tuple[
+        Gtk.FilterListModel, Gtk.CustomFilter, Gtk.CustomSorter, Gtk.SortListModel
+    ]:
+        """Back a library view with the games model, filtered and ranked"""
+        items = Gtk.FilterListModel.new(
+            self.games_model.store,
+            Gtk.CustomFilter.new(lambda game, *_: game.hidden == hidden),
+        )
+        search_filter = Gtk.CustomFilter.new(
+            lambda game, *_: self.filter_func(game, hidden)
+        )
+        # The games model is sorted already, the sorter is only set while searching
+        # for the best matches to come first
+        search_sorter = Gtk.CustomSorter.new(
+            lambda game1, game2, *_: self.search_sort_func(game1, game2, hidden)
+        )
+        model = Gtk.SortListModel.new(
+            Gtk.FilterListModel.new(items, search_filter), None
+        )
+        model.connect("items-changed", lambda *_: self.set_library_child())
 
-    def search_changed(self, _widget: Any, hidden: bool) -> None:
-        # Refresh search filter on keystroke in search box
-        (self.hidden_library if hidden else self.library).invalidate_filter()
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self.setup_game_item)
+        factory.connect("bind", self.bind_game_item)
+        factory.connect("unbind", self.unbind_game_item)
 
-    def set_library_child(self) -> None:
-        child, hidden_child = self.notice_empty, self.hidden_notice_empty
+        library.set_model(Gtk.NoSelection.new(model))
+        library.set_factory(factory)
+
+        return items, search_filter, search_sorter, model
+
+    def setup_game_item(self, _factory: Any, list_item: Gtk.ListItem) -> None:
+        list_item.set_activatable(False)
+        list_item.set_focusable(False)
+        list_item.set_child(Game())
+
+    def bind_game_item(self, _factory: Any, list_item: Gtk.ListItem) -> None:
+        list_item.get_child().bind(list_item.get_item())
+
+    def unbind_game_item(self, _factory: Any, list_item: Gtk.ListItem) -> None:
+        list_item.get_child().unbind()
 
-        for game in shared.store:
-            if game.removed or game.blacklisted:
+    def add_library_game(self, game: GameData) -> None:
+        """Add a game to the library views, or refresh it if already there"""
+        self.index_game(game)
+        # Moves the game if its sort key changed, eg. when launched
+        self.games_model.add(game)
+
+    def add_library_games(self, games: list[GameData]) -> None:
+        """Add several new games to the library views at once"""
+        for game in games:
+            self.index_game(game)
+        self.games_model.add_many(games)
+
+    def set_library_loading(self, loading: bool) -> None:
+        """Show a placeholder instead of the empty notice while loading"""
+        self.library_loading = loading
+        self.set_library_child()
+
+    def remove_library_game(self, game: GameData) -> None:
+        """Remove a game from the library views"""
+        if game not in self.games_model:
+            return
+
+        self.search_index.remove(game.game_id)
+        for results in self.search_results.values():
+            if results is not None:
+                results.pop(game.game_id, None)
+        self.games_model.remove(game)
+
+    def get_game_cover(self, game: GameData, picture: Gtk.Picture) -> GameCover:
+        """Get the shared cover of a game, displaying it in the given picture"""
+        if game_cover := self.game_covers.get(game.game_id):
+            game_cover.add_picture(picture)
+        else:
+            game_cover = GameCover({picture}, game.get_cover_path())
+            self.game_covers[game.game_id] = game_cover
+        return game_cover
+
+    def on_game_toast(self, _game: GameData, message: str) -> None:
+        """Show a notification requested by a game"""
+        toast = Adw.Toast.new(message)
+        toast.set_priority(Adw.ToastPriority.HIGH)
+        toast.set_use_markup(False)
+        self.toast_overlay.add_toast(toast)
+
+    def index_game(self, game: GameData) -> None:
+        """Index a game for the searches, updating the active searches' results"""
+        if not self.search_index.add(game.game_id, game.name, game.developer):
+            return
+        for hidden, query in self.search_queries.items():
+            if (results := self.search_results[hidden]) is None:
                 continue
-            if game.hidden:
-                if game.filtered and hidden_child:
-                    hidden_child = self.hidden_notice_no_results
-                    continue
-                hidden_child = None
+            if (rank := self.search_index.rank(game.game_id, query)) is None:
+                results.pop(game.game_id, None)
             else:
-                if game.filtered and child:
-                    child = self.notice_no_results
-                    continue
-                child = None
+                results[game.game_id] = rank
 
-        def remove_from_overlay(widget: Gtk.Widget) -> None:
-            if isinstance(widget.get_parent(), Gtk.Overlay):
-                widget.get_parent().remove_overlay(widget)
+    def search_changed(self, widget: Gtk.SearchEntry, hidden: bool) -> None:
+        # The entry emits this once typing pauses, for its search-delay
+        query = normalize(widget.get_text())
+        previous_query = self.search_queries[hidden]
+        if query == previous_query:
+            return
 
-        if child:
-            self.library_overlay.add_overlay(child)
+        # Only the games matching the previous query may match a longer one
+        if not query:
+            results, change = None, Gtk.FilterChange.LESS_STRICT
+        elif is_refinement(previous_query, query):
+            results = self.search_index.search(query, self.search_results[hidden])
+            change = Gtk.FilterChange.MORE_STRICT
         else:
-            remove_from_overlay(self.notice_empty)
-            remove_from_overlay(self.notice_no_results)
+            results = self.search_index.search(query)
+            change = (
+                Gtk.FilterChange.LESS_STRICT
+                if is_refinement(query, previous_query)
+                else Gtk.FilterChange.DIFFERENT
+            )
 
-        if hidden_child:
-            self.hidden_library_overlay.add_overlay(hidden_child)
+        self.search_queries[hidden] = query
+        self.search_results[hidden] = results
+        (self.hidden_library_filter if hidden else self.library_filter).changed(change)
+
+        model = self.hidden_library_model if hidden else self.library_model
+        sorter = (
+            self.hidden_library_search_sorter if hidden else self.library_search_sorter
+        )
+        if results is None:
+            model.set_sorter(None)
+        elif model.get_sorter() is None:
+            model.set_sorter(sorter)
         else:
-            remove_from_overlay(self.hidden_notice_empty)
-            remove_from_overlay(self.hidden_notice_no_results)
-
-    def filter_func(self, child: Gtk.Widget) -> bool:
-        game = child.get_child()
-        text = (
-            (
-                self.hidden_search_entry
-                if self.navigation_view.get_visible_page() == self.hidden_library_page
-                else self.search_entry
-            )
-            .get_text()
-            .lower()
+            sorter.changed(Gtk.SorterChange.DIFFERENT)
+
+    def set_library_child(self) -> None:
+        def get_notice(
+            items: Gtk.FilterListModel,
+            model: Gtk.SortListModel,
+            notice_empty: Adw.StatusPage,
+            notice_no_results: Adw.StatusPage,
+            notice_loading: Adw.StatusPage,
+        ) -> Optional[Adw.StatusPage]:
+            if model.get_n_items():
+                return None
+            if items.get_n_items():
+                return notice_no_results
+            return notice_loading if self.library_loading else notice_empty
+
+        child = get_notice(
+            self.library_items,
+            self.library_model,
+            self.notice_empty,
+            self.notice_no_results,
+            self.notice_loading,
         )
+        hidden_child = get_notice(
+            self.hidden_library_items,
+            self.hidden_library_model,
+            self.hidden_notice_empty,
+            self.hidden_notice_no_results,
+            self.hidden_notice_loading,
+        )
+
+        def remove_from_overlay(widget: Gtk.Widget) -> None:
+            if isinstance(widget.get_parent(), Gtk.Overlay):
+                widget.get_parent().remove_overlay(widget)
 
-        filtered = text != "" and not (
-            text in game.name.lower()
-            or (text in game.developer.lower() if game.developer else False)
+        def set_overlay(
+            overlay: Gtk.Overlay, child: Optional[Gtk.Widget], *notices: Gtk.Widget
+        ) -> None:
+            for notice in notices:
+                if notice != child:
+                    remove_from_overlay(notice)
+            if child and child.get_parent() != overlay:
+                overlay.add_overlay(child)
+
+        set_overlay(
+            self.library_overlay,
+            child,
+            self.notice_empty,
+            self.notice_no_results,
+            self.notice_loading,
+        )
+        set_overlay(
+            self.hidden_library_overlay,
+            hidden_child,
+            self.hidden_notice_empty,
+            self.hidden_notice_no_results,
+            self.hidden_notice_loading,
         )
 
-        if not filtered:
-            if self.filter_state == "all":
-                pass
-            elif game.base_source != self.filter_state:
-                filtered = True
+    def filter_func(self, game: GameData, hidden: bool) -> bool:
+        results = self.search_results[hidden]
+        if results is not None and game.game_id not in results:
+            return False
 
-        game.filtered = filtered
-        self.set_library_child()
+        return self.filter_state == "all" or game.base_source == self.filter_state
 
-        return not filtered
+    def search_sort_func(self, game1: GameData, game2: GameData, hidden: bool) -> int:
+        if (results := self.search_results[hidden]) is None:
+            return 0
+        rank1 = results.get(game1.game_id, 0)
+        rank2 = results.get(game2.game_id, 0)
+        return (rank1 > rank2) - (rank1 < rank2)
 
-    def set_active_game(self, _widget: Any, _pspec: Any, game: Game) -> None:
+    def set_active_game(self, _widget: Any, _pspec: Any, game: GameData) -> None:
         self.active_game = game
 
-    def show_details_page(self, game: Game) -> None:
+    def show_details_page(self, game: GameData) -> None:
         self.active_game = game
 
         self.details_view_cover.set_opacity(int(not game.loading))
-        self.details_view_spinner.set_visible(game.loading)
+        self.details_view_spinner.set_visible(game.loading > 0)
 
         self.details_view_developer.set_label(game.developer or "")
         self.details_view_developer.set_visible(bool(game.developer))
@@ -409,13 +607,14 @@ class SOFLWindow(Adw.ApplicationWindow):
         self.details_view_play_button.set_label(game.get_play_button_label())
 
         if self.details_view_game_cover:
-            self.details_view_game_cover.pictures.remove(self.details_view_cover)
+            self.details_view_game_cover.remove_picture(self.details_view_cover)
 
-        self.details_view_game_cover = game.game_cover
-        self.details_view_game_cover.add_picture(self.details_view_cover)
+        self.details_view_game_cover = self.get_game_cover(
+            game, self.details_view_cover
+        )
 
         self.details_view_blurred_cover.set_paintable(
-            self.details_view_game_cover.get_blurred()
+            self.details_view_game_cover.get_blurred(self.on_details_view_blurred)
         )
 
         self.details_view_title.set_label(game.name)
@@ -440,6 +639,13 @@ class SOFLWindow(Adw.ApplicationWindow):
 
         self.set_details_view_opacity()
 
+    def on_details_view_blurred(self, game_cover: GameCover) -> None:
+        """Show the backdrop loaded for the details page, if still shown"""
+        if game_cover is not self.details_view_game_cover:
+            return
+        self.details_view_blurred_cover.set_paintable(game_cover.get_blurred())
+        self.set_details_view_opacity()
+
     def set_details_view_opacity(self, *_args: Any) -> None:
         if self.navigation_view.get_visible_page() != self.details_page:
             return
@@ -456,27 +662,19 @@ class SOFLWindow(Adw.ApplicationWindow):
             else self.details_view_game_cover.luminance[1]  # type: ignore
         )
 
-    def sort_func(self, child1: Gtk.Widget, child2: Gtk.Widget) -> int:
-        var, order = "name", True
-
-        if self.sort_state in ("newest", "oldest"):
-            var, order = "added", self.sort_state == "newest"
-        elif self.sort_state == "last_played":
-            var = "last_played"
-        elif self.sort_state == "a-z":
-            order = False
-
-        def get_value(index: int) -> str:
-            return (
-                str(getattr((child1.get_child(), child2.get_child())[index], var))
-                .lower()
-                .removeprefix("the ")
-            )
-
-        if var != "name" and get_value(0) == get_value(1):
-            var, order = "name", False
-
-        return ((get_value(0) > get_value(1)) ^ order) * 2 - 1
+    def get_sort_key(self) -> tuple[Callable[[GameData], Any], bool]:
+        """Get the key function of the sort order, and whether it is reversed"""
+        match self.sort_state:
+            case "newest":
+                return lambda game: (-game.added, game.get_sort_name()), False
+            case "oldest":
+                return lambda game: (game.added, game.get_sort_name()), False
+            case "last_played":
+                return lambda game: (-game.last_played, game.get_sort_name()), False
+            case "a-z":
+                return GameData.get_sort_name, False
+            case _:
+                return GameData.get_sort_name, True
 
     def set_show_hidden(self, navigation_view: Adw.NavigationView, *_args: Any) -> None:
         self.lookup_action("show_hidden").set_enabled(
@@ -510,7 +708,7 @@ class SOFLWindow(Adw.ApplicationWindow):
     def on_sort_action(self, action: Gio.SimpleAction, state: GLib.Variant) -> None:
         action.set_state(state)
         self.sort_state = str(state).strip("'")
-        self.library.invalidate_sort()
+        self.games_model.set_key_func(*self.get_sort_key())
 
         shared.state_schema.set_string("sort-mode", self.sort_state)
 
@@ -532,23 +730,17 @@ class SOFLWindow(Adw.ApplicationWindow):
         search_entry.set_text("")
 
     def show_details_page_search(self, widget: Gtk.Widget) -> None:
-        library = (
-            self.hidden_library if widget == self.hidden_search_entry else self.library
+        model = (
+            self.hidden_library_model
+            if widget == self.hidden_search_entry
+            else self.library_model
         )
-        index = 0
-
-        while True:
-            if not (child := library.get_child_at_index(index)):
-                break
-
-            if self.filter_func(child):
-                self.show_details_page(child.get_child())
-                break
 
-            index += 1
+        if game := model.get_item(0):
+            self.show_details_page(game)
 
     def on_undo_action(
-        self, _widget: Any, game: Optional[Game] = None, undo: Optional[str] = None
+        self, _widget: Any, game: Optional[GameData] = None, undo: Optional[str] = None
     ) -> None:
         if not game:  # If the action was activated via Ctrl + Z
             if shared.importer and (
@@ -0,0 +1,95 @@
+# test_cover_backdrop.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+from pathlib import Path
+from time import time
+
+import pytest
+
+pytest.importorskip("PIL")
+
+# pylint: disable=wrong-import-position
+from sofl import shared
+from sofl.utils import cover_backdrop
+from sofl.utils.cover_backdrop import get_backdrop_path, get_cover_hash, prune_backdrops
+
+
+@pytest.fixture(autouse=True)
+def covers_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(shared, "covers_dir", tmp_path / "covers")
+    # A new cache database, the caches are shared by path
+    monkeypatch.setattr(shared, "metadata_cache_db", tmp_path / "metadata.db")
+    shared.covers_dir.mkdir()
+    return shared.covers_dir
+
+
+def create_backdrop(cover_path: Path) -> Path:
+    path = get_backdrop_path(get_cover_hash(cover_path))
+    path.write_bytes(b"backdrop")
+    # Created before the pruning pass
+    os.utime(path, (0, 0))
+    return path
+
+
+def test_shared_backdrop_is_kept_while_a_cover_uses_it(covers_dir: Path) -> None:
+    cover = covers_dir / "game_1.tiff"
+    cover.write_bytes(b"cover")
+    os.link(cover, covers_dir / "game_2.tiff")
+    (covers_dir / "game_3.gif").write_bytes(b"cover")
+    backdrop = create_backdrop(cover)
+
+    for name in ("game_1.tiff", "game_2.tiff"):
+        (covers_dir / name).unlink()
+        prune_backdrops()
+        assert backdrop.is_file()
+
+    (covers_dir / "game_3.gif").unlink()
+    prune_backdrops()
+    assert not backdrop.exists()
+
+
+def test_new_backdrops_are_kept(covers_dir: Path) -> None:
+    cover = covers_dir / "game_1.tiff"
+    cover.write_bytes(b"cover")
+    backdrop = create_backdrop(cover)
+    # Created once the pass started, for a cover it didn't see
+    os.utime(backdrop, (time() + 60, time() + 60))
+    cover.unlink()
+
+    prune_backdrops()
+    assert backdrop.is_file()
+
+
+def test_hash_is_cached_by_stat(
+    covers_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cover = covers_dir / "game_1.tiff"
+    cover.write_bytes(b"cover")
+    cover_hash = get_cover_hash(cover)
+    assert get_cover_hash(covers_dir / "game_1.tiff") == cover_hash
+
+    # A cover replaced by another file is hashed again
+    cover.unlink()
+    cover.write_bytes(b"other cover")
+    assert get_cover_hash(cover) != cover_hash
+
+    # An unchanged cover isn't read again
+    monkeypatch.setattr(cover_backdrop, "open", None, raising=False)
+    assert get_cover_hash(cover) == get_cover_hash(cover)
@@ -0,0 +1,98 @@
+# test_json_stream.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+from io import StringIO
+from typing import Any, Callable, Optional, TextIO
+
+import pytest
+
+from sofl.utils import json_stream
+from sofl.utils.json_stream import iter_json_array
+
+DOCUMENT = {
+    "version": 1,
+    "library": [
+        {"app_name": f"app{index}", "title": f'Game ✓ {index} "q"', "size": 1.5e3}
+        for index in range(50)
+    ]
+    + [[], {}, 12345, None, "\\escaped\n"],
+    "after": {"n": [1, 2]},
+}
+
+
+@pytest.fixture(name="read_array")
+def fixture_read_array(monkeypatch: pytest.MonkeyPatch) -> Callable:
+    reader_class = json_stream.JSONStreamReader
+
+    def read_array(
+        text: str, key: Optional[str], chunk_size: int
+    ) -> tuple[list[Any], dict]:
+        """Read an array with tiny chunks, to cut the values anywhere"""
+
+        class SmallChunkReader(reader_class):
+            def __init__(self, file: TextIO) -> None:
+                super().__init__(file, chunk_size)
+
+        monkeypatch.setattr(json_stream, "JSONStreamReader", SmallChunkReader)
+        others: dict = {}
+        elements = list(iter_json_array(StringIO(text), key, others))
+        return elements, others
+
+    return read_array
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 3, 7, 64, 64 * 1024))
+@pytest.mark.parametrize("indent", (None, 2))
+def test_values_cut_by_the_chunks(
+    read_array: Callable, chunk_size: int, indent: Optional[int]
+) -> None:
+    elements, others = read_array(
+        json.dumps(DOCUMENT, indent=indent), "library", chunk_size
+    )
+    assert elements == DOCUMENT["library"]
+    assert others == {"version": 1, "after": {"n": [1, 2]}}
+
+
+@pytest.mark.parametrize("chunk_size", (1, 64 * 1024))
+def test_top_level_array(read_array: Callable, chunk_size: int) -> None:
+    assert read_array("[1, 22 ,333]", None, chunk_size)[0] == [1, 22, 333]
+    assert read_array(" [ ] ", None, chunk_size)[0] == []
+    assert read_array('{"library": []}', "library", chunk_size)[0] == []
+
+
+def test_elements_are_decoded_lazily() -> None:
+    elements = iter_json_array(StringIO('{"library": [1, 2, oops]}'), "library")
+    assert next(elements) == 1
+    assert next(elements) == 2
+    with pytest.raises(json.JSONDecodeError):
+        next(elements)
+
+
+@pytest.mark.parametrize("text", ('{"other": 1}', "{}"))
+def test_missing_key(text: str) -> None:
+    with pytest.raises(KeyError):
+        list(iter_json_array(StringIO(text), "library"))
+
+
+@pytest.mark.parametrize("text", ("[1,", '{"library": 5}', '{"library" 5}'))
+def test_invalid_json(text: str) -> None:
+    key = None if text.startswith("[") else "library"
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(StringIO(text), key))
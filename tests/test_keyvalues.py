@@ -0,0 +1,111 @@
+# test_keyvalues.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+pytest.importorskip("gi")
+pytest.importorskip("requests")
+
+# pylint: disable=wrong-import-position
+from sofl.utils.steam import (
+    BLOCK_END,
+    BLOCK_START,
+    SteamFileHelper,
+    find_keyvalues,
+    parse_keyvalues,
+    tokenize_keyvalues,
+)
+
+LIBRARY_FOLDERS = """"libraryfolders"
+{
+\t"0"
+\t{
+\t\t"path"\t\t"/home/user/.local/share/Steam"
+\t\t"label"\t\t""
+\t\t"apps"
+\t\t{
+\t\t\t"228980"\t\t"123"
+\t\t\t"1628350"\t\t"456"
+\t\t}
+\t}
+\t"1"
+\t{
+\t\t"path"\t\t"/mnt/games/Steam"
+\t\t"apps"
+\t\t{
+\t\t}
+\t}
+}
+"""
+
+
+def test_tokenize_plain_lines() -> None:
+    tokens = list(tokenize_keyvalues(['"a" "b"\n', "bare {\n", "}\n"]))
+    assert tokens == ["a", "b", "bare", BLOCK_START, BLOCK_END]
+
+
+def test_tokenize_escapes_comments_and_conditionals() -> None:
+    lines = [
+        '"path" "C:\\\\Games\\"Steam\\"" // comment\n',
+        '"b" "x" [$WIN32]\n',
+    ]
+    assert list(tokenize_keyvalues(lines)) == ["path", 'C:\\Games"Steam"', "b", "x"]
+
+
+def test_tokenize_multiline_string() -> None:
+    lines = ['"a" "multi\n', 'line"\n']
+    assert list(tokenize_keyvalues(lines)) == ["a", "multi\nline"]
+
+
+def test_parse_library_folders() -> None:
+    folders = SteamFileHelper().get_library_folders(
+        LIBRARY_FOLDERS.splitlines(keepends=True)
+    )
+    assert folders == [
+        {
+            "path": "/home/user/.local/share/Steam",
+            "label": "",
+            "apps": {"228980": "123", "1628350": "456"},
+        },
+        {"path": "/mnt/games/Steam", "apps": {}},
+    ]
+
+
+def test_parse_block_without_key() -> None:
+    with pytest.raises(ValueError):
+        parse_keyvalues(tokenize_keyvalues(["{\n", "}\n"]))
+
+
+def test_find_stops_once_found() -> None:
+    lines = iter(
+        [
+            '"AppState"\n',
+            "{\n",
+            '\t"appid"\t\t"10"\n',
+            '\t"UserConfig" { "name" "nested" }\n',
+            '\t"Name"\t\t"Game"\n',
+            '\t"StateFlags"\t\t"4"\n',
+            "}\n",
+        ]
+    )
+    found = find_keyvalues(tokenize_keyvalues(lines), {"appid", "name"})
+
+    # The nested name is ignored, and the rest of the file isn't read
+    assert found == {"appid": "10", "name": "Game"}
+    assert next(lines) == '\t"StateFlags"\t\t"4"\n'
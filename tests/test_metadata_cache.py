@@ -0,0 +1,73 @@
+# test_metadata_cache.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from pathlib import Path
+
+from sofl.utils.metadata_cache import MetadataCache, get_metadata_cache
+
+
+def count_rows(cache: MetadataCache) -> int:
+    return cache.connection.execute(
+        "SELECT COUNT(*) FROM cache WHERE namespace = ?", (cache.namespace,)
+    ).fetchone()[0]
+
+
+def test_get_and_expire(tmp_path: Path) -> None:
+    cache = MetadataCache(tmp_path / "cache.db", "test")
+    cache.set("fresh", {"value": 1}, 60)
+    cache.set("not_found", None, 60)
+    cache.set("expired", 1, -1)
+
+    assert cache.get("fresh") == {"value": 1}
+    assert cache.get("not_found") is None
+    assert cache.get("expired") is MetadataCache.MISSING
+    assert cache.get("unknown") is MetadataCache.MISSING
+
+
+def test_expired_entries_are_pruned_on_open(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    cache = MetadataCache(path, "test")
+    cache.set("fresh", 1, 60)
+    cache.set("expired", 1, -1)
+    MetadataCache(path, "other").set("expired", 1, -1)
+    assert count_rows(cache) == 2
+
+    reopened = MetadataCache(path, "test")
+    assert count_rows(reopened) == 1
+    assert reopened.get("fresh") == 1
+    # Other namespaces are pruned when they are opened
+    assert count_rows(MetadataCache(path, "other")) == 0
+
+
+def test_caches_are_shared_by_namespace(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    assert get_metadata_cache(path, "test") is get_metadata_cache(path, "test")
+    assert get_metadata_cache(path, "test") is not get_metadata_cache(path, "other")
+
+
+def test_database_errors_are_not_raised(tmp_path: Path) -> None:
+    cache = MetadataCache(tmp_path / "cache.db", "test")
+    cache.set("key", 1, 60)
+    # Any use of a closed connection raises a `sqlite3.Error`
+    cache.connection.close()
+
+    assert cache.get("key") is MetadataCache.MISSING
+    cache.set("key", 2, 60)
+    cache.delete("key")
+    cache.clear()
@@ -0,0 +1,82 @@
+# test_rate_limiter.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from threading import Event, Lock, Thread
+from time import monotonic
+
+from sofl.utils.rate_limiter import RateLimiter
+
+N_ACQUIRERS = 10_000
+
+
+class FastRateLimiter(RateLimiter):
+    refill_period_seconds = 1
+    refill_period_tokens = 100
+    burst_tokens = 20
+
+
+def reserve_concurrently(limiter: RateLimiter, n_threads: int) -> list[float]:
+    slots = []
+    slots_lock = Lock()
+    start = Event()
+
+    def reserve() -> None:
+        start.wait()
+        slot = limiter.reserve()
+        with slots_lock:
+            slots.append(slot)
+
+    threads = [Thread(target=reserve) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+    return sorted(slots)
+
+
+def test_concurrent_reservations_respect_the_period_limit() -> None:
+    limiter = FastRateLimiter()
+    slots = reserve_concurrently(limiter, N_ACQUIRERS)
+
+    assert len(slots) == N_ACQUIRERS
+    # Any refill_period_tokens + 1 consecutive slots span at least a period
+    n_tokens = limiter.refill_period_tokens
+    for first, last in zip(slots, slots[n_tokens:]):
+        assert last - first >= limiter.refill_period_seconds - 1e-6
+
+
+def test_burst_is_immediate() -> None:
+    limiter = FastRateLimiter()
+    now = monotonic()
+    slots = [limiter.reserve() for _ in range(limiter.burst_tokens + 1)]
+
+    assert all(slot - now < 0.01 for slot in slots[:-1])
+    assert slots[-1] - now >= 0.5 / limiter.refill_rate
+
+
+def test_acquire_waits_for_its_slot() -> None:
+    limiter = FastRateLimiter()
+    for _ in range(limiter.burst_tokens):
+        limiter.acquire()
+
+    start = monotonic()
+    limiter.acquire()
+    assert limiter.last_slot > start
+    assert monotonic() >= limiter.last_slot
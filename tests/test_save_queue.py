@@ -0,0 +1,103 @@
+# test_save_queue.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from sofl.store.game_storage import SqliteGameStorage
+from sofl.store.save_queue import SaveQueue
+
+
+class RecordingStorage:
+    def __init__(self) -> None:
+        self.records = {}
+        self.batches = []
+
+    def save_many(self, records) -> None:
+        records = tuple(records)
+        self.batches.append(records)
+        for record in records:
+            self.records[record["game_id"]] = record
+
+    def delete_many(self, game_ids) -> None:
+        for game_id in game_ids:
+            self.records.pop(game_id, None)
+
+
+def make_queue(storage: RecordingStorage) -> SaveQueue:
+    queue = SaveQueue(storage.save_many, storage.delete_many)
+    # Only flush explicitly
+    queue.delay = queue.max_delay = 60
+    return queue
+
+
+def test_saves_are_coalesced_in_one_batch():
+    storage = RecordingStorage()
+    queue = make_queue(storage)
+    for name in ("a", "b", "c"):
+        queue.enqueue({"game_id": "game", "name": name})
+    queue.enqueue({"game_id": "other", "name": "d"})
+    queue.stop()
+
+    assert len(storage.batches) == 1
+    assert storage.records["game"]["name"] == "c"
+    assert queue.stats["coalesced"] == 2
+    assert queue.stats["written"] == 2
+
+
+def test_delete_replaces_pending_save():
+    storage = RecordingStorage()
+    storage.records["game"] = {"game_id": "game", "name": "stored"}
+    queue = make_queue(storage)
+    queue.enqueue({"game_id": "game", "name": "pending"})
+    queue.delete("game")
+    queue.flush()
+
+    assert "game" not in storage.records
+    assert queue.stats["deleted"] == 1
+    queue.stop()
+
+
+def test_save_after_delete_wins():
+    storage = RecordingStorage()
+    queue = make_queue(storage)
+    queue.delete("game")
+    queue.enqueue({"game_id": "game", "name": "new"})
+    queue.stop()
+
+    assert storage.records["game"]["name"] == "new"
+
+
+def test_batches_are_written_after_the_delay():
+    storage = RecordingStorage()
+    queue = SaveQueue(storage.save_many, storage.delete_many)
+    queue.delay = 0.01
+    queue.enqueue({"game_id": "game"})
+    queue.flush()
+
+    assert storage.records == {"game": {"game_id": "game"}}
+    queue.stop()
+
+
+def test_sqlite_storage_delete_many(tmp_path):
+    storage = SqliteGameStorage(tmp_path / "games.db")
+    storage.save_many(
+        {"game_id": game_id, "source": "steam"} for game_id in ("a", "b", "c")
+    )
+    storage.delete_many(("a", "c", "missing"))
+
+    assert [record["game_id"] for record in storage] == ["b"]
+    storage.close()
@@ -0,0 +1,198 @@
+# test_scheduler.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+pytest.importorskip("gi")
+
+# pylint: disable=wrong-import-position
+from gi.repository import GLib
+
+from sofl.game_data import GameData
+from sofl.store.managers.manager import Manager
+from sofl.store.pipeline import Pipeline
+from sofl.store.scheduler import Scheduler
+
+
+class LoggingManager(Manager):
+    """Blocking manager logging the games it processed"""
+
+    log: list[tuple[str, str]]
+
+    def __init__(self, log: list[tuple[str, str]]) -> None:
+        super().__init__()
+        self.log = log
+
+    def main(self, game: GameData, additional_data: dict) -> None:
+        self.log.append((self.name, game.game_id))
+
+
+class First(LoggingManager):
+    pass
+
+
+class Second(LoggingManager):
+    run_after = (First,)
+
+
+class Third(LoggingManager):
+    run_after = (Second,)
+
+
+class HeldManager(Manager):
+    """Non blocking manager, the test decides when each game is done"""
+
+    blocking = False
+    max_concurrent = 2
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = []
+
+    def main(self, game: GameData, additional_data: dict) -> None:
+        pass
+
+    def process_game(self, game, _additional_data, callback, *_args) -> None:
+        self.started.append((game.game_id, callback))
+
+    def finish(self, index: int = 0) -> str:
+        game_id, callback = self.started.pop(index)
+        callback(self)
+        return game_id
+
+
+def make_pipeline(
+    scheduler: Scheduler,
+    game_id: str,
+    priority: int = Pipeline.PRIORITY_DEFAULT,
+) -> Pipeline:
+    return Pipeline(
+        GameData({"game_id": game_id}), {}, scheduler.managers, scheduler, priority
+    )
+
+
+def test_managers_run_in_dependency_order():
+    log = []
+    scheduler = Scheduler()
+    scheduler.set_managers((Third(log), Second(log), First(log)))
+    assert [
+        manager.name for manager in sorted(scheduler.order, key=scheduler.order.get)
+    ] == [
+        "First",
+        "Second",
+        "Third",
+    ]
+
+    pipeline = make_pipeline(scheduler, "game")
+    pipeline.advance()
+
+    assert log == [("First", "game"), ("Second", "game"), ("Third", "game")]
+    assert pipeline.is_done
+
+
+def test_circular_dependencies_are_rejected():
+    class Loop(LoggingManager):
+        pass
+
+    class Back(LoggingManager):
+        run_after = (Loop,)
+
+    Loop.run_after = (Back,)
+    with pytest.raises(ValueError):
+        Scheduler().set_managers((Loop([]), Back([])))
+
+
+def test_concurrency_limit():
+    manager = HeldManager()
+    scheduler = Scheduler()
+    scheduler.set_managers((manager,))
+    pipelines = [make_pipeline(scheduler, f"game_{index}") for index in range(5)]
+    for pipeline in pipelines:
+        pipeline.advance()
+
+    assert len(manager.started) == 2
+    assert scheduler.running[manager] == 2
+
+    finished = []
+    while manager.started:
+        finished.append(manager.finish())
+        assert scheduler.running[manager] <= manager.max_concurrent
+
+    assert finished == [f"game_{index}" for index in range(5)]
+    assert scheduler.peak_running[manager] == 2
+    assert scheduler.running[manager] == 0
+    assert all(pipeline.is_done for pipeline in pipelines)
+
+
+def test_priority_before_submission_order():
+    manager = HeldManager()
+    manager.max_concurrent = 1
+    scheduler = Scheduler()
+    scheduler.set_managers((manager,))
+
+    make_pipeline(scheduler, "running").advance()
+    make_pipeline(scheduler, "background", Pipeline.PRIORITY_BACKGROUND).advance()
+    make_pipeline(scheduler, "first").advance()
+    make_pipeline(scheduler, "second").advance()
+
+    order = [manager.finish() for _ in range(4)]
+    assert order == ["running", "first", "second", "background"]
+
+
+class FlakyError(Exception):
+    pass
+
+
+class FlakyManager(LoggingManager):
+    """Fails once for the "flaky" game, only one game at a time"""
+
+    blocking = False
+    max_concurrent = 1
+    retryable_on = (FlakyError,)
+    retry_delay = 0.01
+
+    def main(self, game: GameData, additional_data: dict) -> None:
+        if game.game_id == "flaky" and ("Flaky", "flaky") not in self.log:
+            self.log.append(("Flaky", "flaky"))
+            raise FlakyError()
+        super().main(game, additional_data)
+
+
+def test_backoff_frees_the_slot():
+    log = []
+    manager = FlakyManager(log)
+    scheduler = Scheduler()
+    scheduler.set_managers((manager,))
+    flaky = make_pipeline(scheduler, "flaky")
+    other = make_pipeline(scheduler, "other")
+    flaky.advance()
+    other.advance()
+
+    # The other game doesn't wait for the flaky one's backoff
+    assert log == [("Flaky", "flaky"), ("FlakyManager", "other")]
+    assert other.is_done
+    assert scheduler.running[manager] == 0
+
+    context = GLib.MainContext.default()
+    while not flaky.is_done:
+        context.iteration(True)
+
+    assert log[-1] == ("FlakyManager", "flaky")
+    assert manager.n_retries == 1
+    assert scheduler.running[manager] == 0
@@ -0,0 +1,122 @@
+# test_search_index.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from sofl.utils.search_index import (
+    RANK_DEVELOPER,
+    RANK_NAME,
+    RANK_NAME_START,
+    RANK_NAME_WORD,
+    RANK_TYPO,
+    SearchIndex,
+    get_prefix_distance,
+    is_refinement,
+    normalize,
+)
+
+
+@pytest.fixture(name="index")
+def fixture_index() -> SearchIndex:
+    index = SearchIndex()
+    index.add("witcher", "The Witcher 3: Wild Hunt", "CD Projekt Réd")
+    index.add("portal", "Portal 2", "Valve")
+    index.add("halflife", "Half-Life", "Valve")
+    index.add("stardew", "Stardew Valley", "ConcernedApe")
+    return index
+
+
+def test_normalize() -> None:
+    assert normalize("  Pokémon: ÉDITION  Rouge! ") == "pokemon edition rouge"
+    assert normalize("Half-Life 2") == "half life 2"
+
+
+@pytest.mark.parametrize(
+    "query, word, distance",
+    (
+        ("witch", "witcher", 0),
+        ("wticher", "witcher", 1),
+        ("wxtcher", "witcher", 1),
+        ("witcehr", "witcher", 1),
+        ("wotchre", "witcher", 2),
+    ),
+)
+def test_prefix_distance(query: str, word: str, distance: int) -> None:
+    assert get_prefix_distance(query, word, 1) == min(distance, 2)
+
+
+def test_ranks(index: SearchIndex) -> None:
+    assert index.search("the") == {"witcher": RANK_NAME_START}
+    assert index.search("wild") == {"witcher": RANK_NAME_WORD}
+    assert index.search("tal") == {"portal": RANK_NAME}
+    assert index.search("valve") == {
+        "portal": RANK_DEVELOPER,
+        "halflife": RANK_DEVELOPER,
+        "stardew": RANK_TYPO + 1,
+    }
+    assert index.search("wticher") == {"witcher": RANK_TYPO + 1}
+    # Every word of the query must match
+    assert index.search("witcher red") == {"witcher": RANK_NAME_WORD + RANK_DEVELOPER}
+    assert not index.search("witcher valve")
+
+
+def test_short_words_must_be_exact(index: SearchIndex) -> None:
+    assert not index.search("hlf")
+    assert not index.search("wld")
+
+
+def test_update_and_remove(index: SearchIndex) -> None:
+    assert not index.add("portal", "Portal 2", "Valve")
+    assert index.add("portal", "Portal", "Valve Corporation")
+    assert index.search("portal") == {"portal": RANK_NAME_START}
+    assert "2" not in index.entries["portal"].words
+
+    index.remove("portal")
+    index.remove("portal")
+    assert not index.search("portal")
+    assert not any("portal" in game_ids for game_ids in index.trigrams.values())
+    assert not any("portal" in game_ids for game_ids in index.initials.values())
+
+
+def test_refinement(index: SearchIndex) -> None:
+    assert is_refinement("wit", "witc")
+    assert is_refinement("the", "the wi")
+    assert not is_refinement("witc", "wit")
+    # The longer word tolerates a typo, it may match more games
+    assert not is_refinement("witc", "witch")
+
+    matches = index.search("va")
+    assert index.search("val", matches) == index.search("val")
+    assert index.rank("stardew", "val") == RANK_NAME_WORD
+    assert index.rank("witcher", "val") is None
+
+
+def test_typing_a_typo(index: SearchIndex) -> None:
+    """A typo can change every trigram of a short word"""
+    assert index.search("wtich") == {"witcher": RANK_TYPO + 1}
+
+    previous, matches = "", None
+    for length in range(1, len("wticher") + 1):
+        query = "wticher"[:length]
+        if matches is not None and is_refinement(previous, query):
+            matches = index.search(query, matches)
+        else:
+            matches = index.search(query)
+        previous = query
+    assert matches == {"witcher": RANK_TYPO + 1}
@@ -0,0 +1,136 @@
+# test_sorted_list_store.py
+#
+# Copyright 2026 badkiko
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+from typing import Any
+
+import pytest
+
+pytest.importorskip("gi")
+
+# pylint: disable=wrong-import-position
+from gi.repository import GObject
+
+from sofl.utils.sorted_list_store import SortedListStore
+
+
+class Item(GObject.Object):
+    name: str
+    last_played: int
+
+    def __init__(self, name: str, last_played: int) -> None:
+        super().__init__()
+        self.name = name
+        self.last_played = last_played
+
+
+def by_last_played(item: Item) -> Any:
+    return (-item.last_played, item.name)
+
+
+def by_name(item: Item) -> Any:
+    return item.name
+
+
+def get_items(model: SortedListStore) -> list[Item]:
+    return [model.store.get_item(index) for index in range(model.store.get_n_items())]
+
+
+def create_items(n_items: int) -> list[Item]:
+    rng = random.Random(0)
+    # Few distinct values, so that items share keys
+    return [
+        Item(f"game {rng.randint(0, n_items // 4)}", rng.randint(0, n_items // 4))
+        for _ in range(n_items)
+    ]
+
+
+@pytest.mark.parametrize("reverse", (False, True))
+def test_add_in_batches(reverse: bool) -> None:
+    items = create_items(1000)
+    model = SortedListStore(Item, by_last_played, reverse)
+    # Small batches are inserted one by one, the first one sorts everything
+    for start in range(0, len(items), 100):
+        model.add_many(items[start : start + 100])
+    model.add_many(items[:10])
+
+    assert len(model) == len(items)
+    expected = sorted(items, key=by_last_played, reverse=reverse)
+    assert list(map(by_last_played, get_items(model))) == list(
+        map(by_last_played, expected)
+    )
+
+
+@pytest.mark.parametrize("reverse", (False, True))
+def test_update_moves_one_item(reverse: bool) -> None:
+    items = create_items(200)
+    model = SortedListStore(Item, by_last_played, reverse)
+    model.add_many(items)
+
+    changes = []
+    model.store.connect("items-changed", lambda _store, *change: changes.append(change))
+    item = items[42]
+    item.last_played = 1000
+    model.add(item)
+
+    # Removed from its old position, inserted at the new one
+    assert len(changes) == 2
+    assert get_items(model).index(item) == (len(items) - 1 if reverse else 0)
+    assert list(map(by_last_played, get_items(model))) == sorted(
+        map(by_last_played, items), reverse=reverse
+    )
+
+    # An unchanged key only replaces the item in place
+    changes.clear()
+    model.add(item)
+    assert len(changes) == 1
+    assert changes[0][1:] == (1, 1)
+
+
+def test_remove() -> None:
+    items = create_items(200)
+    model = SortedListStore(Item, by_last_played)
+    model.add_many(items)
+
+    for item in items[:150]:
+        model.remove(item)
+    model.remove(items[0])
+
+    assert items[0] not in model
+    assert set(get_items(model)) == set(items[150:])
+    assert list(map(by_last_played, get_items(model))) == sorted(
+        map(by_last_played, items[150:])
+    )
+
+
+def test_set_key_func() -> None:
+    items = create_items(200)
+    model = SortedListStore(Item, by_last_played)
+    model.add_many(items)
+
+    model.set_key_func(by_name, True)
+    assert [item.name for item in get_items(model)] == sorted(
+        (item.name for item in items), reverse=True
+    )
+
+    # Keys are taken from the new function
+    item = items[7]
+    item.name = "zzz"
+    model.add(item)
+    assert get_items(model)[0] is item